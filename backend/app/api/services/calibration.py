@@ -0,0 +1,77 @@
+from __future__ import annotations
+import json
+import os
+import platform
+import time
+from typing import Dict, Iterable, Optional
+from app.api.services.weight_registry import write_json_atomic
+from app.bench.positions import POSITIONS, load_position
+from app.core.ai.registry import LEVELS, make_agent
+from app.core.eval.evaluator import Evaluator, EvalCache
+
+CALIBRATION_PATH = "app/logs/calibration.json"
+
+# agents whose cost a level sets, and the SearchStats counter their budget is counted in
+BUDGET_UNITS = {"minimax": "nodes", "mcts": "simulations", "hybrid": "simulations"}
+
+
+def calibrate(agents: Iterable[str] = tuple(BUDGET_UNITS), levels: Iterable[str] = tuple(LEVELS)) -> Dict:
+    """
+    Search every benchmark position with every agent at every level and record the
+    measured seconds per move, and the agent's speed in budget units per second.
+    Latencies hold for this host only; rerun after a hardware or engine change.
+    """
+    result = {
+        "host": {"machine": platform.machine(), "python": platform.python_version(), "cpus": os.cpu_count()},
+        "created": time.time(),
+        "agents": {},
+    }
+    for name in agents:
+        unit = BUDGET_UNITS[name]
+        entry = result["agents"][name] = {"unit": unit, "levels": {}}
+        total_work = total_seconds = 0.0
+        for level in levels:
+            seconds = []
+            for pos in POSITIONS:
+                board = load_position(pos)
+                agent = make_agent(name, Evaluator(cache=EvalCache()), level)
+                agent.best_move(board, board.to_move)
+                seconds.append(agent.last_stats.time_total)
+                total_work += getattr(agent.last_stats, unit)
+            total_seconds += sum(seconds)
+            entry["levels"][level] = {
+                "budget": LEVELS[level][unit],
+                "mean_seconds": sum(seconds) / len(seconds),
+                "max_seconds": max(seconds),
+            }
+        entry["rate"] = total_work / total_seconds if total_seconds > 0 else 0.0
+    return result
+
+
+def save_calibration(result: Dict, path: str = CALIBRATION_PATH) -> None:
+    write_json_atomic(path, result)
+
+
+def load_calibration(path: str = CALIBRATION_PATH) -> Optional[Dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def level_table(calibration: Optional[Dict] = None) -> Dict[str, Dict]:
+    """Every level's budget and, when a calibration is available, the expected seconds
+    per move of each calibrated agent (measured mean, else budget / rate)."""
+    agents = (calibration or {}).get("agents", {})
+    table = {}
+    for level, budget in LEVELS.items():
+        expected = {}
+        for name, entry in agents.items():
+            measured = entry["levels"].get(level)
+            if measured is not None:
+                expected[name] = measured["mean_seconds"]
+            elif entry.get("rate"):
+                expected[name] = budget[entry["unit"]] / entry["rate"]
+        table[level] = {"budget": dict(budget), "expected_seconds": expected}
+    return table
@@ -0,0 +1,203 @@
+from __future__ import annotations
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from app.api.services.match_runner import MatchRunner
+from app.api.services.trainer import TrainingCancelled
+from app.api.services.weight_registry import WEIGHT_REGISTRY
+from app.core.ai.registry import DEFAULT_LEVEL
+from app.core.eval.evaluator import Evaluator, DEFAULT_WEIGHTS
+from app.core.eval.features import FEATURE_NAMES
+
+LOG_DIR = "app/logs/training"
+CHECKPOINT_PATH = os.path.join(LOG_DIR, "cmaes_checkpoint.json")
+
+
+def evaluate_weights(base_agent: str, opponent_agent: str, weights: Dict[str, float], games: int,
+                     level: str = DEFAULT_LEVEL, time_limit: float = 1.0) -> float:
+    """Average disc differential of `base_agent` (BLACK, using `weights`) over `games` games."""
+    runner = MatchRunner(base_agent, opponent_agent, games=games, time_limit=time_limit, log=False, level=level)
+    runner.agent1.evaluator = Evaluator(weights)
+    return runner.run()["avg_score_diff"]
+
+
+class CMAESTrainer:
+    """
+    CMA-ES search over evaluator weights (maximising disc differential against an opponent).
+
+    Each generation samples `popsize` weight vectors from N(mean, sigma^2 C), plays them
+    in parallel worker processes, and adapts mean, step size and covariance from the
+    ranked results (standard (mu/mu_w, lambda) CMA-ES with rank-one and rank-mu updates).
+    The whole state is written to `checkpoint_path` after every generation, so train()
+    continues an unfinished previous run from where it stopped; a finished one (or one
+    with other features) is started afresh. Resuming with a different popsize, sigma0,
+    games or level raises ValueError, since the run would silently keep the old ones.
+    """
+
+    def __init__(self, base_agent: str = "minimax", opponent_agent: str = "greedy",
+                 features: Optional[List[str]] = None, generations: int = 10, popsize: Optional[int] = None,
+                 sigma0: float = 5.0, games: int = 2, workers: Optional[int] = None,
+                 checkpoint_path: str = CHECKPOINT_PATH, resume: bool = True, seed: int = 0,
+                 level: str = DEFAULT_LEVEL, time_limit: float = 1.0) -> None:
+        self.features = list(features or FEATURE_NAMES)
+        unknown = [f for f in self.features if f not in FEATURE_NAMES]
+        if unknown:
+            raise ValueError(f"Unknown features {unknown}; choose from {FEATURE_NAMES}")
+        self.base_agent = base_agent
+        self.opponent_agent = opponent_agent
+        self.generations = generations
+        self.games = games
+        self.sigma0 = sigma0
+        self.workers = workers or os.cpu_count() or 1
+        self.checkpoint_path = checkpoint_path
+        self.level = level  # search budget of both agents; time_limit only caps a move
+        self.time_limit = time_limit
+        self.games_played = 0
+        self.on_progress: Optional[Callable[[Dict], None]] = None  # see GATrainer
+        self.should_stop: Optional[Callable[[], bool]] = None
+
+        n = len(self.features)
+        self.popsize = popsize or 4 + int(3 * math.log(n))
+        self.mu = self.popsize // 2
+        w = np.log(self.mu + 0.5) - np.log(np.arange(1, self.mu + 1))
+        self.recomb = w / w.sum()
+        self.mueff = 1.0 / float((self.recomb ** 2).sum())
+        self.cc = (4 + self.mueff / n) / (n + 4 + 2 * self.mueff / n)
+        self.cs = (self.mueff + 2) / (n + self.mueff + 5)
+        self.c1 = 2 / ((n + 1.3) ** 2 + self.mueff)
+        self.cmu = min(1 - self.c1, 2 * (self.mueff - 2 + 1 / self.mueff) / ((n + 2) ** 2 + self.mueff))
+        self.damps = 1 + 2 * max(0.0, math.sqrt((self.mueff - 1) / (n + 1)) - 1) + self.cs
+        self.chi_n = math.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n * n))
+
+        if not (resume and self._load_checkpoint()):
+            self.generation = 0
+            self.mean = np.array([DEFAULT_WEIGHTS.get(f, 0.0) for f in self.features], dtype=float)
+            self.sigma = sigma0
+            self.C = np.eye(n)
+            self.pc = np.zeros(n)
+            self.ps = np.zeros(n)
+            self.best_weights = self._as_weights(self.mean)
+            self.best_fitness = float("-inf")
+            self.rng = np.random.default_rng(seed)
+
+    def _as_weights(self, x: np.ndarray) -> Dict[str, float]:
+        return {f: float(v) for f, v in zip(self.features, x)}
+
+    def _evaluate(self, population: List[Dict[str, float]]) -> List[float]:
+        if self.should_stop is not None and self.should_stop():
+            raise TrainingCancelled()
+        args = (self.base_agent, self.opponent_agent)
+        if self.workers <= 1:
+            scores = [evaluate_weights(*args, w, self.games, self.level, self.time_limit) for w in population]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(population))) as pool:
+                futures = [pool.submit(evaluate_weights, *args, w, self.games, self.level, self.time_limit)
+                           for w in population]
+                scores = [f.result() for f in futures]
+        self.games_played += self.games * len(population)
+        return scores
+
+    def step(self) -> float:
+        """Run one generation; returns its best fitness."""
+        n = len(self.features)
+        eigvals, B = np.linalg.eigh(self.C)
+        D = np.sqrt(np.maximum(eigvals, 1e-20))
+        z = self.rng.standard_normal((self.popsize, n))
+        y = z @ (B * D).T  # rows ~ N(0, C)
+        xs = self.mean + self.sigma * y
+        fitness = self._evaluate([self._as_weights(x) for x in xs])
+
+        order = np.argsort(fitness)[::-1][:self.mu]  # maximise
+        if fitness[order[0]] > self.best_fitness:
+            self.best_fitness = float(fitness[order[0]])
+            self.best_weights = self._as_weights(xs[order[0]])
+
+        y_w = self.recomb @ y[order]
+        self.mean = self.mean + self.sigma * y_w
+        inv_sqrt_c = B @ np.diag(1 / D) @ B.T
+        self.ps = (1 - self.cs) * self.ps + math.sqrt(self.cs * (2 - self.cs) * self.mueff) * (inv_sqrt_c @ y_w)
+        self.generation += 1
+        ps_norm = float(np.linalg.norm(self.ps))
+        hsig = ps_norm / math.sqrt(1 - (1 - self.cs) ** (2 * self.generation)) / self.chi_n < 1.4 + 2 / (n + 1)
+        self.pc = (1 - self.cc) * self.pc + hsig * math.sqrt(self.cc * (2 - self.cc) * self.mueff) * y_w
+        rank_mu = (y[order].T * self.recomb) @ y[order]
+        self.C = ((1 - self.c1 - self.cmu) * self.C
+                  + self.c1 * (np.outer(self.pc, self.pc) + (not hsig) * self.cc * (2 - self.cc) * self.C)
+                  + self.cmu * rank_mu)
+        self.C = (self.C + self.C.T) / 2
+        self.sigma *= math.exp((self.cs / self.damps) * (ps_norm / self.chi_n - 1))
+        return float(fitness[order[0]])
+
+    def train(self, save: bool = True) -> Dict[str, float]:
+        """Run the remaining generations, checkpointing after each. With save, the best
+        weights are published to the weight registry and promoted."""
+        while self.generation < self.generations:
+            best = self.step()
+            self._save_checkpoint()
+            print(f"Generation {self.generation}/{self.generations}: best {best:.2f}, "
+                  f"sigma {self.sigma:.2f}, mean {self._as_weights(self.mean)}")
+            if self.on_progress is not None:
+                self.on_progress({"generation": self.generation, "generations": self.generations,
+                                  "best_fitness": self.best_fitness, "best_weights": self.best_weights,
+                                  "games_played": self.games_played})
+        if save:
+            version = WEIGHT_REGISTRY.publish(self.best_weights, promote=True, method="cmaes",
+                                              best_fitness=self.best_fitness, generation=self.generation,
+                                              games_played=self.games_played)
+            print(f"\nTraining complete. Best weights saved as version {version}")
+        return self.best_weights
+
+    def _settings(self) -> Dict:
+        return {"popsize": self.popsize, "sigma0": self.sigma0, "games": self.games, "level": self.level}
+
+    def _save_checkpoint(self) -> None:
+        state = {
+            "features": self.features,
+            "settings": self._settings(),
+            "generation": self.generation,
+            "mean": self.mean.tolist(),
+            "sigma": self.sigma,
+            "C": self.C.tolist(),
+            "pc": self.pc.tolist(),
+            "ps": self.ps.tolist(),
+            "best_weights": self.best_weights,
+            "best_fitness": self.best_fitness,
+            "games_played": self.games_played,
+            "rng": self.rng.bit_generator.state,
+        }
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    def _load_checkpoint(self) -> bool:
+        """Restore state from the checkpoint if it exists, is for the same features and
+        hasn't run all `generations` yet."""
+        try:
+            with open(self.checkpoint_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if state.get("features") != self.features or state["generation"] >= self.generations:
+            return False
+        if state.get("settings") != self._settings():
+            raise ValueError(f"Checkpoint {self.checkpoint_path} was run with {state.get('settings')}, "
+                             f"not {self._settings()}; start afresh with resume=False")
+        self.generation = state["generation"]
+        self.mean = np.array(state["mean"])
+        self.sigma = state["sigma"]
+        self.C = np.array(state["C"])
+        self.pc = np.array(state["pc"])
+        self.ps = np.array(state["ps"])
+        self.best_weights = state["best_weights"]
+        self.best_fitness = state["best_fitness"]
+        self.games_played = state["games_played"]
+        self.rng = np.random.default_rng()
+        self.rng.bit_generator.state = state["rng"]
+        return True
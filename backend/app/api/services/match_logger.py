@@ -0,0 +1,101 @@
+from __future__ import annotations
+import json
+import os
+import queue
+import threading
+from typing import Dict
+
+# Events a logger records at each verbosity: "summary" keeps only the end-of-run summary,
+# "games" adds one event per finished game, "moves" adds one event per ply.
+VERBOSITY = {"summary": 0, "games": 1, "moves": 2}
+
+_STOP = object()
+
+
+class MatchLogger:
+    """
+    Writes match events as JSON lines from a background thread.
+
+    `log()` only enqueues the event, so the game loop never waits on the disk. The writer
+    thread drains the queue in batches of up to `batch_size` events per write, creates the
+    directory on its first write, and starts a new part (`run.jsonl`, `run.1.jsonl`, ...)
+    once the current file exceeds `max_bytes`.
+    """
+
+    def __init__(self, path: str, verbosity: str = "games", max_bytes: int = 64 << 20,
+                 batch_size: int = 512) -> None:
+        if verbosity not in VERBOSITY:
+            raise ValueError(f"Unknown verbosity '{verbosity}'")
+        self.path = path
+        self.level = VERBOSITY[verbosity]
+        self.max_bytes = max_bytes
+        self.batch_size = batch_size
+        self.events_written = 0
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._part = 0
+        self._file = None
+        self._thread = threading.Thread(target=self._run, name="match-logger", daemon=True)
+        self._thread.start()
+
+    def wants(self, verbosity: str) -> bool:
+        """Check before building an event so disabled levels cost nothing."""
+        return VERBOSITY[verbosity] <= self.level
+
+    def log(self, event: Dict) -> None:
+        self._queue.put(event)
+
+    def close(self) -> None:
+        """Flush every queued event and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def part_path(self, part: int) -> str:
+        if part == 0:
+            return self.path
+        root, ext = os.path.splitext(self.path)
+        return f"{root}.{part}{ext}"
+
+    def _run(self) -> None:
+        try:
+            stopping = False
+            while not stopping:
+                batch = []
+                item = self._queue.get()
+                while True:
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if batch:
+                    self._write("".join(json.dumps(e, separators=(",", ":")) + "\n" for e in batch))
+                    self.events_written += len(batch)
+        finally:
+            if self._file is not None:
+                self._file.close()
+
+    def _write(self, text: str) -> None:
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.part_path(self._part), "a")
+        elif self._file.tell() >= self.max_bytes:
+            self._file.close()
+            self._part += 1
+            self._file = open(self.part_path(self._part), "a")
+        self._file.write(text)
+        self._file.flush()
+
+    def __enter__(self) -> "MatchLogger":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
@@ -1,54 +1,38 @@
 from __future__ import annotations
 import time
-import json
 import os
-from typing import Dict, Tuple, Type
+from typing import Dict, Optional, Tuple
 from app.core.engine.board import Board, BLACK, WHITE
 from app.core.eval.evaluator import Evaluator
-from app.core.ai.random_agent import RandomAgent
-from app.core.ai.greedy_agent import GreedyAgent
-from app.core.ai.minimax_agent import MinimaxAgent
-from app.core.ai.mcts_agent import MCTSAgent
-from app.core.ai.hybrid_agent import HybridAgent
+from app.core.ai.registry import DEFAULT_LEVEL, make_agent
+from app.core.ai.search_stats import SearchStats
+from app.core.ai.time_manager import TimeManager
+from app.api.services.match_logger import MatchLogger
 
 LOG_DIR = "app/logs/match_results"
-os.makedirs(LOG_DIR, exist_ok=True)
-
-AGENT_MAP: Dict[str, Type] = {
-    "random": RandomAgent,
-    "greedy": GreedyAgent,
-    "minimax": MinimaxAgent,
-    "mcts": MCTSAgent,
-    "hybrid": HybridAgent,
-}
-
 
 class MatchRunner:
-    def __init__(self, a1_name: str, a2_name: str, games: int = 10, time_limit: float = 1.5, log: bool = True):
+    def __init__(self, a1_name: str, a2_name: str, games: int = 10, time_limit: float = 1.5, log: bool = True,
+                 game_time: Optional[float] = None, increment: float = 0.0, agent1=None, agent2=None,
+                 log_verbosity: str = "games", log_dir: str = LOG_DIR, level: str = DEFAULT_LEVEL):
         self.evaluator = Evaluator()
         self.a1_name = a1_name
         self.a2_name = a2_name
         self.games = games
-        self.time_limit = time_limit
+        self.time_limit = time_limit  # wall-clock cap per move on top of the level's budget
+        self.level = level
         self.log = log
-
-        def _make_agent(name: str):
-            cls = AGENT_MAP.get(name.lower())
-            if not cls:
-                raise ValueError(f"Unknown agent '{name}'")
-            if name == "greedy":
-                return cls(self.evaluator)
-            elif name == "minimax":
-                return cls(self.evaluator, max_depth=4, time_limit=self.time_limit)
-            elif name == "mcts":
-                return cls(self.evaluator, simulations=400, time_limit=self.time_limit)
-            elif name == "hybrid":
-                return cls(self.evaluator, use_mcts=True, deep_depth=4, time_limit=self.time_limit)
-            else:
-                return cls()
-
-        self.agent1 = _make_agent(a1_name)
-        self.agent2 = _make_agent(a2_name)
+        # with log=True, events go to one JSONL file per run: see MatchLogger.VERBOSITY
+        self.log_verbosity = log_verbosity
+        self.log_dir = log_dir
+        self.log_path: Optional[str] = None
+        # when set, each agent gets a game clock per game instead of a flat time_limit per move
+        self.game_time = game_time
+        self.increment = increment
+
+        # pre-built agents may be passed in; the names are then just labels
+        self.agent1 = agent1 if agent1 is not None else make_agent(a1_name, self.evaluator, level, time_limit)
+        self.agent2 = agent2 if agent2 is not None else make_agent(a2_name, self.evaluator, level, time_limit)
 
         self.results = {
             "a1": a1_name,
@@ -57,40 +41,61 @@ class MatchRunner:
             "wins": {a1_name: 0, a2_name: 0, "draws": 0},
             "avg_move_time": {a1_name: 0.0, a2_name: 0.0},
             "avg_score_diff": 0.0,
+            "diffs": [],  # per game, BLACK minus WHITE discs
+            "search_stats": {},
         }
 
     def run(self) -> Dict:
+        logger = None
+        if self.log:
+            stamp = time.strftime("%Y%m%d_%H%M%S")
+            self.log_path = os.path.join(self.log_dir, f"match_{self.a1_name}_vs_{self.a2_name}_{stamp}.jsonl")
+            logger = MatchLogger(self.log_path, self.log_verbosity)
+        try:
+            return self._run(logger)
+        finally:
+            if logger is not None:
+                logger.close()
+
+    def _run(self, logger: Optional[MatchLogger]) -> Dict:
+        log_moves = logger is not None and logger.wants("moves")
+        log_games = logger is not None and logger.wants("games")
         all_diffs = []
+        search_stats = {self.a1_name: SearchStats.empty(), self.a2_name: SearchStats.empty()}
         for g in range(1, self.games + 1):
             b = Board()
             move_times = {self.a1_name: [], self.a2_name: []}
-            log_lines = [f"\n=== Game {g}: {self.a1_name} (Black) vs {self.a2_name} (White) ===\n"]
+            if self.game_time is not None:
+                for agent in (self.agent1, self.agent2):
+                    if hasattr(agent, "time_manager"):
+                        agent.time_manager = TimeManager(self.game_time, self.increment)
 
+            ply = 0
             while not b.is_terminal():
                 player = b.to_move
                 agent = self.agent1 if player == BLACK else self.agent2
                 agent_name = self.a1_name if player == BLACK else self.a2_name
                 start_t = time.time()
-                mv, _ = agent.best_move(b, player)
+                mv, score = agent.best_move(b, player)
                 elapsed = time.time() - start_t
                 move_times[agent_name].append(elapsed)
-
-                # handle passes
-                if mv is None:
-                    b.apply_move(None, player)
-                    log_lines.append(f"{agent_name} ({'BLACK' if player == BLACK else 'WHITE'}) passes.\n")
-                    continue
-
-                # safely apply move 
-                try:
-                    b.apply_move(mv, player)
-                    log_lines.append(
-                        f"{agent_name} ({'BLACK' if player == BLACK else 'WHITE'}) plays {mv} [{elapsed:.3f}s]\n"
-                    )
-                except ValueError:
-                    log_lines.append(f"[!] {agent_name} attempted illegal move {mv}, skipping.\n")
+                if agent.last_stats is not None:
+                    search_stats[agent_name].merge(agent.last_stats)
+
+                # an illegal move is played as a pass
+                illegal = False
+                if mv is not None:
+                    try:
+                        b.apply_move(mv, player)
+                    except ValueError:
+                        illegal = True
+                if mv is None or illegal:
                     b.apply_move(None, player)
-                    continue
+
+                if log_moves:
+                    logger.log({"event": "move", "game": g, "ply": ply, "agent": agent_name, "player": player,
+                                "move": mv, "illegal": illegal, "time": elapsed, "score": score})
+                ply += 1
 
             b_score, w_score = b.score()
             diff = b_score - w_score
@@ -98,33 +103,32 @@ class MatchRunner:
 
             if b_score > w_score:
                 self.results["wins"][self.a1_name] += 1
-                outcome = f"{self.a1_name} wins"
+                winner = self.a1_name
             elif w_score > b_score:
                 self.results["wins"][self.a2_name] += 1
-                outcome = f"{self.a2_name} wins"
+                winner = self.a2_name
             else:
                 self.results["wins"]["draws"] += 1
-                outcome = "Draw"
+                winner = None
 
             avg_a1 = sum(move_times[self.a1_name]) / len(move_times[self.a1_name]) if move_times[self.a1_name] else 0
             avg_a2 = sum(move_times[self.a2_name]) / len(move_times[self.a2_name]) if move_times[self.a2_name] else 0
             self.results["avg_move_time"][self.a1_name] += avg_a1
             self.results["avg_move_time"][self.a2_name] += avg_a2
 
-            log_lines.append(f"Final: BLACK {b_score} - WHITE {w_score}  |  {outcome}\n")
-
-            if self.log:
-                fname = f"{LOG_DIR}/match_{self.a1_name}_vs_{self.a2_name}_{g}.log"
-                with open(fname, "w") as f:
-                    f.writelines(log_lines)
+            if log_games:
+                logger.log({"event": "game", "game": g, "black_agent": self.a1_name, "white_agent": self.a2_name,
+                            "black": b_score, "white": w_score, "winner": winner, "plies": ply})
 
         self.results["avg_score_diff"] = sum(all_diffs) / len(all_diffs)
+        self.results["diffs"] = all_diffs
         self.results["avg_move_time"][self.a1_name] /= self.games
         self.results["avg_move_time"][self.a2_name] /= self.games
+        self.results["search_stats"] = {
+            name: stats.to_dict() for name, stats in search_stats.items() if stats.moves
+        }
 
-        if self.log:
-            summary_file = f"{LOG_DIR}/summary_{self.a1_name}_vs_{self.a2_name}.json"
-            with open(summary_file, "w") as f:
-                json.dump(self.results, f, indent=4)
+        if logger is not None:
+            logger.log({"event": "summary", **self.results})
 
         return self.results
@@ -0,0 +1,69 @@
+from __future__ import annotations
+import threading
+from typing import Dict, List
+from app.core.ai.search_stats import SearchStats
+from app.core.eval.evaluator import SHARED_EVAL_CACHE
+
+# (metric name, SearchStats attribute, help text)
+_COUNTER_METRICS = [
+    ("othello_search_nodes_total", "nodes", "Positions searched (alpha-beta nodes / MCTS tree nodes)."),
+    ("othello_search_leaf_evals_total", "leaf_evals", "Evaluator.evaluate calls."),
+    ("othello_tt_probes_total", "tt_probes", "Transposition table lookups."),
+    ("othello_tt_hits_total", "tt_hits", "Transposition table lookups with a deep enough entry."),
+    ("othello_tt_cutoffs_total", "tt_cutoffs", "Nodes answered directly from the transposition table."),
+    ("othello_mcts_simulations_total", "simulations", "MCTS playouts."),
+    ("othello_mcts_rollout_plies_total", "rollout_plies", "Plies played inside MCTS rollouts."),
+    ("othello_mcts_bound_results_total", "bound_results", "MCTS simulations settled by stable-disc bounds."),
+    ("othello_search_depth_reached_sum", "depth_reached", "Sum of completed search depths (divide by moves)."),
+]
+
+_PHASES = [("movegen", "time_movegen"), ("eval", "time_eval"), ("hash", "time_hash")]
+
+
+class SearchMetrics:
+    """Process-wide aggregate of SearchStats per agent, rendered in Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._by_agent: Dict[str, SearchStats] = {}
+
+    def record(self, agent: str, stats: SearchStats) -> None:
+        with self._lock:
+            self._by_agent.setdefault(agent, SearchStats.empty()).merge(stats)
+
+    def render(self) -> str:
+        with self._lock:
+            agents = sorted(self._by_agent.items())
+            lines: List[str] = [
+                "# HELP othello_ai_moves_total AI moves searched.",
+                "# TYPE othello_ai_moves_total counter",
+            ]
+            lines += [f'othello_ai_moves_total{{agent="{a}"}} {s.moves}' for a, s in agents]
+            for metric, attr, help_text in _COUNTER_METRICS:
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                lines += [f'{metric}{{agent="{a}"}} {getattr(s, attr)}' for a, s in agents]
+            lines.append("# HELP othello_search_seconds_total Wall-clock time spent in best_move.")
+            lines.append("# TYPE othello_search_seconds_total counter")
+            lines += [f'othello_search_seconds_total{{agent="{a}"}} {s.time_total:.6f}' for a, s in agents]
+            lines.append("# HELP othello_search_phase_seconds_total Search time split by phase.")
+            lines.append("# TYPE othello_search_phase_seconds_total counter")
+            for a, s in agents:
+                for phase, attr in _PHASES:
+                    lines.append(f'othello_search_phase_seconds_total{{agent="{a}",phase="{phase}"}} {getattr(s, attr):.6f}')
+        cache = SHARED_EVAL_CACHE.stats()
+        lines += [
+            "# HELP othello_eval_cache_hits_total Shared evaluation cache hits.",
+            "# TYPE othello_eval_cache_hits_total counter",
+            f"othello_eval_cache_hits_total {cache['hits']}",
+            "# HELP othello_eval_cache_misses_total Shared evaluation cache misses.",
+            "# TYPE othello_eval_cache_misses_total counter",
+            f"othello_eval_cache_misses_total {cache['misses']}",
+            "# HELP othello_eval_cache_entries Positions held in the shared evaluation cache.",
+            "# TYPE othello_eval_cache_entries gauge",
+            f"othello_eval_cache_entries {cache['entries']}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+SEARCH_METRICS = SearchMetrics()
@@ -0,0 +1,144 @@
+from __future__ import annotations
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Callable, Dict, Optional, Tuple
+
+PROFILE_DIR = "app/logs/profiles"
+# profile every search without a per-request flag, e.g. OTHELLO_PROFILE=sample
+PROFILE_ENV = "OTHELLO_PROFILE"
+# cprofile: deterministic, writes a .pstats file (snakeviz, pstats); sample: stack sampling,
+# writes collapsed stacks (flamegraph.pl, speedscope); memory: tracemalloc peak and top sites,
+# which are process-wide, so concurrent requests show up in them too
+MODES = ("cprofile", "sample", "memory")
+# tracemalloc's peak and start/stop are process-wide: memory-mode runs take turns
+_MEMORY_LOCK = threading.Lock()
+
+
+def profile_mode(requested: Optional[str] = None) -> Optional[str]:
+    """The mode to profile with: the request's, else the environment's; None when off.
+    ValueError for an unknown mode."""
+    mode = requested or os.environ.get(PROFILE_ENV) or None
+    if mode is not None and mode not in MODES:
+        raise ValueError(f"Unknown profile mode '{mode}'; choose from {list(MODES)}")
+    return mode
+
+
+def _frame_name(code) -> str:
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class StackSampler:
+    """Samples one thread's Python stack every `interval` seconds from a daemon thread and
+    counts the stacks in collapsed form ("outer;...;inner" -> samples)."""
+
+    def __init__(self, thread_id: int, interval: float = 0.001, root=None) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.root = root  # frame the stacks are cut at (its callers are left out)
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None and frame is not self.root:
+                names.append(_frame_name(frame.f_code))
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def __enter__(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+
+def _top_functions(profile: cProfile.Profile, limit: int) -> list:
+    stats = pstats.Stats(profile, stream=io.StringIO())
+    rows = []
+    for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({"function": f"{os.path.basename(filename)}:{line}({name})", "calls": calls,
+                     "tottime": tottime, "cumtime": cumtime})
+    rows.sort(key=lambda r: r["tottime"], reverse=True)
+    return rows[:limit]
+
+
+def run_profiled(fn: Callable[[], object], mode: str, tags: Dict, out_dir: Optional[str] = None,
+                 top: int = 15) -> Tuple[object, Dict]:
+    """
+    Call `fn` under the `mode` profiler. The artifact is written to `out_dir` (default
+    PROFILE_DIR) next to a `.json` file holding `tags` (agent, position, budget, ...) and
+    the summary, which is also returned with fn's result:
+    (result, {"mode", "artifact", "seconds", "top", ...}).
+    """
+    out_dir = out_dir or PROFILE_DIR
+    os.makedirs(out_dir, exist_ok=True)
+    stem = os.path.join(out_dir, f"{time.strftime('%Y%m%d_%H%M%S')}_{tags.get('agent', 'search')}_{mode}"
+                                 f"_{os.getpid()}_{threading.get_ident() % 10000}")
+    summary: Dict = {"mode": mode, "tags": tags}
+    start = time.perf_counter()
+    if mode == "cprofile":
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            result = fn()
+        finally:
+            profile.disable()
+        summary["artifact"] = stem + ".pstats"
+        profile.dump_stats(summary["artifact"])
+        summary["top"] = _top_functions(profile, top)
+    elif mode == "sample":
+        with StackSampler(threading.get_ident(), root=sys._getframe()) as sampler:
+            result = fn()
+        summary["artifact"] = stem + ".collapsed"
+        with open(summary["artifact"], "w") as f:
+            f.write(sampler.collapsed())
+        leaves = Counter()
+        for stack, n in sampler.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += n
+        total = sum(leaves.values())
+        summary["samples"] = total
+        summary["top"] = [{"function": name, "samples": n, "share": n / total} for name, n in leaves.most_common(top)]
+    elif mode == "memory":
+        with _MEMORY_LOCK:
+            tracing = tracemalloc.is_tracing()
+            if not tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            try:
+                result = fn()
+                # whatever the agent keeps after the move (e.g. the TT) is still live here;
+                # a search's MCTS tree is gone, but it shows in the peak
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+            finally:
+                if not tracing:
+                    tracemalloc.stop()
+        summary["artifact"] = stem + ".tracemalloc"
+        snapshot.dump(summary["artifact"])
+        summary["current_bytes"] = current
+        summary["peak_bytes"] = peak
+        summary["top"] = [{"site": str(s.traceback), "bytes": s.size, "blocks": s.count}
+                          for s in snapshot.statistics("lineno")[:top]]
+    else:
+        raise ValueError(f"Unknown profile mode '{mode}'; choose from {list(MODES)}")
+    summary["seconds"] = time.perf_counter() - start
+    with open(stem + ".json", "w") as f:
+        json.dump(summary, f, indent=2, default=str)
+    return result, summary
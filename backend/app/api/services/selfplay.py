@@ -0,0 +1,203 @@
+from __future__ import annotations
+import glob
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+import numpy as np
+from app.core.engine.board import Board, BLACK
+from app.core.engine.batch_rollout import board_to_bits
+from app.core.eval.evaluator import Evaluator
+from app.core.ai.registry import DEFAULT_LEVEL, make_agent
+
+DATA_DIR = "app/logs/selfplay"
+
+# One record per ply, 28 bytes, little-endian and unpadded so shards can be
+# appended to with tofile() and read back with np.memmap(path, dtype=RECORD_DTYPE).
+RECORD_DTYPE = np.dtype([
+    ("game", "<u4"),     # game number, unique within a shard directory
+    ("ply", "u1"),
+    ("black", "<u8"),    # bitboards before the move, bit r * 8 + c
+    ("white", "<u8"),
+    ("to_move", "i1"),   # BLACK (1) or WHITE (-1)
+    ("move", "i1"),      # square r * 8 + c played, -1 for a pass
+    ("score", "<f4"),    # search score (BLACK's perspective), NaN for random opening plies
+    ("result", "i1"),    # final disc difference, BLACK minus WHITE
+])
+
+
+def play_game(black, white, game: int = 0, random_plies: int = 0,
+              rng: Optional[random.Random] = None) -> np.ndarray:
+    """
+    Play one game between two agents and return its plies as RECORD_DTYPE records.
+    The first `random_plies` plies are uniformly random so repeated games differ.
+    """
+    rng = rng or random.Random(game)
+    b = Board()
+    rows = []
+    while not b.is_terminal():
+        player = b.to_move
+        black_bits, white_bits = board_to_bits(b)
+        if len(rows) < random_plies:
+            moves = b.legal_moves(player)
+            mv, score = (rng.choice(moves) if moves else None), float("nan")
+        else:
+            agent = black if player == BLACK else white
+            mv, score = agent.best_move(b, player)
+        try:
+            b.apply_move(mv, player)
+        except ValueError:
+            # same policy as MatchRunner: an illegal move becomes a pass
+            mv = None
+            b.apply_move(None, player)
+        square = -1 if mv is None else mv[0] * 8 + mv[1]
+        rows.append((game, len(rows), black_bits, white_bits, player, square, score, 0))
+    records = np.array(rows, dtype=RECORD_DTYPE)
+    b_score, w_score = b.score()
+    records["result"] = b_score - w_score
+    return records
+
+
+def _play_batch(a1_name: str, a2_name: str, level: str, time_limit: Optional[float], random_plies: int, seed: int,
+                games: List[int]) -> np.ndarray:
+    """Worker entry point: play `games` (a1 is BLACK in even games) and return all their records."""
+    evaluator = Evaluator()
+    batches = []
+    for g in games:
+        # fresh agents per game: a game depends on its number only, not on how games were batched
+        base = seed * 1_000_003 + g
+        a1 = make_agent(a1_name, evaluator, level, time_limit, seed=2 * base)
+        a2 = make_agent(a2_name, evaluator, level, time_limit, seed=2 * base + 1)
+        black, white = (a1, a2) if g % 2 == 0 else (a2, a1)
+        batches.append(play_game(black, white, g, random_plies, random.Random(base)))
+    return np.concatenate(batches)
+
+
+class ShardWriter:
+    """
+    Appends record arrays to `<prefix>-00000.bin`, `<prefix>-00001.bin`, ... in `directory`,
+    starting a new shard every `shard_records` records. Reopening a directory resumes
+    after the last existing record, so runs can be appended to; a partial record left
+    by a crash mid-write is cut off first.
+    """
+
+    def __init__(self, directory: str = DATA_DIR, prefix: str = "selfplay", shard_records: int = 1 << 20) -> None:
+        self.directory = directory
+        self.prefix = prefix
+        self.shard_records = shard_records
+        existing = shard_paths(directory, prefix)
+        self._index = len(existing) - 1 if existing else 0
+        self._count = 0
+        if existing:
+            self._count = os.path.getsize(existing[-1]) // RECORD_DTYPE.itemsize
+            os.truncate(existing[-1], self._count * RECORD_DTYPE.itemsize)
+        self._file = None
+        self.records_written = 0
+
+    def path(self, index: int) -> str:
+        return os.path.join(self.directory, f"{self.prefix}-{index:05d}.bin")
+
+    def write(self, records: np.ndarray) -> None:
+        records = np.ascontiguousarray(records, dtype=RECORD_DTYPE)
+        while len(records):
+            if self._count >= self.shard_records:
+                self._close_file()
+                self._index += 1
+                self._count = 0
+            if self._file is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._file = open(self.path(self._index), "ab")
+            chunk = records[:self.shard_records - self._count]
+            chunk.tofile(self._file)
+            self._count += len(chunk)
+            self.records_written += len(chunk)
+            records = records[len(chunk):]
+        if self._file is not None:
+            self._file.flush()
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self) -> None:
+        self._close_file()
+
+    def __enter__(self) -> "ShardWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def shard_paths(directory: str = DATA_DIR, prefix: str = "selfplay") -> List[str]:
+    return sorted(glob.glob(os.path.join(directory, f"{prefix}-[0-9][0-9][0-9][0-9][0-9].bin")))
+
+
+def open_shards(directory: str = DATA_DIR, prefix: str = "selfplay") -> List[np.ndarray]:
+    """Memory-map every non-empty shard read-only; nothing is loaded until it is indexed.
+    A partial trailing record (a crash mid-write) is left out."""
+    shards = []
+    for p in shard_paths(directory, prefix):
+        count = os.path.getsize(p) // RECORD_DTYPE.itemsize
+        if count:
+            shards.append(np.memmap(p, dtype=RECORD_DTYPE, mode="r", shape=(count,)))
+    return shards
+
+
+def next_game_id(directory: str = DATA_DIR, prefix: str = "selfplay") -> int:
+    """One past the largest game number stored in `directory` (0 when it holds none)."""
+    return max((int(s["game"].max()) + 1 for s in open_shards(directory, prefix)), default=0)
+
+
+class SelfPlayGenerator:
+    """
+    Plays `games` games between two named agents across `workers` processes and streams
+    each finished batch of games to a ShardWriter as it arrives. Game numbers continue
+    after those already in `out_dir`, and every game's openings and agent RNGs are seeded
+    from its number, so appending another run never repeats a game.
+    """
+
+    def __init__(self, a1_name: str = "minimax", a2_name: Optional[str] = None, games: int = 100,
+                 workers: Optional[int] = None, level: str = DEFAULT_LEVEL, time_limit: Optional[float] = None,
+                 random_plies: int = 4,
+                 out_dir: str = DATA_DIR, shard_records: int = 1 << 20, seed: int = 0,
+                 games_per_task: int = 4) -> None:
+        self.a1_name = a1_name
+        self.a2_name = a2_name or a1_name
+        self.games = games
+        self.workers = workers or os.cpu_count() or 1
+        # search budgets rather than time keep a seeded run reproducible; time_limit is an extra cap
+        self.level = level
+        self.time_limit = time_limit
+        self.random_plies = random_plies
+        self.out_dir = out_dir
+        self.shard_records = shard_records
+        self.seed = seed
+        self.games_per_task = games_per_task
+
+    def run(self) -> Dict:
+        start = time.time()
+        first = next_game_id(self.out_dir)
+        end = first + self.games
+        tasks = [list(range(i, min(i + self.games_per_task, end)))
+                 for i in range(first, end, self.games_per_task)]
+        args = (self.a1_name, self.a2_name, self.level, self.time_limit, self.random_plies, self.seed)
+        with ShardWriter(self.out_dir, shard_records=self.shard_records) as writer:
+            if self.workers <= 1:
+                for games in tasks:
+                    writer.write(_play_batch(*args, games))
+            else:
+                with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                    futures = [pool.submit(_play_batch, *args, games) for games in tasks]
+                    for fut in as_completed(futures):
+                        writer.write(fut.result())
+            records = writer.records_written
+        return {
+            "games": self.games,
+            "first_game": first,
+            "records": records,
+            "shards": shard_paths(self.out_dir),
+            "seconds": time.time() - start,
+        }
@@ -1,13 +1,17 @@
 from __future__ import annotations
+import math
 import random
-import json
-import os
-from typing import Dict, List, Tuple
-from app.api.services.match_runner import MatchRunner
+from typing import Callable, Dict, List, Optional, Tuple
+from app.core.ai.registry import DEFAULT_LEVEL, make_agent
 from app.core.eval.evaluator import Evaluator
+from app.core.eval.features import FEATURE_NAMES
 
 LOG_DIR = "app/logs/training"
-os.makedirs(LOG_DIR, exist_ok=True)
+
+
+class TrainingCancelled(Exception):
+    """Raised inside train() once the trainer's should_stop hook returns True."""
+
 
 class GATrainer:
     def __init__(
@@ -18,6 +22,13 @@ class GATrainer:
         generations: int = 5,
         mutation_rate: float = 0.3,
         crossover_rate: float = 0.7,
+        racing: bool = True,
+        race_games: int = 1,
+        max_games: int = 2,
+        drop_fraction: float = 0.5,
+        confidence: float = 1.0,
+        level: str = DEFAULT_LEVEL,
+        random_plies: int = 4,
     ) -> None:
         self.base_agent = base_agent
         self.opponent_agent = opponent_agent
@@ -25,7 +36,31 @@ class GATrainer:
         self.generations = generations
         self.mutation_rate = mutation_rate
         self.crossover_rate = crossover_rate
-        self.feature_names = ["disc_diff", "mobility", "corner_occupancy", "corner_adj", "frontier"]
+        self.feature_names = list(FEATURE_NAMES)
+        self.level = level  # search budget of both agents in fitness games
+        # fitness games open with this many random plies, else a node-budgeted search
+        # against a deterministic opponent replays the same game every time. Game i of
+        # every candidate gets the same opening, so candidates are compared on equal terms.
+        self.random_plies = random_plies
+        # racing: every candidate plays race_games games per round; after each round the
+        # ones that are clearly (or, failing that, comparatively) worse are dropped and the
+        # rest play on, up to max_games each. Without racing every candidate plays max_games,
+        # so racing never costs more than uniform evaluation.
+        self.racing = racing
+        self.race_games = race_games
+        self.max_games = max_games
+        self.drop_fraction = drop_fraction
+        self.confidence = confidence  # z multiplier of the standard error in the bounds
+        self.min_sd = 4.0  # disc-differential spread assumed while a candidate has few games
+        self.games_played = 0
+        # per-game disc differentials of every candidate evaluated so far, so candidates
+        # carried over unchanged into the next generation aren't replayed
+        self._diffs: Dict[Tuple[float, ...], List[float]] = {}
+        self.best_fitness = float("-inf")
+        # hooks for job runners: on_progress gets a dict after every generation,
+        # should_stop is polled before every batch of games
+        self.on_progress: Optional[Callable[[Dict], None]] = None
+        self.should_stop: Optional[Callable[[], bool]] = None
 
     def _random_weights(self) -> Dict[str, float]:
         """Generate random weight set."""
@@ -48,34 +83,101 @@ class GATrainer:
                 child[k] = w2[k]
         return child
 
+    def _key(self, weights: Dict[str, float]) -> Tuple[float, ...]:
+        return tuple(weights[k] for k in self.feature_names)
+
+    def _play(self, weights: Dict[str, float], games: int) -> List[float]:
+        """Play `games` more games for a candidate and return all of its disc differentials."""
+        diffs = self._diffs.setdefault(self._key(weights), [])
+        if games > 0:
+            if self.should_stop is not None and self.should_stop():
+                raise TrainingCancelled()
+            from app.api.services.selfplay import play_game
+            evaluator = Evaluator(weights)
+            for g in range(len(diffs), len(diffs) + games):
+                agent = make_agent(self.base_agent, evaluator, self.level, time_limit=1.0, seed=g)
+                opponent = make_agent(self.opponent_agent, Evaluator(), self.level, time_limit=1.0, seed=g)
+                diffs.append(float(play_game(agent, opponent, g, self.random_plies)["result"][-1]))
+            self.games_played += games
+        return diffs
+
     def _fitness(self, weights: Dict[str, float]) -> float:
         """Play against opponent agent and return average score difference."""
-        evaluator = Evaluator(weights)
-        runner = MatchRunner(self.base_agent, self.opponent_agent, games=2, time_limit=1.0, log=False)
-        runner.agent1.evaluator = evaluator 
-        results = runner.run()
-        return results["avg_score_diff"]
-
-    def train(self) -> Dict[str, float]:
-        """Run the GA evolution loop."""
+        diffs = self._play(weights, max(0, self.max_games - len(self._diffs.get(self._key(weights), []))))
+        return sum(diffs) / len(diffs)
+
+    def _bounds(self, diffs: List[float]) -> Tuple[float, float, float]:
+        """(mean, lower, upper) confidence bounds on a candidate's mean disc differential."""
+        n = len(diffs)
+        mean = sum(diffs) / n
+        var = sum((d - mean) ** 2 for d in diffs) / (n - 1) if n > 1 else 0.0
+        half = self.confidence * max(math.sqrt(var), self.min_sd) / math.sqrt(n)
+        return mean, mean - half, mean + half
+
+    def _race(self, population: List[Dict[str, float]], keep: int) -> List[Tuple[Dict[str, float], float]]:
+        """
+        Successive halving with confidence bounds. Round r tops every live candidate up to
+        race_games * (r + 1) games (capped at max_games; earlier results count); any whose upper bound is below the keep-th best lower bound
+        is dropped, then the worst drop_fraction by mean (never leaving fewer than keep).
+        So the keep survivors end with max_games each and hopeless candidates with race_games.
+        Returns (weights, mean diff) best first: candidates that lasted longer rank higher.
+        """
+        alive = list(population)
+        rounds_survived = {id(w): 0 for w in population}
+        target_games = 0
+        while alive:
+            target_games = min(self.max_games, target_games + self.race_games)
+            for w in alive:
+                self._play(w, target_games - len(self._diffs.get(self._key(w), [])))
+            if target_games >= self.max_games:
+                break
+            stats = {id(w): self._bounds(self._diffs[self._key(w)]) for w in alive}
+            cutoff = sorted((stats[id(w)][1] for w in alive), reverse=True)[keep - 1]
+            clearly_worse = [w for w in alive if stats[id(w)][2] < cutoff]
+            alive = [w for w in alive if stats[id(w)][2] >= cutoff]
+            alive.sort(key=lambda w: stats[id(w)][0], reverse=True)
+            target = max(keep, len(alive) - int(len(alive) * self.drop_fraction))
+            if not clearly_worse:
+                alive = alive[:target]
+            for w in alive:
+                rounds_survived[id(w)] += 1
+        ranked = []
+        for w in population:
+            diffs = self._diffs[self._key(w)]
+            ranked.append((rounds_survived[id(w)], sum(diffs) / len(diffs), w))
+        ranked.sort(key=lambda r: (r[0], r[1]), reverse=True)
+        return [(w, mean) for _, mean, w in ranked]
+
+    def _rank(self, population: List[Dict[str, float]]) -> List[Tuple[Dict[str, float], float]]:
+        """Score a generation and return (weights, fitness) best first."""
+        if self.racing:
+            return self._race(population, max(2, self.population_size // 2))
+        scored = [(w, self._fitness(w)) for w in population]
+        scored.sort(key=lambda x: x[1], reverse=True)
+        return scored
+
+    def train(self, save: bool = True) -> Dict[str, float]:
+        """Run the GA evolution loop. With save, the best weights are published to the
+        weight registry and promoted."""
         population = [self._random_weights() for _ in range(self.population_size)]
 
         # Ensure we always have a valid Dict[str,float] to return (avoid None)
         best_weights: Dict[str, float] = population[0]
-        best_score = float("-inf")
+        best_score = self.best_fitness = float("-inf")
 
         for gen in range(1, self.generations + 1):
             print(f"\n=== Generation {gen}/{self.generations} ===")
-            scored_pop: List[Tuple[Dict[str, float], float]] = []
-            for w in population:
-                score = self._fitness(w)
-                scored_pop.append((w, score))
-                print(f"Candidate {w} → fitness {score:.2f}")
-
-            scored_pop.sort(key=lambda x: x[1], reverse=True)
+            played_before = self.games_played
+            scored_pop = self._rank(population)
+            for w, score in scored_pop:
+                print(f"Candidate {w} → fitness {score:.2f} ({len(self._diffs[self._key(w)])} games)")
+            print(f"Games played this generation: {self.games_played - played_before}")
             if scored_pop[0][1] > best_score:
-                best_score = scored_pop[0][1]
+                best_score = self.best_fitness = scored_pop[0][1]
                 best_weights = scored_pop[0][0]
+            if self.on_progress is not None:
+                self.on_progress({"generation": gen, "generations": self.generations, "best_fitness": best_score,
+                                  "best_weights": best_weights, "games_played": self.games_played})
 
             survivors = [w for w, _ in scored_pop[: self.population_size // 2]]
             new_population = survivors.copy()
@@ -90,9 +192,23 @@ class GATrainer:
 
             print(f"Best in generation {gen}: {best_weights} with fitness {best_score:.2f}")
 
-        # Save best weights
-        out_file = os.path.join(LOG_DIR, "trained_weights.json")
-        with open(out_file, "w") as f:
-            json.dump(best_weights, f, indent=4)
-        print(f"\nTraining complete. Best weights saved to {out_file}")
+        if save:
+            from app.api.services.weight_registry import WEIGHT_REGISTRY
+            version = WEIGHT_REGISTRY.publish(best_weights, promote=True, method="ga",
+                                              best_fitness=best_score, generation=self.generations,
+                                              games_played=self.games_played)
+            print(f"\nTraining complete. Best weights saved as version {version}")
         return best_weights
+
+
+TRAINING_METHODS = ("ga", "cmaes")
+
+
+def make_trainer(method: str = "ga", **kwargs):
+    """GATrainer for "ga", CMAESTrainer for "cmaes"; kwargs go to the trainer."""
+    if method == "ga":
+        return GATrainer(**kwargs)
+    if method == "cmaes":
+        from app.api.services.cmaes import CMAESTrainer
+        return CMAESTrainer(**kwargs)
+    raise ValueError(f"Unknown training method '{method}'")
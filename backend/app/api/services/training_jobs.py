@@ -0,0 +1,272 @@
+from __future__ import annotations
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from typing import Dict, List, Optional
+from app.api.services.trainer import LOG_DIR, TRAINING_METHODS, TrainingCancelled, make_trainer
+from app.api.services.weight_registry import WEIGHT_REGISTRY, WeightRegistry, write_json_atomic
+
+JOBS_DIR = os.path.join(LOG_DIR, "jobs")
+# what job.json keeps of a job, so recover() can rebuild it after a restart
+_SAVED = ("id", "method", "params", "key", "dir", "status", "created", "finished",
+          "progress", "version", "error", "cancel_requested")
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+_ACTIVE = (QUEUED, RUNNING)
+
+
+class QueueFull(Exception):
+    """Raised by submit() when `max_queued` jobs are already waiting or running."""
+
+
+def _init_worker(nice: int) -> None:
+    if nice:
+        try:
+            os.nice(nice)
+        except (AttributeError, OSError):
+            pass
+
+
+def _run_job(job_dir: str, method: str, params: Dict) -> Dict:
+    """Worker entry point: train, streaming progress to job_dir/progress.json and
+    stopping between games once job_dir/cancel exists."""
+    progress_path = os.path.join(job_dir, "progress.json")
+    cancel_path = os.path.join(job_dir, "cancel")
+    write_json_atomic(progress_path, {"generation": 0, "started": time.time()})
+    trainer = make_trainer(method, **params)
+    trainer.on_progress = lambda progress: write_json_atomic(progress_path, progress)
+    trainer.should_stop = lambda: os.path.exists(cancel_path)
+    try:
+        weights = trainer.train(save=False)
+    except TrainingCancelled:
+        return {"status": CANCELLED, "games_played": trainer.games_played}
+    return {"status": DONE, "weights": weights, "best_fitness": trainer.best_fitness,
+            "generation": trainer.generations, "games_played": trainer.games_played}
+
+
+class TrainingJobManager:
+    """
+    Runs training jobs one at a time in a separate, lower-priority worker process.
+
+    At most `max_queued` jobs may be queued or running; submitting an identical job
+    (same method and parameters) while one is active returns that job instead of
+    starting another. Training uses at most `cpu_cap` cores (CMA-ES evaluation
+    processes included), so it no longer competes with live games on the server's
+    own workers. Each finished job's weights are published as a new version in
+    `registry` and, with `promote`, become the served set.
+
+    Jobs are recorded in `jobs_dir/<id>/job.json`. shutdown() stops the running job
+    through its cancel file but leaves it queued, and recover() requeues such jobs on
+    the next start. CMA-ES jobs checkpoint to a path derived from their parameters,
+    so a requeued (or identical later) job continues where the last one stopped.
+    """
+
+    def __init__(self, max_queued: int = 4, cpu_cap: Optional[int] = None, nice: int = 10,
+                 jobs_dir: str = JOBS_DIR, registry: WeightRegistry = WEIGHT_REGISTRY,
+                 promote: bool = True) -> None:
+        self.max_queued = max_queued
+        self.cpu_cap = cpu_cap or max(1, (os.cpu_count() or 2) // 2)
+        self.nice = nice
+        self.jobs_dir = jobs_dir
+        self.registry = registry
+        self.promote = promote
+        self._jobs: Dict[str, Dict] = {}
+        self._futures: Dict[str, Future] = {}
+        # guards _jobs, the job dicts and their job.json; reentrant because cancelling a
+        # queued future runs its _finish callback in the cancelling thread
+        self._lock = threading.RLock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._closing = False
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # created on first submit; spawn rather than fork the (threaded) web server
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"),
+                                             initializer=_init_worker, initargs=(self.nice,))
+        return self._pool
+
+    def submit(self, method: str = "ga", **params) -> Dict:
+        """Queue a training job and return its status (an already active identical job's, if any)."""
+        if method not in TRAINING_METHODS:
+            raise ValueError(f"Unknown training method '{method}'")
+        if method == "cmaes":
+            params["workers"] = min(params.get("workers") or self.cpu_cap, self.cpu_cap)
+        key = json.dumps([method, params], sort_keys=True)
+        with self._lock:
+            for job in self._jobs.values():
+                if job["key"] == key and self._status(job) in _ACTIVE:
+                    return self._view(job)
+            if sum(self._status(job) in _ACTIVE for job in self._jobs.values()) >= self.max_queued:
+                raise QueueFull(f"{self.max_queued} training jobs already queued")
+            job_id = uuid.uuid4().hex[:12]
+            job_dir = os.path.join(self.jobs_dir, job_id)
+            os.makedirs(job_dir, exist_ok=True)
+            if method == "cmaes":
+                digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+                params.setdefault("checkpoint_path", os.path.join(self.jobs_dir, "checkpoints", f"cmaes-{digest}.json"))
+            job = self._jobs[job_id] = {
+                "id": job_id, "method": method, "params": params, "key": key, "dir": job_dir,
+                "status": QUEUED, "created": time.time(), "finished": None,
+                "progress": None, "version": None, "error": None, "cancel_requested": False,
+            }
+            self._save(job)
+            self._start(job)
+            return self._view(job)
+
+    def recover(self) -> List[Dict]:
+        """Load the jobs recorded in jobs_dir and requeue those a shutdown interrupted
+        (or that were still queued). Returns the requeued jobs."""
+        requeued = []
+        with self._lock:
+            for path in sorted(glob.glob(os.path.join(self.jobs_dir, "*", "job.json"))):
+                try:
+                    with open(path) as f:
+                        job = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                if job["id"] in self._jobs:
+                    continue
+                job["dir"] = os.path.dirname(path)
+                self._jobs[job["id"]] = job
+                if job["status"] in _ACTIVE:
+                    self._requeue(job)
+                    requeued.append(job)
+            requeued.sort(key=lambda j: j["created"])
+            for job in requeued:
+                self._start(job)
+            return [self._view(job) for job in requeued]
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return None if job is None else self._view(job)
+
+    def list(self) -> List[Dict]:
+        with self._lock:
+            return [self._view(job) for job in sorted(self._jobs.values(), key=lambda j: j["created"])]
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """Cancel a queued job outright, or ask a running one to stop after its current game."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if self._status(job) in _ACTIVE:
+                job["cancel_requested"] = True
+                self._save(job)
+                if not self._futures[job_id].cancel():
+                    with open(os.path.join(job["dir"], "cancel"), "w"):
+                        pass
+            return self._view(job)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Dict:
+        """Block until the job has finished (and its result is published)."""
+        try:
+            self._futures[job_id].result(timeout)
+        except (CancelledError, Exception):
+            pass
+        deadline = None if timeout is None else time.time() + timeout
+        while self._jobs[job_id]["status"] in _ACTIVE and (deadline is None or time.time() < deadline):
+            time.sleep(0.01)
+        return self.get(job_id)
+
+    def shutdown(self) -> None:
+        """Stop the worker: queued jobs are dropped from it and the running one stops after
+        its current game. Both stay queued in job.json for recover()."""
+        self._closing = True
+        with self._lock:
+            for job_id, job in self._jobs.items():
+                if self._status(job) in _ACTIVE and job_id in self._futures:
+                    if not self._futures[job_id].cancel():
+                        with open(os.path.join(job["dir"], "cancel"), "w"):
+                            pass
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        self._closing = False
+
+    def _start(self, job: Dict) -> None:
+        job_id = job["id"]
+        future = self._futures[job_id] = self._executor().submit(_run_job, job["dir"], job["method"], job["params"])
+        future.add_done_callback(lambda f: self._finish(job_id, f))
+
+    def _requeue(self, job: Dict) -> None:
+        # files of the interrupted attempt would read as running / cancelled
+        for name in ("progress.json", "cancel"):
+            path = os.path.join(job["dir"], name)
+            if os.path.exists(path):
+                os.remove(path)
+        job["status"] = QUEUED
+        self._save(job)
+
+    def _save(self, job: Dict) -> None:
+        write_json_atomic(os.path.join(job["dir"], "job.json"), {k: job.get(k) for k in _SAVED})
+
+    def _status(self, job: Dict) -> str:
+        if job["status"] == QUEUED and os.path.exists(os.path.join(job["dir"], "progress.json")):
+            job["status"] = RUNNING
+        return job["status"]
+
+    def _view(self, job: Dict) -> Dict:
+        status = self._status(job)
+        progress = job["progress"]
+        if status == RUNNING:
+            try:
+                with open(os.path.join(job["dir"], "progress.json")) as f:
+                    progress = json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {
+            "id": job["id"], "method": job["method"], "params": job["params"], "status": status,
+            "progress": progress, "version": job["version"], "error": job["error"],
+            "created": job["created"], "finished": job["finished"],
+        }
+
+    def _finish(self, job_id: str, future: Future) -> None:
+        # runs on the executor's callback thread
+        with self._lock:
+            job = self._jobs[job_id]
+            if self._closing and not job.get("cancel_requested") and (
+                    future.cancelled() or (future.exception() is None and future.result()["status"] == CANCELLED)):
+                # interrupted by shutdown(): keep it queued for recover()
+                self._requeue(job)
+                return
+        version = error = progress = None
+        try:
+            result = future.result()
+        except CancelledError:
+            status = CANCELLED
+        except Exception as exc:  # the job failed in the worker (or the worker died)
+            error = f"{type(exc).__name__}: {exc}"
+            status = FAILED
+        else:
+            try:
+                with open(os.path.join(job["dir"], "progress.json")) as f:
+                    progress = json.load(f)
+            except (OSError, ValueError):
+                pass
+            if result["status"] == DONE:
+                version = self._publish(job, result)
+            status = result["status"]
+        with self._lock:
+            if progress is not None:
+                job["progress"] = progress
+            job["version"], job["error"] = version, error
+            job["status"] = status
+            job["finished"] = time.time()
+            self._save(job)
+
+    def _publish(self, job: Dict, result: Dict) -> int:
+        params = {k: v for k, v in job["params"].items() if k != "checkpoint_path"}
+        return self.registry.publish(result["weights"], promote=self.promote, job=job["id"],
+                                     method=job["method"], params=params, best_fitness=result["best_fitness"],
+                                     generation=result["generation"], games_played=result["games_played"])
+
+
+TRAINING_JOBS = TrainingJobManager()
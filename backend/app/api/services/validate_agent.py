@@ -1,17 +1,15 @@
 from __future__ import annotations
-import json
-import os
+from app.api.services.weight_registry import WEIGHT_REGISTRY
 from app.core.eval.evaluator import Evaluator
 
-TRAINED_WEIGHTS = os.path.join("app", "logs", "training", "trained_weights.json")
-
 def load_trained_evaluator() -> Evaluator:
     """
-    Load trained weights and return an Evaluator configured with them.
-    Raises FileNotFoundError if weights are missing so callers can fallback.
+    Return the registry's active evaluator (loading the active version on first use).
+    Raises FileNotFoundError if no weights were ever promoted so callers can fallback.
     """
-    if not os.path.exists(TRAINED_WEIGHTS):
-        raise FileNotFoundError(f"Missing {TRAINED_WEIGHTS}")
-    with open(TRAINED_WEIGHTS, "r") as f:
-        weights = json.load(f)
-    return Evaluator(weights=weights)
+    if WEIGHT_REGISTRY.active() is None:
+        WEIGHT_REGISTRY.refresh()
+    evaluator = WEIGHT_REGISTRY.active()
+    if evaluator is None:
+        raise FileNotFoundError(f"No active weights in {WEIGHT_REGISTRY.weights_dir}")
+    return evaluator
@@ -0,0 +1,166 @@
+from __future__ import annotations
+import glob
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+from app.core.eval.evaluator import Evaluator
+
+LOG_DIR = "app/logs/training"
+WEIGHTS_DIR = os.path.join(LOG_DIR, "weights")
+# where weights were saved before the registry; imported as version 1 when the registry is empty
+LEGACY_WEIGHTS = os.path.join(LOG_DIR, "trained_weights.json")
+
+
+def write_json_atomic(path: str, data) -> None:
+    """Write to a temporary file and rename it over `path`, so readers never see a partial file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=4)
+    os.replace(tmp, path)
+
+
+def checksum(weights: Dict[str, float]) -> str:
+    return hashlib.sha256(json.dumps(weights, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+class WeightRegistry:
+    """
+    Numbered evaluator weight sets, `weights_dir/v0001.json`, `v0002.json`, ..., each
+    stored with a SHA-256 checksum and metadata (method, fitness, generation, ...),
+    plus an `ACTIVE` file naming the version that is served.
+
+    The active set is held in memory as a ready-built Evaluator: `active()` never
+    touches the disk. `promote()` (or `refresh()`, when another process changed
+    `ACTIVE`) swaps it in with one reference assignment, so searches already
+    running keep the evaluator they started with.
+    """
+
+    def __init__(self, weights_dir: str = WEIGHTS_DIR, legacy_path: Optional[str] = LEGACY_WEIGHTS) -> None:
+        self.weights_dir = weights_dir
+        self.legacy_path = legacy_path
+        self.active_path = os.path.join(weights_dir, "ACTIVE")
+        self._active: Optional[Evaluator] = None
+        self.active_version = 0
+        self._lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def path(self, version: int) -> str:
+        return os.path.join(self.weights_dir, f"v{version:04d}.json")
+
+    def version_numbers(self) -> List[int]:
+        return sorted(int(m.group(1)) for p in glob.glob(os.path.join(self.weights_dir, "v*.json"))
+                      if (m := re.fullmatch(r"v(\d+)\.json", os.path.basename(p))))
+
+    def publish(self, weights: Dict[str, float], promote: bool = False, **metadata) -> int:
+        """Store `weights` as the next version and return its number."""
+        weights = {k: float(v) for k, v in weights.items()}
+        with self._lock:
+            version = max(self.version_numbers(), default=0) + 1
+            write_json_atomic(self.path(version), {
+                "version": version, "created": time.time(), **metadata,
+                "sha256": checksum(weights), "weights": weights,
+            })
+        if promote:
+            self.promote(version)
+        return version
+
+    def load(self, version: int) -> Dict:
+        """A version's record; ValueError if its weights don't match the stored checksum."""
+        with open(self.path(version)) as f:
+            record = json.load(f)
+        if checksum(record["weights"]) != record.get("sha256"):
+            raise ValueError(f"Checksum mismatch in weights version {version}")
+        return record
+
+    def versions(self) -> List[Dict]:
+        """Metadata of every stored version (without the weights), oldest first."""
+        out = []
+        for version in self.version_numbers():
+            with open(self.path(version)) as f:
+                record = json.load(f)
+            record.pop("weights", None)
+            record["active"] = version == self.active_version
+            out.append(record)
+        return out
+
+    def promote(self, version: int) -> Evaluator:
+        """Verify `version`, make it the active set in memory and record it in ACTIVE."""
+        evaluator = self._build(version)
+        with self._lock:
+            write_json_atomic(self.active_path, {"version": version})
+            self._activate(evaluator, version)
+        return evaluator
+
+    def active(self) -> Optional[Evaluator]:
+        """The active evaluator, or None if nothing was ever promoted. No disk access."""
+        return self._active
+
+    def active_weights(self) -> Optional[Dict[str, float]]:
+        evaluator = self._active
+        return None if evaluator is None else dict(evaluator.weights)
+
+    def refresh(self) -> bool:
+        """Load the version named in ACTIVE if it isn't the active one; True if swapped.
+        On first use, an existing legacy trained_weights.json becomes version 1."""
+        if self._active is None and not os.path.exists(self.active_path):
+            if self._import_legacy():
+                return True
+        try:
+            with open(self.active_path) as f:
+                version = int(json.load(f)["version"])
+            if version == self.active_version:
+                return False
+            evaluator = self._build(version)
+        except (OSError, ValueError, KeyError, TypeError):
+            return False  # keep serving the current set; a later refresh may succeed
+        with self._lock:
+            self._activate(evaluator, version)
+        return True
+
+    def watch(self, interval: float = 2.0) -> None:
+        """Load the active set now, then poll ACTIVE from a daemon thread every `interval` s."""
+        self.refresh()
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop.clear()
+
+        def run() -> None:
+            while not self._stop.wait(interval):
+                self.refresh()
+        self._watcher = threading.Thread(target=run, name="weight-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _build(self, version: int) -> Evaluator:
+        return Evaluator(self.load(version)["weights"])
+
+    def _activate(self, evaluator: Evaluator, version: int) -> None:
+        self._active = evaluator
+        self.active_version = version
+
+    def _import_legacy(self) -> bool:
+        if not self.legacy_path or self.version_numbers():
+            return False
+        try:
+            with open(self.legacy_path) as f:
+                weights = json.load(f)
+        except (OSError, ValueError):
+            return False
+        self.publish(weights, promote=True, method="legacy", source=self.legacy_path)
+        return True
+
+
+WEIGHT_REGISTRY = WeightRegistry()
@@ -1,47 +1,32 @@
 from fastapi import APIRouter, HTTPException, Query, Body
+from fastapi.responses import StreamingResponse
 from typing import Optional
 from app.core.engine.board import Board
 from app.core.eval.evaluator import Evaluator
-from app.core.ai.random_agent import RandomAgent
-from app.core.ai.greedy_agent import GreedyAgent
+from app.api.services.weight_registry import WEIGHT_REGISTRY
 from app.core.ai.minimax_agent import MinimaxAgent
-from app.core.ai.mcts_agent import MCTSAgent
-from app.core.ai.hybrid_agent import HybridAgent
+from app.core.ai.registry import DEFAULT_LEVEL, make_agent
+from app.api.services.calibration import level_table, load_calibration
+from app.core.ai.time_manager import TimeManager
+from app.api.services.metrics import SEARCH_METRICS
+from app.api.services.profiling import profile_mode, run_profiled
 import uuid
 import os
 import json
+import queue
+import threading
 
 router = APIRouter()
 
 GAMES = {}
+SEARCHES = {}  # game_id -> agent currently streaming a search
+_SEARCHES_LOCK = threading.Lock()
 
-AGENT_FACTORY = {
-    "random": RandomAgent,
-    "greedy": GreedyAgent,
-    "minimax": MinimaxAgent,
-    "mcts": MCTSAgent,
-    "hybrid": HybridAgent,
-    "minimax_ga": MinimaxAgent,
-}
-
-
-def _make_agent_by_name(name: str, evaluator: Evaluator, time_limit: float):
-    name = name.lower()
-    cls = AGENT_FACTORY.get(name)
-    if not cls:
-        raise ValueError(f"Unknown agent '{name}'")
-    # instantiate with sensible defaults / evaluator when required
-    if name == "random":
-        return cls()
-    if name == "greedy":
-        return cls(evaluator)
-    if name == "minimax" or name == "minimax_ga":
-        return cls(evaluator, max_depth=4, time_limit=time_limit)
-    if name == "mcts":
-        return cls(evaluator, simulations=400, time_limit=time_limit)
-    if name == "hybrid":
-        return cls(evaluator, use_mcts=True, deep_depth=4, time_limit=time_limit)
-    return cls()
+
+def _attach_clock(ai, clock: Optional[float], increment: float) -> None:
+    """Budget the move from the AI's remaining game clock instead of the flat `time`."""
+    if clock is not None and hasattr(ai, "time_manager"):
+        ai.time_manager = TimeManager(clock, increment)
 
 
 def _pieces_dict(board: Board):
@@ -49,6 +34,79 @@ def _pieces_dict(board: Board):
     return {"black": b, "white": w}
 
 
+def _evaluator_for(agent: Optional[str]) -> Evaluator:
+    if (agent or "").lower() == "minimax_ga":
+        # the active trained set, kept in memory by the weight registry
+        return WEIGHT_REGISTRY.active() or Evaluator()
+    return Evaluator()
+
+
+def _search_agent(ai):
+    """Return the MinimaxAgent that drives `ai`'s search, if any."""
+    if isinstance(ai, MinimaxAgent):
+        return ai
+    return getattr(ai, "minimax", None)
+
+
+def _no_search_running(game_id: str) -> None:
+    # a streamed search applies its move when it ends, so the game must not move meanwhile
+    if game_id in SEARCHES:
+        raise HTTPException(status_code=409, detail="Search already running")
+
+
+def _play_ai_result(board: Board, mv, score):
+    if mv is not None:
+        try:
+            board.apply_move(mv, board.to_move)
+        except ValueError:
+            board.apply_move(None, board.to_move)
+            mv = None
+    else:
+        board.apply_move(None, board.to_move)
+
+    return {
+        "move": mv,
+        "board": board.grid,
+        "to_move": board.to_move,
+        "legal_moves": board.legal_moves(board.to_move),
+        "pieces": _pieces_dict(board),
+        "eval_score": float(score) if score is not None else 0.0,
+    }
+
+
+def _record_stats(agent: Optional[str], ai) -> None:
+    stats = getattr(ai, "last_stats", None)
+    if stats is not None:
+        SEARCH_METRICS.record((agent or "minimax").lower(), stats)
+
+
+def _best_move(ai, board: Board, profile: Optional[str], tags: dict):
+    """ai.best_move, under the profiler when `profile` is set: ((move, score), report or None)."""
+    if profile is None:
+        return ai.best_move(board, board.to_move), None
+    tags = dict(tags, to_move=board.to_move, empties=board.empty_count(),
+                position="".join(".BW"[v] for v in board.cells))
+    return run_profiled(lambda: ai.best_move(board, board.to_move), profile, tags)
+
+
+def _profile_or_400(profile: Optional[str]) -> Optional[str]:
+    try:
+        return profile_mode(profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.get("/levels")
+def levels():
+    """Strength levels: search budget per move and, once app.scripts.calibrate_levels
+    has been run on this host, the expected seconds per move of each agent."""
+    return level_table(load_calibration())
+
+
 @router.post("/new")
 def create_game():
     game_id = str(uuid.uuid4())
@@ -72,6 +130,7 @@ def make_move(game_id: str, data: dict = Body(...)):
     board = GAMES.get(game_id)
     if not board:
         raise HTTPException(status_code=404, detail="Game not found")
+    _no_search_running(game_id)
 
     # allow pass if row/col missing or explicitly null
     row = data.get("row") if isinstance(data, dict) else None
@@ -94,47 +153,128 @@ def make_move(game_id: str, data: dict = Body(...)):
 
 
 @router.post("/{game_id}/ai_move")
-def ai_move(game_id: str, agent: Optional[str] = Query("minimax"), time: float = 1.5):
+def ai_move(game_id: str, agent: Optional[str] = Query("minimax"), time: float = 1.5,
+            clock: Optional[float] = None, increment: float = 0.0, level: str = DEFAULT_LEVEL,
+            profile: Optional[str] = None):
     """
     Ask backend to choose and apply an AI move for the side whose turn it is.
+    `level` sets the search budget (see GET /levels) and `time` caps the move in seconds.
+    Pass `clock` (seconds left on the AI's game clock) and `increment` to let the
+    time manager budget the move instead of spending a flat `time`.
+    `profile` ("cprofile", "sample" or "memory", or $OTHELLO_PROFILE) profiles the search;
+    the artifact is written under app/logs/profiles and summarised in a `profile` field.
     Returns move (or null if pass), board, to_move, legal_moves, pieces, eval_score.
     """
     board = GAMES.get(game_id)
     if not board:
         raise HTTPException(status_code=404, detail="Game not found")
+    _no_search_running(game_id)
 
-    if (agent or "").lower() == "minimax_ga":
-        try:
-            from app.api.services.validate_agent import load_trained_evaluator
-            ev = load_trained_evaluator()
-        except Exception:
-            ev = Evaluator()  
-    else:
-        ev = Evaluator()
+    try:
+        ai = make_agent(agent or "minimax", _evaluator_for(agent), level, time_limit=time)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    _attach_clock(ai, clock, increment)
+    profile = _profile_or_400(profile)
+
+    (mv, score), report = _best_move(ai, board, profile, {
+        "agent": agent, "level": level, "time": time, "clock": clock, "game_id": game_id})
+    _record_stats(agent, ai)
+    result = _play_ai_result(board, mv, score)
+    if report is not None:
+        result["profile"] = report
+    return result
+
+
+@router.get("/{game_id}/ai_move/stream")
+def ai_move_stream(game_id: str, agent: Optional[str] = Query("minimax"), time: float = 1.5,
+                   clock: Optional[float] = None, increment: float = 0.0, level: str = DEFAULT_LEVEL,
+                   profile: Optional[str] = None):
+    """
+    Same as ai_move, but as a Server-Sent Events stream.
+    Emits one `info` event per completed search depth (depth, score, move, pv, nodes, nps, elapsed)
+    and a final `done` event carrying the ai_move response once the move has been applied.
+    POST /{game_id}/ai_move/stop ends the search early with the current best move.
+    The search runs on a copy of the board; until it is done, moves in this game are
+    refused with 409 while the state and analysis still read the current position.
+    """
+    board = GAMES.get(game_id)
+    if not board:
+        raise HTTPException(status_code=404, detail="Game not found")
+    _no_search_running(game_id)
 
     try:
-        ai = _make_agent_by_name(agent or "minimax", ev, time_limit=time)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Unknown agent")
+        ai = make_agent(agent or "minimax", _evaluator_for(agent), level, time_limit=time)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    _attach_clock(ai, clock, increment)
+    profile = _profile_or_400(profile)
 
-    mv, score = ai.best_move(board, board.to_move)
+    events: "queue.Queue" = queue.Queue()
+    searcher = _search_agent(ai)
+    if searcher is not None:
+        searcher.on_iteration = lambda info: events.put(("info", info))
+    with _SEARCHES_LOCK:
+        _no_search_running(game_id)
+        SEARCHES[game_id] = ai
 
-    if mv is not None:
+    def run_search():
         try:
-            board.apply_move(mv, board.to_move)
-        except ValueError:
-            board.apply_move(None, board.to_move)
-            mv = None
-    else:
-        board.apply_move(None, board.to_move)
+            (mv, score), report = _best_move(ai, board.copy(), profile, {
+                "agent": agent, "level": level, "time": time, "clock": clock, "game_id": game_id})
+            _record_stats(agent, ai)
+            result = _play_ai_result(board, mv, score)
+            if report is not None:
+                result["profile"] = report
+            events.put(("done", result))
+        except Exception as e:
+            events.put(("error", {"detail": str(e)}))
+        finally:
+            SEARCHES.pop(game_id, None)
+
+    threading.Thread(target=run_search, daemon=True).start()
+
+    def stream():
+        while True:
+            event, data = events.get()
+            yield _sse(event, data)
+            if event != "info":
+                break
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
 
+
+@router.post("/{game_id}/ai_move/stop")
+def stop_ai_move(game_id: str):
+    """Stop a streaming search; it finishes with the best move of the deepest completed depth."""
+    searcher = SEARCHES.get(game_id)
+    if searcher is None or not hasattr(searcher, "stop"):
+        raise HTTPException(status_code=404, detail="No search running")
+    searcher.stop()
+    return {"status": "stopping"}
+
+
+@router.get("/{game_id}/analysis")
+def analyze_position(game_id: str, depth: int = Query(4, ge=1, le=8), k: Optional[int] = Query(None, ge=1),
+                     time: Optional[float] = 1.5):
+    """
+    Score the legal moves of the side to move (the best `k`, all by default) with a
+    single multi-PV minimax search. Returns the lines best first, each with
+    move, score (BLACK's perspective, like eval_score) and pv, plus the depth reached.
+    """
+    board = GAMES.get(game_id)
+    if not board:
+        raise HTTPException(status_code=404, detail="Game not found")
+    ai = MinimaxAgent(Evaluator(), max_depth=depth, time_limit=time)
+    # the search makes and undoes moves: keep it off the stored board, which a
+    # concurrent /move or /ai_move may be changing meanwhile
+    lines = ai.analyze(board.copy(), board.to_move, k)
+    _record_stats("analysis", ai)
     return {
-        "move": mv,
-        "board": board.grid,
         "to_move": board.to_move,
-        "legal_moves": board.legal_moves(board.to_move),
-        "pieces": _pieces_dict(board),
-        "eval_score": float(score) if score is not None else 0.0,
+        "depth": ai.last_stats.depth_reached,
+        "lines": lines,
     }
 
 
@@ -1,24 +1,64 @@
-from fastapi import APIRouter, BackgroundTasks
-from app.api.services.trainer import GATrainer
+from fastapi import APIRouter, HTTPException
+from app.api.services.trainer import TRAINING_METHODS
+from app.api.services.training_jobs import TRAINING_JOBS, QueueFull
+from app.api.services.weight_registry import WEIGHT_REGISTRY
+from app.core.ai.registry import DEFAULT_LEVEL, LEVELS
 
 router = APIRouter()
 
 @router.post("/train")
-def train_agent(background_tasks: BackgroundTasks):
-    """Trigger GA training asynchronously."""
-    def run_training():
-        trainer = GATrainer()
-        trainer.train()
-    background_tasks.add_task(run_training)
-    return {"status": "Training started"}
+def train_agent(method: str = "ga", level: str = DEFAULT_LEVEL):
+    """Queue a training job ("ga" or "cmaes") whose games are searched at `level`;
+    identical active jobs are shared. Returns the job."""
+    if method not in TRAINING_METHODS:
+        raise HTTPException(status_code=400, detail="Unknown training method")
+    if level not in LEVELS:
+        raise HTTPException(status_code=400, detail="Unknown level")
+    try:
+        job = TRAINING_JOBS.submit(method, level=level)
+    except QueueFull as exc:
+        raise HTTPException(status_code=429, detail=str(exc))
+    return {"status": job["status"], "job_id": job["id"], "job": job}
+
+@router.get("/jobs")
+def list_jobs():
+    return {"jobs": TRAINING_JOBS.list()}
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """Status, latest progress (generation, best fitness, games played) and result version."""
+    job = TRAINING_JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job
+
+@router.post("/jobs/{job_id}/cancel")
+def cancel_job(job_id: str):
+    job = TRAINING_JOBS.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job
 
 @router.get("/weights")
 def get_trained_weights():
-    """Fetch saved trained weights if available."""
-    import os, json
-    path = "app/logs/training/trained_weights.json"
-    if not os.path.exists(path):
+    """The active trained weights, if any were promoted."""
+    weights = WEIGHT_REGISTRY.active_weights()
+    if weights is None:
         return {"error": "No trained weights found"}
-    with open(path) as f:
-        data = json.load(f)
-    return {"weights": data}
+    return {"weights": weights, "version": WEIGHT_REGISTRY.active_version}
+
+@router.get("/weights/versions")
+def list_weight_versions():
+    """Metadata (checksum, fitness, generation, ...) of every stored weight version."""
+    return {"versions": WEIGHT_REGISTRY.versions(), "active": WEIGHT_REGISTRY.active_version}
+
+@router.post("/weights/{version}/promote")
+def promote_weights(version: int):
+    """Serve `version` from now on; in-flight searches keep the weights they started with."""
+    try:
+        WEIGHT_REGISTRY.promote(version)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Unknown weights version")
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    return {"weights": WEIGHT_REGISTRY.active_weights(), "version": version}
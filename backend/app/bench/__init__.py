@@ -0,0 +1,12 @@
+# engine benchmarks: perft, fixed-depth search, MCTS and evaluator throughput
+import importlib
+
+__all__ = ["run_all", "compare"]
+
+
+def __getattr__(name):
+    # the runner pulls in every agent; only load it when it's used, so importing
+    # app.bench.positions (e.g. from the API) stays cheap
+    if name in __all__:
+        return getattr(importlib.import_module(".runner", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
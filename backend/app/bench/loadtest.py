@@ -0,0 +1,212 @@
+from __future__ import annotations
+import json
+import os
+import platform
+import random
+import resource
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional, Sequence, Tuple
+from app.core.engine.board import Board
+
+# Load test of the game API: concurrent clients each play whole games, the client
+# side (BLACK) with random legal moves through /move and the AI side through
+# /ai_move, with the agent, level and time cap of every game drawn from a mix.
+
+API = "/api/v1/game"
+ENDPOINTS = ("new", "move", "ai_move")
+
+# (agent, level, time cap) choices for the AI side of a game
+Setting = Tuple[str, str, float]
+
+
+def parse_setting(text: str, default_time: float) -> Setting:
+    """`agent[:level[:time]]`, e.g. "minimax:hard:2"."""
+    parts = text.split(":")
+    agent = parts[0]
+    level = parts[1] if len(parts) > 1 and parts[1] else "medium"
+    cap = float(parts[2]) if len(parts) > 2 else default_time
+    return agent, level, cap
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile; 0.0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), int(-(-p * len(ordered) // 100))))
+    return ordered[rank - 1]
+
+
+def game_over(state: Dict) -> bool:
+    """Neither side has a legal move in a returned state (the API only lists the side to move's)."""
+    if state["legal_moves"]:
+        return False
+    board = Board()
+    board.grid = state["board"]
+    return board.is_terminal()
+
+
+def rss_bytes() -> int:
+    """Resident set size of this process (peak size where /proc isn't available)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class Client:
+    """One simulated player. Latencies are collected per endpoint in `latencies`."""
+
+    def __init__(self, base_url: str, settings: Sequence[Setting], seed: int, timeout: float = 120.0) -> None:
+        self.base_url = base_url.rstrip("/") + API
+        self.settings = settings
+        self.rng = random.Random(seed)
+        self.timeout = timeout
+        self.latencies: Dict[str, List[float]] = {name: [] for name in ENDPOINTS}
+        self.errors: Dict[str, int] = {name: 0 for name in ENDPOINTS}
+        self.games = 0
+        self.moves = 0
+
+    def _post(self, endpoint: str, path: str, body: Optional[Dict] = None) -> Optional[Dict]:
+        data = json.dumps(body if body is not None else {}).encode()
+        request = urllib.request.Request(self.base_url + path, data=data, method="POST",
+                                         headers={"Content-Type": "application/json"})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                payload = json.loads(response.read())
+        except (urllib.error.URLError, OSError, ValueError):
+            self.errors[endpoint] += 1
+            return None
+        self.latencies[endpoint].append(time.perf_counter() - start)
+        return payload
+
+    def play_game(self) -> bool:
+        """Play one game to the end; False if a request failed on the way."""
+        agent, level, cap = self.rng.choice(self.settings)
+        state = self._post("new", "/new")
+        if state is None:
+            return False
+        game_id = state["game_id"]
+        while not game_over(state):
+            if state["to_move"] == 1:
+                move = self.rng.choice(state["legal_moves"]) if state["legal_moves"] else None
+                body = {"row": move[0], "col": move[1]} if move else {}
+                state = self._post("move", f"/{game_id}/move", body)
+            else:
+                state = self._post("ai_move", f"/{game_id}/ai_move?agent={agent}&level={level}&time={cap}")
+            if state is None:
+                return False
+            self.moves += 1
+        self.games += 1
+        return True
+
+    def run(self, games: int) -> None:
+        for _ in range(games):
+            self.play_game()
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int):
+    """Serve app.main on localhost from a background thread; returns the uvicorn Server."""
+    import uvicorn
+    from app.main import app
+    # don't let the app's startup requeue interrupted training jobs into the measurement
+    app.state.recover_training_jobs = False
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="loadtest-server", daemon=True)
+    thread.start()
+    deadline = time.time() + 30
+    while not server.started:
+        if not thread.is_alive() or time.time() > deadline:
+            raise RuntimeError("API server failed to start")
+        time.sleep(0.05)
+    server.thread = thread
+    return server
+
+
+def run_load_test(clients: int, games: int, settings: Sequence[Setting], url: Optional[str] = None,
+                  seed: int = 0) -> Dict:
+    """
+    Play `games` games from each of `clients` concurrent clients against `url`, or
+    against the app served in this process when `url` is None. CPU use and the
+    growth of the in-memory GAMES store are only measured in-process.
+    """
+    server = None
+    if url is None:
+        server = start_server(free_port())
+        url = f"http://127.0.0.1:{server.config.port}"
+    try:
+        games_store = None
+        if server is not None:
+            from app.api.v1.routes_game import GAMES
+            games_store = GAMES
+        games_before = len(games_store) if games_store is not None else None
+        rss_before = rss_bytes()
+        cpu_before = os.times()
+
+        pool = [Client(url, settings, seed * 1000 + i) for i in range(clients)]
+        threads = [threading.Thread(target=c.run, args=(games,)) for c in pool]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - start
+
+        cpu_after = os.times()
+        rss_after = rss_bytes()
+    finally:
+        if server is not None:
+            server.should_exit = True
+            server.thread.join()
+
+    endpoints = {}
+    for name in ENDPOINTS:
+        lat = [x for c in pool for x in c.latencies[name]]
+        endpoints[name] = {
+            "requests": len(lat),
+            "errors": sum(c.errors[name] for c in pool),
+            "mean": sum(lat) / len(lat) if lat else 0.0,
+            "p50": percentile(lat, 50),
+            "p95": percentile(lat, 95),
+            "p99": percentile(lat, 99),
+            "max": max(lat) if lat else 0.0,
+        }
+    requests = sum(e["requests"] for e in endpoints.values())
+    games_played = sum(c.games for c in pool)
+    result = {
+        "config": {"clients": clients, "games_per_client": games, "url": url if server is None else "in-process",
+                   "settings": [list(s) for s in settings], "seed": seed},
+        "host": {"machine": platform.machine(), "python": platform.python_version(), "cpus": os.cpu_count()},
+        "created": time.time(),
+        "seconds": wall,
+        "games": games_played,
+        "moves": sum(c.moves for c in pool),
+        "requests": requests,
+        "requests_per_sec": requests / wall if wall > 0 else 0.0,
+        "games_per_sec": games_played / wall if wall > 0 else 0.0,
+        "endpoints": endpoints,
+    }
+    if server is not None:
+        cpu = (cpu_after.user - cpu_before.user) + (cpu_after.system - cpu_before.system)
+        new_games = len(games_store) - games_before
+        result["process"] = {
+            # clients run in this process too; their share is small next to the searches
+            "cpu_seconds": cpu,
+            "cpu_utilisation": cpu / wall if wall > 0 else 0.0,
+            "rss_growth_bytes": rss_after - rss_before,
+            "games_stored": len(games_store),
+            "bytes_per_stored_game": (rss_after - rss_before) / new_games if new_games else 0.0,
+        }
+    return result
@@ -0,0 +1,29 @@
+from __future__ import annotations
+from app.core.engine.board import Board
+
+# Leaf counts from the initial position, passes counted as a ply.
+PERFT_REFERENCE = {1: 4, 2: 12, 3: 56, 4: 244, 5: 1396, 6: 8200, 7: 55092, 8: 390216}
+
+
+def perft(board: Board, depth: int) -> int:
+    """Count leaf positions `depth` plies ahead. Finished games count as a single leaf."""
+    if depth == 0:
+        return 1
+    player = board.to_move
+    moves = board.legal_moves(player)
+    if not moves:
+        if not board.legal_moves(-player):
+            return 1
+        board.apply_move(None, player)
+        try:
+            return perft(board, depth - 1)
+        finally:
+            board.undo()
+    nodes = 0
+    for mv in moves:
+        board.apply_move(mv, player)
+        try:
+            nodes += perft(board, depth - 1)
+        finally:
+            board.undo()
+    return nodes
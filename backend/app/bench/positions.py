@@ -0,0 +1,84 @@
+from __future__ import annotations
+from typing import Dict, List, Tuple
+from app.core.engine.board import Board, BLACK, WHITE, EMPTY
+
+# Fixed benchmark suite: name -> (rows top to bottom, side to move).
+# Taken from seeded random games so every phase of the game is covered.
+POSITIONS: Dict[str, Tuple[List[str], int]] = {
+    "opening_1": ([
+        "........",
+        "..B.....",
+        "...B....",
+        "..BWB...",
+        "..WWW...",
+        ".W......",
+        "W.......",
+        "........",
+    ], BLACK),
+    "opening_2": ([
+        "........",
+        "......W.",
+        ".BBBBW..",
+        "...BW...",
+        "..WWB...",
+        ".....B..",
+        "........",
+        "........",
+    ], BLACK),
+    "midgame_1": ([
+        "..W.W...",
+        "..WWWW..",
+        "BBW.WWWW",
+        ".WBBWW..",
+        "WBWBWW..",
+        "B...WB..",
+        "...BBBB.",
+        ".......B",
+    ], BLACK),
+    "midgame_2": ([
+        "..WWW.W.",
+        ".BBWWW.B",
+        ".BBWWWWW",
+        "BBBWWBB.",
+        "W.BWW...",
+        ".W.BW...",
+        "W...BB..",
+        ".....BB.",
+    ], BLACK),
+    "endgame_1": ([
+        ".BBB..W.",
+        "BBBBBWWB",
+        "..WBWWWB",
+        "WWWWBBWB",
+        "WWWBBBWW",
+        "WWWWWWB.",
+        ".WWWWWWB",
+        "..W.B.BW",
+    ], BLACK),
+    "endgame_2": ([
+        "BW.BBBB.",
+        "WBWWWW.W",
+        ".WBBWBW.",
+        "BBWWWBBB",
+        "BBWWBBBB",
+        "BBWWWB.B",
+        "BB.WBWBB",
+        ".BBBBBWB",
+    ], BLACK),
+}
+
+_CELL = {".": EMPTY, "B": BLACK, "W": WHITE}
+
+
+def board_from_rows(rows: List[str], to_move: int) -> Board:
+    b = Board()
+    for r, row in enumerate(rows):
+        for c, ch in enumerate(row):
+            b.set(r, c, _CELL[ch])
+    b.to_move = to_move
+    return b
+
+
+def load_position(name: str) -> Board:
+    rows, to_move = POSITIONS[name]
+    return board_from_rows(rows, to_move)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+import platform
+import time
+from typing import Dict, List
+from app.core.engine.board import Board, BLACK
+from app.core.eval.evaluator import Evaluator, EvalCache
+from app.core.ai.minimax_agent import MinimaxAgent
+from app.core.ai.mcts_agent import MCTSAgent
+from app.bench.perft import perft, PERFT_REFERENCE
+from app.bench.positions import POSITIONS, load_position
+
+# Allowed slowdown of any rate metric before compare() reports a regression.
+DEFAULT_TOLERANCE = 0.25
+
+
+def bench_perft(depth: int) -> Dict:
+    b = Board()
+    t0 = time.perf_counter()
+    nodes = perft(b, depth)
+    elapsed = time.perf_counter() - t0
+    return {
+        "depth": depth,
+        "nodes": nodes,
+        "correct": PERFT_REFERENCE.get(depth) in (None, nodes),
+        "seconds": elapsed,
+        "nps": nodes / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def bench_search(depth: int) -> Dict:
+    """Fixed-depth MinimaxAgent search (no time limit) over the stored position suite."""
+    ev = Evaluator(cache=EvalCache())  # fresh cache so runs don't warm each other up
+    per_position = {}
+    total_nodes = 0
+    total_time = 0.0
+    for name in POSITIONS:
+        b = load_position(name)
+        agent = MinimaxAgent(ev, max_depth=depth)
+        t0 = time.perf_counter()
+        mv, score = agent.best_move(b, b.to_move)
+        elapsed = time.perf_counter() - t0
+        per_position[name] = {
+            "move": mv,
+            "score": score,
+            "nodes": agent.nodes_searched,
+            "seconds": elapsed,
+            "nps": agent.nodes_searched / elapsed if elapsed > 0 else 0.0,
+        }
+        total_nodes += agent.nodes_searched
+        total_time += elapsed
+    return {
+        "depth": depth,
+        "nodes": total_nodes,
+        "seconds": total_time,
+        "nps": total_nodes / total_time if total_time > 0 else 0.0,
+        "eval_cache_hit_rate": ev.cache.stats()["hit_rate"],
+        "positions": per_position,
+    }
+
+
+def bench_mcts(simulations: int, seed: int = 1) -> Dict:
+    ev = Evaluator(cache=EvalCache())
+    sims = 0
+    total_time = 0.0
+    for name in POSITIONS:
+        b = load_position(name)
+        agent = MCTSAgent(ev, simulations=simulations, seed=seed)
+        t0 = time.perf_counter()
+        agent.best_move(b, b.to_move)
+        total_time += time.perf_counter() - t0
+        sims += agent.last_stats.simulations
+    return {
+        "simulations": sims,
+        "seconds": total_time,
+        "sims_per_sec": sims / total_time if total_time > 0 else 0.0,
+    }
+
+
+def bench_eval(repeats: int) -> Dict:
+    """Raw evaluator throughput; the cache is off since the same few positions repeat."""
+    ev = Evaluator(cache=None)
+    boards = [load_position(name) for name in POSITIONS]
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        for b in boards:
+            ev.evaluate(b, BLACK)
+    elapsed = time.perf_counter() - t0
+    evals = repeats * len(boards)
+    return {
+        "evals": evals,
+        "seconds": elapsed,
+        "evals_per_sec": evals / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def run_all(quick: bool = False) -> Dict:
+    """Run every benchmark. `quick` shrinks the workloads for smoke runs (rates are noisier)."""
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "quick": quick,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "perft": bench_perft(5 if quick else 6),
+        "search": bench_search(2 if quick else 3),
+        "mcts": bench_mcts(20 if quick else 100),
+        "eval": bench_eval(50 if quick else 500),
+    }
+
+
+# (section, key) pairs that must match the baseline exactly / must not slow down.
+_EXACT = [("perft", "nodes"), ("search", "nodes")]
+_RATES = [("perft", "nps"), ("search", "nps"), ("mcts", "sims_per_sec"), ("eval", "evals_per_sec")]
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Return a list of human-readable regressions of `results` against `baseline`.
+    Node counts are deterministic and must match exactly when the workload is the same;
+    rates may drop by at most `tolerance` (fraction).
+    """
+    problems: List[str] = []
+    if not results["perft"]["correct"]:
+        problems.append(f"perft({results['perft']['depth']}) = {results['perft']['nodes']} is wrong")
+    same_workload = results["meta"]["quick"] == baseline.get("meta", {}).get("quick")
+    if not same_workload:
+        problems.append("baseline was recorded with a different workload (quick flag differs)")
+        return problems
+    for section, key in _EXACT:
+        new, old = results[section][key], baseline[section][key]
+        if new != old:
+            problems.append(f"{section}.{key} changed: {old} -> {new}")
+    for section, key in _RATES:
+        new, old = results[section][key], baseline[section][key]
+        if old and new < old * (1.0 - tolerance):
+            problems.append(f"{section}.{key} regressed {100 * (1 - new / old):.0f}%: {old:.0f} -> {new:.0f}")
+    return problems
@@ -1,12 +1,16 @@
 from __future__ import annotations
 from typing import Optional, Tuple
 from app.core.engine.board import Board
+from app.core.ai.search_stats import SearchStats
 
 Move = Tuple[int, int]
 
 class BaseAgent:
     """Abstract agent interface. Implementors should be light-weight and stateless if possible."""
 
+    # Searching agents replace this with the SearchStats of their latest best_move call.
+    last_stats: Optional[SearchStats] = None
+
     def best_move(self, board: Board, player: int) -> Tuple[Optional[Move], float]:
         """
         Return (move, score). Move may be None for pass.
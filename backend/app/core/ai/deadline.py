@@ -0,0 +1,51 @@
+from __future__ import annotations
+import time
+from typing import Optional
+
+
+class Deadline:
+    """
+    Cheap time-out check for search hot loops.
+
+    `expired()` is meant to be called once per node / simulation. It only reads the
+    monotonic clock every `stride` calls, where the stride is re-tuned on every
+    read from the measured call rate so that clock reads happen roughly every
+    `check_interval` seconds. `stop()` may be called from another thread to end
+    the search early.
+    """
+
+    def __init__(self, budget: Optional[float], check_interval: float = 0.002, max_stride: int = 4096) -> None:
+        self.start = time.perf_counter()
+        self.end = self.start + budget if budget is not None else None
+        self.check_interval = check_interval
+        self.max_stride = max_stride
+        self._stride = 1
+        self._countdown = 1
+        self._last_check = self.start
+        self._done = False
+
+    def stop(self) -> None:
+        self._done = True
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def expired(self) -> bool:
+        if self._done:
+            return True
+        self._countdown -= 1
+        if self._countdown > 0 or self.end is None:
+            return False
+        now = time.perf_counter()
+        if now >= self.end:
+            self._done = True
+            return True
+        # aim the next clock read at check_interval from now, but never past the deadline;
+        # the stride at most doubles per read so one cheap stretch of calls can't overshoot
+        since = now - self._last_check
+        rate = self._stride / since if since > 0 else float(self.max_stride) / self.check_interval
+        horizon = min(self.check_interval, self.end - now)
+        self._stride = max(1, min(self.max_stride, 2 * self._stride, int(rate * horizon)))
+        self._countdown = self._stride
+        self._last_check = now
+        return False
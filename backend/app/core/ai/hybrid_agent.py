@@ -1,4 +1,5 @@
 from __future__ import annotations
+import time
 from typing import Optional, Tuple, List
 from app.core.ai.base_agent import BaseAgent
 from app.core.ai.greedy_agent import GreedyAgent
@@ -6,23 +7,85 @@ from app.core.ai.minimax_agent import MinimaxAgent
 from app.core.ai.mcts_agent import MCTSAgent
 from app.core.eval.evaluator import Evaluator
 from app.core.engine.board import Board
+from app.core.ai.search_stats import SearchStats
+from app.core.ai.time_manager import TimeManager
 
 Move = Tuple[int,int]
 
+# minimax root lines MCTS may choose among (with use_mcts)
+REFINE_LINES = 3
+
+
 class HybridAgent(BaseAgent):
-    def __init__(self, evaluator: Evaluator, use_mcts: bool = False, quick_depth: int = 2, deep_depth: int = 5, time_limit: float = 2.0):
+    """
+    Greedy finds whether there is a move at all; minimax, bounded by max_nodes, decides.
+    With use_mcts, MCTS (its own simulation budget, at most mcts_share of the move time)
+    runs first, and its move is played instead when minimax scores it within
+    refine_margin of its best line; the rest of the time goes to minimax.
+    """
+
+    def __init__(self, evaluator: Evaluator, use_mcts: bool = False, quick_depth: int = 2, deep_depth: int = 5,
+                 time_limit: Optional[float] = 2.0, mcts_share: float = 0.25, time_manager: Optional[TimeManager] = None,
+                 simulations: Optional[int] = 500, max_nodes: Optional[int] = None, seed: Optional[int] = None,
+                 refine_margin: float = 5.0):
+        if use_mcts and simulations is None and time_limit is None and time_manager is None:
+            raise ValueError("HybridAgent needs a simulation budget or a time limit for MCTS")
         self.greedy = GreedyAgent(evaluator)
-        self.minimax = MinimaxAgent(evaluator, max_depth=deep_depth, time_limit=time_limit)
-        self.mcts = MCTSAgent(evaluator, simulations=500, time_limit=0.5) if use_mcts else None
+        self.minimax = MinimaxAgent(evaluator, max_depth=deep_depth, time_limit=time_limit, max_nodes=max_nodes,
+                                    multi_pv=REFINE_LINES if use_mcts else 1)
+        self.mcts = MCTSAgent(evaluator, simulations=simulations, seed=seed) if use_mcts else None
         self.quick_depth = quick_depth
+        # total per move, shared by MCTS and minimax; None leaves only the simulation / node budgets
+        self.time_limit = time_limit
+        self.mcts_share = mcts_share
+        self.refine_margin = refine_margin  # evaluation units
+        self.time_manager = time_manager
+        self.last_stats = SearchStats()
+
+    def stop(self) -> None:
+        """End whichever sub-search is running with its current best move."""
+        if self.mcts is not None:
+            self.mcts.stop()
+        self.minimax.stop()
 
     def best_move(self, board: Board, player: int) -> Tuple[Optional[Move], float]:
+        """Combined stats of every sub-search that ran are left in `last_stats`."""
+        tm = self.time_manager
+        budget = self.time_limit
+        if tm is not None:
+            tm.start_move(board)
+            budget = tm.soft_limit
+        try:
+            return self._best_move(board, player, budget)
+        finally:
+            if tm is not None:
+                tm.end_move()
+
+    def _best_move(self, board: Board, player: int, budget: Optional[float]) -> Tuple[Optional[Move], float]:
+        start = time.perf_counter()
+        self.last_stats = SearchStats()
         mv_g, _ = self.greedy.best_move(board, player)
         if mv_g is None:
             return None, 0.0
+        mv_m = None
         if self.mcts is not None:
-            mv_m, score = self.mcts.best_move(board, player)
-            if mv_m is not None:
-                return mv_m, score
+            self.mcts.time_limit = None if budget is None else self.mcts_share * budget
+            mv_m, _ = self.mcts.best_move(board, player)
+        # minimax only gets what is left of the move budget
+        if budget is not None:
+            self.minimax.time_limit = max(0.01, budget - (time.perf_counter() - start))
         mv_mm, score = self.minimax.best_move(board, player)
+        if self.mcts is None:
+            self.last_stats = self.minimax.last_stats
+            return mv_mm or mv_g, score
+        # both searches ran for this one move
+        self.last_stats = SearchStats.empty().merge(self.mcts.last_stats).merge(self.minimax.last_stats)
+        self.last_stats.moves = 1
+        self.last_stats.depth_reached = self.minimax.last_stats.depth_reached
+        if not self.minimax.lines and mv_m is not None:
+            return mv_m, score  # minimax completed no depth in the time left
+        # lines' scores are BLACK's; MCTS may pick any line about as good as the best
+        for line in self.minimax.lines:
+            if line["move"] == mv_m and abs(line["score"] - score) <= self.refine_margin:
+                return mv_m, line["score"]
         return mv_mm or mv_g, score
@@ -2,135 +2,329 @@ from __future__ import annotations
 import math
 import random
 import time
-from typing import Optional, Tuple, Dict
+from typing import TYPE_CHECKING, Optional, Tuple, Dict, List
 from app.core.ai.base_agent import BaseAgent
 from app.core.engine.board import Board, BLACK, WHITE
+from app.core.engine.playout import random_playout
+from app.core.engine.stability import disc_bounds
 from app.core.eval.evaluator import Evaluator
+from app.core.ai.search_stats import SearchStats
+from app.core.ai.time_manager import TimeManager
+from app.core.ai.deadline import Deadline
+
+if TYPE_CHECKING:
+    import numpy as np
 
 Move = Tuple[int, int]
 
+# rollout result as a value for BLACK: win 1, loss 0, draw 0.5
+RESULT_VALUE = {BLACK: 1.0, WHITE: 0.0, 0: 0.5}
+# from this many empty squares down, skip the rollout when stable discs already decide the game
+BOUND_EMPTIES = 20
+
 
 class MCTSNode:
-    def __init__(self, board: Board, parent: Optional["MCTSNode"],
+    def __init__(self, parent: Optional["MCTSNode"],
                  move_from_parent: Optional[Move], player_just_moved: int):
-        self.board_snapshot = board.copy()
         self.parent = parent
         self.move_from_parent = move_from_parent
         self.player_just_moved = player_just_moved
-        self.children: Dict[Move, MCTSNode] = {}
+        self.children: Dict[Optional[Move], MCTSNode] = {}
+        # moves not yet expanded; None until the node is first reached. A forced
+        # pass is the single move None, a finished game has no moves at all.
+        self.untried: Optional[List[Optional[Move]]] = None
         self.visits = 0
         self.wins = 0.0  # wins for player_just_moved
+        # all-moves-as-first: playouts through the parent in which player_just_moved
+        # played move_from_parent at any later point
+        self.amaf_visits = 0
+        self.amaf_wins = 0.0
 
-    def is_fully_expanded(self, player_to_move: int) -> bool:
-        return len(self.children) == len(self.board_snapshot.legal_moves(player_to_move))
+    def is_fully_expanded(self) -> bool:
+        return self.untried is not None and not self.untried
 
-    def uct_score(self, total_simulations: int, c: float = math.sqrt(2)):
+    def uct_score(self, total_simulations: int, c: float = math.sqrt(2), rave_k: float = 0.0):
         if self.visits == 0:
             return float("inf")
         win_rate = self.wins / self.visits
+        if rave_k > 0 and self.amaf_visits:
+            # RAVE: lean on AMAF statistics while the node's own visit count is small
+            beta = math.sqrt(rave_k / (3 * self.visits + rave_k))
+            win_rate = (1 - beta) * win_rate + beta * (self.amaf_wins / self.amaf_visits)
         return win_rate + c * math.sqrt(math.log(total_simulations) / self.visits)
 
 
 class MCTSAgent(BaseAgent):
     def __init__(self, evaluator: Optional[Evaluator] = None,
-                 simulations: int = 1000, time_limit: Optional[float] = None,
-                 rollout_policy: str = "random"):
+                 simulations: Optional[int] = 1000, time_limit: Optional[float] = None,
+                 rollout_policy: str = "random", time_manager: Optional[TimeManager] = None,
+                 batch_rollouts: int = 0, seed: Optional[int] = None,
+                 rollout_depth: Optional[int] = None, eval_scale: float = 20.0,
+                 rave: bool = False, rave_k: float = 500.0):
         self.evaluator = evaluator
+        # playouts per move; with a time limit the search also ends at the deadline, and
+        # simulations=None searches until it (a time limit or time_manager is then required)
         self.simulations = simulations
-        self.time_limit = time_limit
+        self.time_limit = time_limit  # ignored when a time_manager is set
+        self.time_manager = time_manager
         self.rollout_policy = rollout_policy
+        # >1: each expansion is scored by this many random games played in lockstep with NumPy
+        self.batch_rollouts = batch_rollouts
+        self._seed = seed
+        self.rng = random.Random(seed)  # tree expansion and rollouts; the global RNG is left alone
+        self._np_rng = None  # NumPy is only imported once batched rollouts are used
+        # stop rollouts after this many plies and score the position with the evaluator
+        # squashed through a sigmoid (eval_scale evaluator units ~ one logit)
+        self.rollout_depth = rollout_depth
+        self.eval_scale = eval_scale
+        self.rave_k = rave_k if rave else 0.0
+        self.last_stats = SearchStats()
+        self._deadline = Deadline(None)
+
+    def stop(self) -> None:
+        """Ask a running search to finish and return the current most-visited move."""
+        self._deadline.stop()
 
     def best_move(self, board: Board, player: int):
-        root = MCTSNode(board.copy(), None, None, -player)
-        end_time = time.time() + self.time_limit if self.time_limit else None
+        """Run MCTS from `board`; counters for the search are left in `last_stats`."""
+        self.last_stats = SearchStats()
+        tm = self.time_manager
+        time_limit = self.time_limit
+        if tm is not None:
+            tm.start_move(board)
+            time_limit = tm.soft_limit  # MCTS is anytime, so the soft budget is all it needs
+        t0 = time.perf_counter()
+        try:
+            return self._search(board, player, time_limit)
+        finally:
+            self.last_stats.time_total = time.perf_counter() - t0
+            if tm is not None:
+                tm.end_move()
 
+    def _search(self, board: Board, player: int, time_limit: Optional[float]):
+        stats = self.last_stats
+        root = MCTSNode(None, None, -player)
+        if self.simulations is None and not time_limit:
+            raise ValueError("MCTSAgent needs a simulation budget or a time limit")
+        self._deadline = deadline = Deadline(time_limit if time_limit else None)
+
+        # every simulation plays on this one board and undoes its moves afterwards
+        state = board.copy()
+        state.to_move = player
         sims = 0
 
         while True:
-            if end_time and time.time() > end_time:
+            if deadline.expired():
                 break
-            if self.time_limit is None and sims >= self.simulations:
+            if self.simulations is not None and sims >= self.simulations:
                 break
 
             sims += 1
             node = root
-            state = board.copy()
+            plies = 0
+            path = [root]
+            played = [] if self.rave_k else None  # (mover, move) after the root, for AMAF
 
-            # SELECTION
-            while node.children and not state.is_terminal():
+            # SELECTION: descend only through fully expanded nodes
+            while node.is_fully_expanded() and node.children:
                 best_move, best_child = max(
                     node.children.items(),
-                    key=lambda it: it[1].uct_score(node.visits)
+                    key=lambda it: it[1].uct_score(node.visits, rave_k=self.rave_k)
                 )
-                state.apply_move(best_move, -node.player_just_moved)
+                if played is not None:
+                    played.append((state.to_move, best_move))
+                state.apply_move(best_move, state.to_move)
+                plies += 1
                 node = best_child
+                path.append(node)
+            if plies > stats.depth_reached:
+                stats.depth_reached = plies
 
             # EXPANSION
-            player_to_move = state.to_move
-            legal = state.legal_moves(player_to_move)
-
-            if legal and not node.is_fully_expanded(player_to_move):
-                tried = set(node.children.keys())
-                untried = [m for m in legal if m not in tried]
-                if untried:
-                    mv = random.choice(untried)
-                    state.apply_move(mv, player_to_move)
-                    child = MCTSNode(state.copy(), node, mv, player_to_move)
-                    node.children[mv] = child
-                    node = child
+            if node.untried is None:
+                node.untried = self._tree_moves(state)
+            if node.untried:
+                mv = node.untried.pop(self.rng.randrange(len(node.untried)))
+                mover = state.to_move
+                if played is not None:
+                    played.append((mover, mv))
+                state.apply_move(mv, mover)
+                plies += 1
+                child = MCTSNode(node, mv, mover)
+                node.children[mv] = child
+                node = child
+                path.append(node)
+                stats.nodes += 1
 
-            # ROLLOUT
-            winner = self._rollout(state)
-
-            # BACKPROP
-            self._backpropagate(node, winner)
+            # ROLLOUT + BACKPROP
+            known = self._decided(state)
+            if known is not None:
+                self._backpropagate(node, known)
+                if played is not None:
+                    self._update_amaf(path, played, known)
+                stats.simulations += 1
+                stats.bound_results += 1
+            elif self.batch_rollouts > 1 and self._random_rollouts() and self.rollout_depth is None:
+                self._backpropagate_batch(node, self._batch_rollout(state))
+            else:
+                value = self._rollout(state, played)
+                self._backpropagate(node, value)
+                if played is not None:
+                    self._update_amaf(path, played, value)
+                stats.simulations += 1
+            for _ in range(plies):
+                state.undo()
 
         # --- FIXED: avoid empty children meaning 'pass' ---
         root_moves = board.legal_moves(player)
+        if not root_moves:
+            return None, 0.0
 
-        if not root.children:
+        if not any(mv is not None for mv in root.children):
             # MCTS failed to expand → return any legal move rather than passing
-            if root_moves:
-                return root_moves[0], 0.0
-            return None, 0.0
+            return root_moves[0], 0.0
 
         # Pick move with highest visit count
         best_mv, best_child = max(root.children.items(), key=lambda it: it[1].visits)
         score = best_child.wins / best_child.visits if best_child.visits else 0.0
         return best_mv, float(score)
 
-    def _rollout(self, state: Board) -> int:
-        sim = state.copy()
-        while not sim.is_terminal():
-            moves = sim.legal_moves(sim.to_move)
-            if not moves:
-                sim.apply_move(None, sim.to_move)
-                continue
+    def _tree_moves(self, state: Board) -> List[Optional[Move]]:
+        moves: List[Optional[Move]] = list(state.legal_moves(state.to_move))
+        if not moves and state.legal_moves(-state.to_move):
+            moves = [None]
+        return moves
 
-            if self.rollout_policy == "random" or self.evaluator is None:
-                mv = random.choice(moves)
-            else:
-                # greedy rollout
-                best_mv = None
-                best_score = float('-inf')
-                for mv in moves:
-                    sim.apply_move(mv, sim.to_move)
-                    score = self.evaluator.evaluate(sim, BLACK)
-                    sim.undo()
+    def _batch_rollout(self, state: Board) -> np.ndarray:
+        stats = self.last_stats
+        from app.core.engine.batch_rollout import batch_random_playouts
+        if self._np_rng is None:
+            import numpy as np
+            self._np_rng = np.random.default_rng(self._seed)
+        t = time.perf_counter()
+        winners, plies = batch_random_playouts(state, self.batch_rollouts, self._np_rng)
+        stats.simulations += len(winners)
+        stats.rollout_plies += plies
+        stats.time_movegen += time.perf_counter() - t
+        return winners
+
+    def _decided(self, state: Board) -> Optional[float]:
+        """The value for BLACK when stable discs alone settle the winner, else None."""
+        if state.empty_count() > BOUND_EMPTIES:
+            return None
+        lo, hi = disc_bounds(state)
+        if lo > 0:
+            return RESULT_VALUE[BLACK]
+        if hi < 0:
+            return RESULT_VALUE[WHITE]
+        return None
+
+    def _random_rollouts(self) -> bool:
+        return self.rollout_policy == "random" or self.evaluator is None
+
+    def _rollout(self, state: Board, played: Optional[List] = None) -> float:
+        """
+        Play `state` out and return its value for BLACK in [0, 1]; `state` is restored afterwards.
+        Moves are appended to `played` as (mover, move) when given. With rollout_depth set the
+        playout stops early and the position is scored by the evaluator.
+        """
+        stats = self.last_stats
+        if self._random_rollouts() and self.rollout_depth is None and played is None:
+            t = time.perf_counter()
+            winner, plies = random_playout(state, self.rng)
+            stats.rollout_plies += plies
+            # a random playout is all move generation and make/unmake
+            stats.time_movegen += time.perf_counter() - t
+            return RESULT_VALUE[winner]
+
+        greedy = not self._random_rollouts()
+        plies = 0
+        try:
+            moves = state.legal_moves(state.to_move)
+            while True:
+                if self.rollout_depth is not None and plies >= self.rollout_depth:
+                    return self._cutoff_value(state)
+                if not moves:
+                    moves = state.legal_moves(-state.to_move)
+                    if not moves:
+                        break
+                    state.apply_move(None, state.to_move)
+                    plies += 1
+                    continue  # the pass counts against rollout_depth too
 
-                    if score > best_score:
-                        best_score = score
-                        best_mv = mv
+                mover = state.to_move
+                mv = self._greedy_choice(state, moves) if greedy else self.rng.choice(moves)
+                if played is not None:
+                    played.append((mover, mv))
+                state.apply_move(mv, mover)
+                plies += 1
+                moves = state.legal_moves(state.to_move)
+            return RESULT_VALUE[state.winner()]
+        finally:
+            stats.rollout_plies += plies
+            for _ in range(plies):
+                state.undo()
 
-                mv = best_mv or random.choice(moves)
+    def _greedy_choice(self, state: Board, moves: List[Move]) -> Move:
+        """Best move for the side to move by one-ply evaluation."""
+        stats = self.last_stats
+        mover = state.to_move
+        best_mv = None
+        best_score = float('-inf')
+        t = time.perf_counter()
+        for mv in moves:
+            state.apply_move(mv, mover)
+            score = self.evaluator.evaluate(state, mover)
+            state.undo()
 
-            sim.apply_move(mv, sim.to_move)
+            if score > best_score:
+                best_score = score
+                best_mv = mv
+        stats.leaf_evals += len(moves)
+        stats.time_eval += time.perf_counter() - t
+        return best_mv or self.rng.choice(moves)
 
-        return sim.winner()
+    def _cutoff_value(self, state: Board) -> float:
+        """Win probability for BLACK of an unfinished rollout, from a sigmoid of the evaluation."""
+        if self.evaluator is None:
+            b, w = state.score()
+            score = float(b - w)
+        else:
+            t = time.perf_counter()
+            score = self.evaluator.evaluate(state, BLACK)
+            self.last_stats.leaf_evals += 1
+            self.last_stats.time_eval += time.perf_counter() - t
+        return 1.0 / (1.0 + math.exp(-max(-60.0, min(60.0, score / self.eval_scale))))
 
-    def _backpropagate(self, node: MCTSNode, winner: int):
+    def _update_amaf(self, path: List[MCTSNode], played: List, value: float) -> None:
+        """
+        AMAF update: for every node on the path, credit each child whose move its mover
+        played anywhere later in this simulation (tree part and rollout alike).
+        """
+        # played[i] is the move made from path[i]; everything from the leaf on is rollout
+        leaf = len(path) - 1
+        later = {m for m in played[leaf:] if m[1] is not None}
+        for i in range(leaf, -1, -1):
+            if i < leaf and played[i][1] is not None:
+                later.add(played[i])
+            for child in path[i].children.values():
+                if (child.player_just_moved, child.move_from_parent) in later:
+                    child.amaf_visits += 1
+                    child.amaf_wins += value if child.player_just_moved == BLACK else 1.0 - value
+
+    def _backpropagate(self, node: MCTSNode, value: float):
+        """`value` is the simulation result for BLACK (see RESULT_VALUE)."""
         while node:
             node.visits += 1
-            if winner == node.player_just_moved:
-                node.wins += 1
+            node.wins += value if node.player_just_moved == BLACK else 1.0 - value
+            node = node.parent
+
+    def _backpropagate_batch(self, node: MCTSNode, winners: np.ndarray):
+        k = len(winners)
+        draws = 0.5 * int((winners == 0).sum())
+        black_wins = int((winners == BLACK).sum()) + draws
+        white_wins = int((winners == WHITE).sum()) + draws
+        while node:
+            node.visits += k
+            node.wins += black_wins if node.player_just_moved == BLACK else white_wins
             node = node.parent
@@ -1,11 +1,29 @@
 from __future__ import annotations
 import time
-from typing import Optional, Tuple, Dict
+from typing import Callable, Dict, List, Optional, Tuple
 from enum import Enum
 
 from app.core.engine.board import Board, BLACK, WHITE
 from app.core.eval.evaluator import Evaluator
-from app.core.engine.zobrist import compute_hash
+from app.core.ai.search_stats import SearchStats
+from app.core.ai.time_manager import TimeManager, predict_next_iteration
+from app.core.ai.deadline import Deadline
+from app.core.ai.probcut import load_params, stage_of, weights_fingerprint
+
+# Move ordering for selective search (classic positional square values): corners first,
+# the squares next to them last. Late-move reductions rely on the order being sensible.
+SQUARE_ORDER = [
+    100, -20, 10, 5, 5, 10, -20, 100,
+    -20, -50, -2, -2, -2, -2, -50, -20,
+    10, -2, 1, 1, 1, 1, -2, 10,
+    5, -2, 1, 0, 0, 1, -2, 5,
+    5, -2, 1, 0, 0, 1, -2, 5,
+    10, -2, 1, 1, 1, 1, -2, 10,
+    -20, -50, -2, -2, -2, -2, -50, -20,
+    100, -20, 10, 5, 5, 10, -20, 100,
+]
+PROBCUT_T = 1.5  # cut when the prediction clears the bound by this many sigmas
+NULL_WINDOW = 1e-3
 
 
 class BoundType(Enum):
@@ -23,32 +41,108 @@ class TTEntry:
 
 
 class MinimaxAgent:
-    def __init__(self, evaluator: Evaluator, max_depth: int = 6, time_limit: Optional[float] = None) -> None:
+    def __init__(self, evaluator: Evaluator, max_depth: int = 6, time_limit: Optional[float] = None,
+                 on_iteration: Optional[Callable[[Dict], None]] = None,
+                 time_manager: Optional[TimeManager] = None, multi_pv: int = 1,
+                 probcut: bool = False, lmr: bool = False, probcut_t: float = PROBCUT_T,
+                 lmr_min_depth: int = 3, lmr_full_moves: int = 3, max_nodes: Optional[int] = None) -> None:
         self.evaluator = evaluator
         self.max_depth = max_depth
-        self.time_limit = time_limit  # seconds per move
-        self.start_time = 0.0
+        # node budget per move: unlike time_limit, the same position always gets the same search
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit  # seconds per move, ignored when a time_manager is set
+        self.time_manager = time_manager
+        self._move_limit = time_limit
+        self.on_iteration = on_iteration  # called with search info after every completed depth
+        self.multi_pv = multi_pv  # root moves to score exactly; see analyze()
+        # [{"move", "score", "pv"}] best first, from the deepest completed depth
+        self.lines: List[Dict] = []
+        self._root_scores: List[Tuple[float, Optional[Tuple[int,int]]]] = []
         self.nodes_searched = 0
         self.tt: Dict[int, TTEntry] = {}
+        self.last_stats = SearchStats()
+        self._deadline = Deadline(None)
+        # selective search, both off by default. probcut: Multi-ProbCut with the models in
+        # probcut.json, if they were fitted with this evaluator's weights; lmr: at depth >= lmr_min_depth, moves after the first lmr_full_moves
+        # (in SQUARE_ORDER, TT move first) are searched one ply shallower and re-searched
+        # at full depth if they turn out to improve the score
+        self.probcut = probcut
+        self.probcut_t = probcut_t
+        self.probcut_params = load_params(fingerprint=weights_fingerprint(evaluator.weights)) if probcut else {}
+        self.lmr = lmr
+        self.lmr_min_depth = lmr_min_depth
+        self.lmr_full_moves = lmr_full_moves
+
+    def stop(self) -> None:
+        """Ask a running search to finish; best_move returns the deepest completed result."""
+        self._deadline.stop()
+
+    def analyze(self, board: Board, player: int, k: Optional[int] = None) -> List[Dict]:
+        """
+        Score the best `k` root moves (every legal move by default) exactly, with their
+        principal variations, in one iterative-deepening search sharing one TT.
+        Returns the lines best first, as also left in `lines`.
+        """
+        saved = self.multi_pv
+        self.multi_pv = k or max(1, len(board.legal_moves(player)))
+        try:
+            self.best_move(board, player)
+        finally:
+            self.multi_pv = saved
+        return self.lines
 
     def _time_exceeded(self) -> bool:
-        return self.time_limit is not None and (time.time() - self.start_time) >= self.time_limit
+        return self._deadline.expired() or (self.max_nodes is not None and self.nodes_searched >= self.max_nodes)
 
     def best_move(self, board: Board, player: int) -> Tuple[Optional[Tuple[int,int]], float]:
         """
         Iterative deepening with transposition table.
         Returns best_move (row,col) or None for pass, and its score.
+        Counters for the search are left in `last_stats`.
         """
-        self.start_time = time.time()
+        self.last_stats = SearchStats()
+        tm = self.time_manager
+        self._move_limit = tm.start_move(board) if tm is not None else self.time_limit
+        t0 = time.perf_counter()
+        try:
+            return self._iterative_deepening(board, player)
+        finally:
+            self.last_stats.nodes = self.nodes_searched
+            self.last_stats.time_total = time.perf_counter() - t0
+            if tm is not None:
+                tm.end_move()
+
+    def _iterative_deepening(self, board: Board, player: int) -> Tuple[Optional[Tuple[int,int]], float]:
+        self._deadline = Deadline(self._move_limit)
+        self.nodes_searched = 0
+        self.lines = []
         best_overall = None
         best_score_overall = float('-inf') if player == BLACK else float('inf')
 
         # clear TT each move (safer) — could persist across moves if desired
         self.tt.clear()
 
+        tm = self.time_manager
+        branching = len(board.legal_moves(player))
+        iteration_times = []
+        iteration_nodes = []
+
         for depth in range(1, self.max_depth + 1):
             if self._time_exceeded():
                 break
+            # don't start a depth that can't finish in time
+            if tm is not None:
+                if not tm.should_start_iteration(iteration_times, branching):
+                    break
+            elif self._move_limit is not None:
+                elapsed = self._deadline.elapsed()
+                if elapsed + predict_next_iteration(iteration_times, branching) > self._move_limit:
+                    break
+            # nor one that would run out of nodes: its partial result would be thrown away
+            if self.max_nodes is not None:
+                if self.nodes_searched + predict_next_iteration(iteration_nodes, branching) > self.max_nodes:
+                    break
+            iteration_start = time.perf_counter()
             score = None
             try:
                 if player == BLACK:
@@ -59,11 +153,19 @@ class MinimaxAgent:
                 break
 
             # if root search completed, extract best move from TT if present
-            h = compute_hash(board.grid, board.to_move)
+            h = board.zobrist()
             entry = self.tt.get(h)
             if entry and entry.best_move is not None:
                 best_overall = entry.best_move
                 best_score_overall = entry.value
+                self.last_stats.depth_reached = depth
+                self.lines = self._root_lines(board, player, depth)
+                if tm is not None:
+                    tm.record_iteration(best_overall, best_score_overall)
+                if self.on_iteration is not None:
+                    self.on_iteration(self._iteration_info(board, depth, best_score_overall))
+            iteration_times.append(time.perf_counter() - iteration_start)
+            iteration_nodes.append(self.nodes_searched - sum(iteration_nodes))
             # continue deeper if time allows
 
         # If no best found (no legal moves), return pass score
@@ -71,27 +173,91 @@ class MinimaxAgent:
             moves = board.legal_moves(player)
             if not moves:
                 # evaluate final position
-                final_score = self.evaluator.evaluate(board, BLACK)
+                final_score = self._evaluate_leaf(board)
                 return None, final_score
             # fallback: pick first legal
             return moves[0], best_score_overall
         return best_overall, best_score_overall
 
+    def _iteration_info(self, board: Board, depth: int, score: float) -> Dict:
+        elapsed = self._deadline.elapsed()
+        pv = self.principal_variation(board, depth)
+        info = {
+            "depth": depth,
+            "score": score,
+            "move": pv[0] if pv else None,
+            "pv": pv,
+            "nodes": self.nodes_searched,
+            "nps": int(self.nodes_searched / elapsed) if elapsed > 0 else 0,
+            "elapsed": elapsed,
+        }
+        if self.multi_pv > 1:
+            info["lines"] = self.lines
+        return info
+
+    def _root_lines(self, board: Board, player: int, depth: int) -> List[Dict]:
+        """Top multi_pv root moves of the last completed iteration, with their PVs."""
+        lines = []
+        for score, mv in self._root_scores[:max(1, self.multi_pv)]:
+            board.apply_move(mv, player)
+            try:
+                pv = [mv] + self.principal_variation(board, depth - 1)
+            finally:
+                board.undo()
+            lines.append({"move": mv, "score": score, "pv": pv})
+        return lines
+
+    def principal_variation(self, board: Board, max_len: int) -> List[Optional[Tuple[int,int]]]:
+        """Follow TT best moves from the current position (passes appear as None)."""
+        pv: List[Optional[Tuple[int,int]]] = []
+        applied = 0
+        try:
+            while len(pv) < max_len:
+                entry = self.tt.get(board.zobrist())
+                if entry is None:
+                    break
+                mv = entry.best_move
+                if mv is None and board.legal_moves(board.to_move):
+                    break
+                board.apply_move(mv, board.to_move)
+                applied += 1
+                pv.append(mv)
+                if mv is None and board.is_terminal():
+                    break
+        finally:
+            for _ in range(applied):
+                board.undo()
+        return pv
+
     def _search_root(self, board: Board, depth: int, player: int, store_best: bool) -> float:
         # root wrapper to handle no-move case and timeouts
-        moves = board.legal_moves(player)
+        moves = self._legal_moves(board, player)
         if not moves:
             return self._evaluate_leaf(board)
         alpha = float('-inf')
         beta = float('inf')
         best_val = float('-inf') if player == BLACK else float('inf')
         best_move = None
+        k = self.multi_pv
+        # best k (score, move) pairs so far, best first; with k > 1 each root move is
+        # searched with a window that only has to prove it beats the current k-th best,
+        # so the scores that make the list are exact and the rest are cheap bounds
+        top: List[Tuple[float, Optional[Tuple[int,int]]]] = []
         for mv in moves:
             if self._time_exceeded():
                 raise TimeoutError()
+            if k > 1:
+                kth = top[k-1][0] if len(top) >= k else (float('-inf') if player == BLACK else float('inf'))
+                alpha, beta = (kth, float('inf')) if player == BLACK else (float('-inf'), kth)
             board.apply_move(mv, player)
-            val = self._alphabeta(board, depth-1, -player, alpha, beta)
-            board.undo()
+            try:
+                val = self._alphabeta(board, depth-1, -player, alpha, beta)
+            finally:
+                board.undo()
+            if len(top) < k or (val > top[-1][0] if player == BLACK else val < top[-1][0]):
+                top.append((val, mv))
+                top.sort(key=lambda line: line[0], reverse=(player == BLACK))
+                del top[k:]
             if player == BLACK:
                 if val > best_val:
                     best_val = val
@@ -105,8 +271,9 @@ class MinimaxAgent:
                 if best_val < beta:
                     beta = best_val
             # optional pruning on root not necessary beyond alpha/beta
+        self._root_scores = top
         if store_best:
-            h = compute_hash(board.grid, board.to_move)
+            h = self._hash(board)
             self.tt[h] = TTEntry(depth, best_val, BoundType.EXACT, best_move)
         return best_val
 
@@ -114,25 +281,31 @@ class MinimaxAgent:
         if self._time_exceeded():
             raise TimeoutError()
         self.nodes_searched += 1
+        alpha0, beta0 = alpha, beta  # the window the result's bound type refers to
 
         # terminal or leaf
-        if depth == 0 or board.is_terminal():
+        if depth == 0 or self._is_terminal(board):
             return self._evaluate_leaf(board)
 
         # TT lookup
-        h = compute_hash(board.grid, board.to_move)
+        stats = self.last_stats
+        h = self._hash(board)
+        stats.tt_probes += 1
         entry = self.tt.get(h)
         if entry is not None and entry.depth >= depth:
+            stats.tt_hits += 1
             if entry.bound == BoundType.EXACT:
+                stats.tt_cutoffs += 1
                 return entry.value
             if entry.bound == BoundType.LOWER and entry.value > alpha:
                 alpha = entry.value
             elif entry.bound == BoundType.UPPER and entry.value < beta:
                 beta = entry.value
             if alpha >= beta:
+                stats.tt_cutoffs += 1
                 return entry.value
 
-        moves = board.legal_moves(player)
+        moves = self._legal_moves(board, player)
         if not moves:
             # pass move
             val = self._alphabeta(board, depth-1, -player, alpha, beta)
@@ -140,13 +313,30 @@ class MinimaxAgent:
             self.tt[h] = TTEntry(depth, val, BoundType.EXACT, None)
             return val
 
+        selective = self.lmr or self.probcut
+        if selective:
+            if self.probcut and depth in self.probcut_params:
+                cut = self._probcut(board, depth, player, alpha, beta)
+                if cut is not None:
+                    return cut
+            hash_move = entry.best_move if entry is not None else None
+            moves.sort(key=lambda m: 1000 if m == hash_move else SQUARE_ORDER[m[0] * 8 + m[1]], reverse=True)
+        reduce_from = self.lmr_full_moves if self.lmr and depth >= self.lmr_min_depth else len(moves)
+
         if player == BLACK:
             value = float('-inf')
             best_local = None
-            for mv in moves:
+            for i, mv in enumerate(moves):
                 board.apply_move(mv, player)
-                v = self._alphabeta(board, depth-1, -player, alpha, beta)
-                board.undo()
+                try:
+                    if i >= reduce_from and SQUARE_ORDER[mv[0] * 8 + mv[1]] < 100:
+                        v = self._alphabeta(board, depth-2, -player, alpha, beta)
+                        if v > alpha:
+                            v = self._alphabeta(board, depth-1, -player, alpha, beta)
+                    else:
+                        v = self._alphabeta(board, depth-1, -player, alpha, beta)
+                finally:
+                    board.undo()
                 if v > value:
                     value = v
                     best_local = mv
@@ -156,19 +346,26 @@ class MinimaxAgent:
                     break
             # store in TT
             bound = BoundType.EXACT
-            if value <= alpha:
+            if value <= alpha0:
                 bound = BoundType.UPPER
-            elif value >= beta:
+            elif value >= beta0:
                 bound = BoundType.LOWER
             self.tt[h] = TTEntry(depth, value, bound, best_local)
             return value
         else:
             value = float('inf')
             best_local = None
-            for mv in moves:
+            for i, mv in enumerate(moves):
                 board.apply_move(mv, player)
-                v = self._alphabeta(board, depth-1, -player, alpha, beta)
-                board.undo()
+                try:
+                    if i >= reduce_from and SQUARE_ORDER[mv[0] * 8 + mv[1]] < 100:
+                        v = self._alphabeta(board, depth-2, -player, alpha, beta)
+                        if v < beta:
+                            v = self._alphabeta(board, depth-1, -player, alpha, beta)
+                    else:
+                        v = self._alphabeta(board, depth-1, -player, alpha, beta)
+                finally:
+                    board.undo()
                 if v < value:
                     value = v
                     best_local = mv
@@ -177,16 +374,65 @@ class MinimaxAgent:
                 if alpha >= beta:
                     break
             bound = BoundType.EXACT
-            if value <= alpha:
+            if value <= alpha0:
                 bound = BoundType.UPPER
-            elif value >= beta:
+            elif value >= beta0:
                 bound = BoundType.LOWER
             self.tt[h] = TTEntry(depth, value, bound, best_local)
             return value
 
+    def _probcut(self, board: Board, depth: int, player: int, alpha: float, beta: float) -> Optional[float]:
+        """
+        Multi-ProbCut test: if a shallow search predicts, with probcut_t sigmas to spare,
+        that the depth-`depth` value falls outside (alpha, beta), return the bound it
+        fails to; otherwise None and the node is searched normally.
+        """
+        shallow, models = self.probcut_params[depth]
+        a, b, sigma = models[stage_of(board)]
+        margin = self.probcut_t * sigma
+        # the models are in the side to move's perspective; values here are BLACK's
+        lo, hi = (alpha, beta) if player == BLACK else (-beta, -alpha)
+        if hi != float('inf'):
+            bound = (hi + margin - b) / a
+            if player == BLACK:
+                if self._alphabeta(board, shallow, player, bound - NULL_WINDOW, bound) >= bound:
+                    return beta
+            elif self._alphabeta(board, shallow, player, -bound, -bound + NULL_WINDOW) <= -bound:
+                return alpha
+        if lo != float('-inf'):
+            bound = (lo - margin - b) / a
+            if player == BLACK:
+                if self._alphabeta(board, shallow, player, bound, bound + NULL_WINDOW) <= bound:
+                    return alpha
+            elif self._alphabeta(board, shallow, player, -bound - NULL_WINDOW, -bound) >= -bound:
+                return beta
+        return None
+
+    def _legal_moves(self, board: Board, player: int):
+        t = time.perf_counter()
+        moves = board.legal_moves(player)
+        self.last_stats.time_movegen += time.perf_counter() - t
+        return moves
+
+    def _is_terminal(self, board: Board) -> bool:
+        t = time.perf_counter()
+        terminal = board.is_terminal()
+        self.last_stats.time_movegen += time.perf_counter() - t
+        return terminal
+
+    def _hash(self, board: Board) -> int:
+        t = time.perf_counter()
+        h = board.zobrist()
+        self.last_stats.time_hash += time.perf_counter() - t
+        return h
+
     def _evaluate_leaf(self, board: Board) -> float:
         """
         Return evaluation from BLACK perspective. This is used at leaves and
         when timeouts occur (we prefer raising and catching timeout earlier).
         """
-        return float(self.evaluator.evaluate(board, BLACK))
+        t = time.perf_counter()
+        value = float(self.evaluator.evaluate(board, BLACK))
+        self.last_stats.leaf_evals += 1
+        self.last_stats.time_eval += time.perf_counter() - t
+        return value
@@ -0,0 +1,77 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+from app.core.engine.board import Board
+
+# Multi-ProbCut (Buro): the value of a depth-d search is predicted from a shallow
+# depth-d' search of the same position as a * v' + b with residual spread sigma,
+# fitted separately per game stage. Values are from the side to move's perspective.
+# probcut.json holds the fitted models and the fingerprint of the evaluator weights
+# they were fitted with; app/scripts/fit_probcut.py rewrites it.
+PROBCUT_PATH = os.path.join(os.path.dirname(__file__), "probcut.json")
+
+# remaining depth -> shallow depth used to predict it (same parity, so the
+# odd/even evaluation swing doesn't show up as noise)
+CUT_PAIRS: Dict[int, int] = {3: 1, 4: 2, 5: 1, 6: 2}
+STAGES = 4  # by empty squares: 60-46, 45-31, 30-16, 15-0
+
+Model = Tuple[float, float, float]  # a, b, sigma
+
+
+def stage_of(board: Board) -> int:
+    return min(STAGES - 1, (60 - board.empty_count()) * STAGES // 61)
+
+
+def weights_fingerprint(weights: Mapping[str, float]) -> str:
+    """Identifies a weight set across processes (Evaluator.fingerprint is a salted hash)."""
+    return hashlib.sha256(json.dumps(sorted(weights.items())).encode()).hexdigest()[:16]
+
+
+@lru_cache(maxsize=None)
+def load_params(path: str = PROBCUT_PATH, fingerprint: Optional[str] = None) -> Dict[int, Tuple[int, List[Model]]]:
+    """depth -> (shallow depth, one model per stage); {} when the file is missing or unreadable,
+    or, given the `fingerprint` of the evaluator weights in use, fitted with other weights
+    (the values, and so the residual spread, scale with the weights)."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        if fingerprint is not None and data.get("weights") != fingerprint:
+            return {}
+        return {int(d): (int(entry["shallow"]), [tuple(m) for m in entry["stages"]])
+                for d, entry in data["depths"].items()}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def fit_line(xs: Sequence[float], ys: Sequence[float]) -> Model:
+    """Least-squares y = a * x + b and the standard deviation of the residuals."""
+    n = len(xs)
+    mx, my = sum(xs) / n, sum(ys) / n
+    sxx = sum((x - mx) ** 2 for x in xs)
+    a = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sxx if sxx else 1.0
+    b = my - a * mx
+    sigma = (sum((y - a * x - b) ** 2 for x, y in zip(xs, ys)) / max(1, n - 2)) ** 0.5
+    return a, b, sigma
+
+
+def fit_params(samples: Dict[int, List[Dict[int, float]]], min_samples: int = 30) -> Dict:
+    """
+    Fit CUT_PAIRS models from `samples`: stage -> [{depth: value}, ...] (side-to-move
+    values of iterative-deepening searches of sampled positions). Stages with fewer
+    than `min_samples` positions use the model fitted on all stages.
+    """
+    depths = {}
+    for d, shallow in CUT_PAIRS.items():
+        pooled = [(s[shallow], s[d]) for stage in samples.values() for s in stage if d in s and shallow in s]
+        if len(pooled) < min_samples:
+            continue
+        overall = fit_line(*zip(*pooled))
+        models = []
+        for stage in range(STAGES):
+            pairs = [(s[shallow], s[d]) for s in samples.get(stage, []) if d in s and shallow in s]
+            models.append(list(fit_line(*zip(*pairs)) if len(pairs) >= min_samples else overall))
+        depths[str(d)] = {"shallow": shallow, "samples": len(pooled), "stages": models}
+    return {"depths": depths}
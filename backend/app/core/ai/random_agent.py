@@ -8,12 +8,11 @@ Move = Tuple[int, int]
 
 class RandomAgent(BaseAgent):
     def __init__(self, seed: Optional[int] = None) -> None:
-        if seed is not None:
-            random.seed(seed)
+        self.rng = random.Random(seed)  # own generator: seeding never touches the global one
 
     def best_move(self, board: Board, player: int) -> Tuple[Optional[Move], float]:
         moves = board.legal_moves(player)
         if not moves:
             return None, 0.0
-        mv = random.choice(moves)
+        mv = self.rng.choice(moves)
         return mv, 0.0
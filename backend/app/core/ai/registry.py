@@ -0,0 +1,76 @@
+from __future__ import annotations
+import importlib
+from typing import Dict, Optional, Type
+
+# Agent name -> "module:Class". Modules are only imported when an agent is first
+# asked for, so importing the API or a worker doesn't pull in every agent (and NumPy).
+AGENT_CLASSES: Dict[str, str] = {
+    "random": "app.core.ai.random_agent:RandomAgent",
+    "greedy": "app.core.ai.greedy_agent:GreedyAgent",
+    "minimax": "app.core.ai.minimax_agent:MinimaxAgent",
+    "mcts": "app.core.ai.mcts_agent:MCTSAgent",
+    "hybrid": "app.core.ai.hybrid_agent:HybridAgent",
+}
+
+# Other names an agent is known by. minimax_ga is minimax with the trained weights
+# (the caller passes that evaluator).
+AGENT_ALIASES: Dict[str, str] = {"minimax_ga": "minimax"}
+
+# Strength levels as search budgets per move: alpha-beta nodes for minimax (and the
+# hybrid's minimax), playouts for MCTS (and the hybrid's MCTS). Unlike a time limit, a budget gives the same
+# search, hence the same move and cost, however loaded the host is;
+# app/scripts/calibrate_levels.py measures what each level costs on this machine.
+LEVELS: Dict[str, Dict[str, int]] = {
+    "easy": {"nodes": 200, "simulations": 100},
+    "medium": {"nodes": 2000, "simulations": 400},
+    "hard": {"nodes": 10000, "simulations": 1000},
+    "expert": {"nodes": 50000, "simulations": 3000},
+}
+DEFAULT_LEVEL = "medium"
+MAX_DEPTH = 64  # iterative deepening is bounded by the node budget, not by depth
+
+_loaded: Dict[str, Type] = {}
+
+
+def agent_class(name: str) -> Optional[Type]:
+    """The agent class registered as `name` (case-insensitive), or None if unknown."""
+    name = name.lower()
+    name = AGENT_ALIASES.get(name, name)
+    cls = _loaded.get(name)
+    if cls is None:
+        path = AGENT_CLASSES.get(name)
+        if path is None:
+            return None
+        module, attr = path.split(":")
+        cls = _loaded[name] = getattr(importlib.import_module(module), attr)
+    return cls
+
+
+def make_agent(name: str, evaluator=None, level: str = DEFAULT_LEVEL, time_limit: Optional[float] = None,
+               seed: Optional[int] = None):
+    """
+    Agent `name` searching with the budget of strength `level`. `time_limit` (seconds
+    per move) is an optional wall-clock cap on top of the budget; a search that hits
+    it plays its best move so far. `seed` seeds the agent's own RNG (random, MCTS).
+    ValueError for an unknown agent or level.
+    """
+    cls = agent_class(name)
+    if cls is None:
+        raise ValueError(f"Unknown agent '{name}'")
+    budget = LEVELS.get(level)
+    if budget is None:
+        raise ValueError(f"Unknown level '{level}'; choose from {list(LEVELS)}")
+    name = AGENT_ALIASES.get(name.lower(), name.lower())
+    if name == "random":
+        return cls(seed=seed)
+    if name == "greedy":
+        return cls(evaluator)
+    if name == "minimax":
+        return cls(evaluator, max_depth=MAX_DEPTH, max_nodes=budget["nodes"], time_limit=time_limit)
+    if name == "mcts":
+        return cls(evaluator, simulations=budget["simulations"], time_limit=time_limit, seed=seed)
+    if name == "hybrid":
+        # MCTS plays its simulations in at most a share of the move time; minimax's nodes decide the move
+        return cls(evaluator, use_mcts=True, deep_depth=MAX_DEPTH, time_limit=time_limit,
+                   simulations=budget["simulations"], max_nodes=budget["nodes"], seed=seed)
+    return cls()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+from typing import Dict
+
+COUNTERS = (
+    "nodes",          # positions visited by alpha-beta / tree nodes created by MCTS
+    "leaf_evals",     # Evaluator.evaluate calls
+    "tt_probes",
+    "tt_hits",
+    "tt_cutoffs",     # TT hits that ended the node without searching
+    "simulations",    # MCTS playouts
+    "rollout_plies",  # plies played inside MCTS rollouts
+    "bound_results",  # MCTS simulations settled by stable-disc bounds instead of a rollout
+)
+
+TIMERS = ("time_movegen", "time_eval", "time_hash", "time_total")
+
+
+class SearchStats:
+    """Counters and per-phase timings for one best_move call (or an aggregate of many)."""
+
+    def __init__(self) -> None:
+        for name in COUNTERS + TIMERS:
+            setattr(self, name, 0 if name in COUNTERS else 0.0)
+        self.depth_reached = 0
+        self.moves = 1
+
+    def merge(self, other: "SearchStats") -> "SearchStats":
+        """Add another stats object into this one. depth_reached keeps the sum so averages stay exact."""
+        for name in COUNTERS + TIMERS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.depth_reached += other.depth_reached
+        self.moves += other.moves
+        return self
+
+    @classmethod
+    def empty(cls) -> "SearchStats":
+        stats = cls()
+        stats.moves = 0
+        return stats
+
+    def to_dict(self) -> Dict[str, float]:
+        d: Dict[str, float] = {name: getattr(self, name) for name in COUNTERS + TIMERS}
+        d["depth_reached"] = self.depth_reached / self.moves if self.moves > 1 else self.depth_reached
+        d["moves"] = self.moves
+        d["nps"] = self.nodes / self.time_total if self.time_total > 0 else 0.0
+        d["tt_hit_rate"] = self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+        d["avg_rollout_len"] = self.rollout_plies / self.simulations if self.simulations else 0.0
+        return d
@@ -0,0 +1,99 @@
+from __future__ import annotations
+import time
+from typing import List, Optional, Tuple
+from app.core.engine.board import Board
+
+Move = Tuple[int, int]
+
+
+def predict_next_iteration(iteration_times: List[float], branching: int) -> float:
+    """
+    Estimate how long the next iterative-deepening iteration will take.
+    Uses the growth ratio of the last two iterations (effective branching factor),
+    falling back to the legal-move count when only one iteration has run.
+    """
+    if not iteration_times:
+        return 0.0
+    last = iteration_times[-1]
+    if len(iteration_times) >= 2 and iteration_times[-2] > 0:
+        ebf = last / iteration_times[-2]
+    else:
+        ebf = float(branching)
+    return last * max(1.0, min(ebf, float(max(branching, 1))))
+
+
+class TimeManager:
+    """
+    Splits a game clock (plus per-move increment) into per-move budgets.
+
+    Each move gets a soft budget, roughly remaining / moves-left-for-us, and a hard
+    budget (a few soft budgets, capped at a fraction of the clock). A search stops
+    starting new iterations at the soft budget, may run on to the hard budget while
+    its score is unstable, and stops early once its best move has been stable for a
+    few iterations.
+    """
+
+    def __init__(self, total_time: float, increment: float = 0.0, min_time: float = 0.02,
+                 max_fraction: float = 0.25, hard_factor: float = 3.0, stable_iterations: int = 3,
+                 unstable_margin: float = 5.0) -> None:
+        self.remaining = total_time
+        self.increment = increment
+        self.min_time = min_time
+        self.max_fraction = max_fraction
+        self.hard_factor = hard_factor
+        self.stable_iterations = stable_iterations
+        self.unstable_margin = unstable_margin  # score swing (eval units) that counts as unstable
+        self.soft_limit = 0.0
+        self.hard_limit = 0.0
+        self._move_start = 0.0
+        self._best: Optional[Move] = None
+        self._stable = 0
+        self._last_score: Optional[float] = None
+        self._unstable = False
+
+    def allocate(self, board: Board) -> Tuple[float, float]:
+        """Return (soft, hard) budgets in seconds for the side to move on `board`."""
+        empties = board.empty_count()
+        moves_left = max(1, (empties + 1) // 2)
+        base = self.remaining / moves_left + self.increment
+        cap = max(self.min_time, self.remaining * self.max_fraction)
+        soft = max(self.min_time, min(base, cap))
+        hard = max(soft, min(base * self.hard_factor, cap))
+        return soft, hard
+
+    def start_move(self, board: Board) -> float:
+        """Begin timing a move; returns the hard budget, which searches must never exceed."""
+        self.soft_limit, self.hard_limit = self.allocate(board)
+        self._move_start = time.perf_counter()
+        self._best = None
+        self._stable = 0
+        self._last_score = None
+        self._unstable = False
+        return self.hard_limit
+
+    def end_move(self) -> float:
+        """Charge the elapsed move time to the clock and add the increment. Returns elapsed."""
+        elapsed = time.perf_counter() - self._move_start
+        self.remaining = max(0.0, self.remaining - elapsed) + self.increment
+        return elapsed
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._move_start
+
+    def record_iteration(self, best: Optional[Move], score: float) -> None:
+        """Feed the result of a completed iteration so stability can be tracked."""
+        if best == self._best:
+            self._stable += 1
+        else:
+            self._best = best
+            self._stable = 1
+        self._unstable = self._last_score is not None and abs(score - self._last_score) > self.unstable_margin
+        self._last_score = score
+
+    def should_start_iteration(self, iteration_times: List[float], branching: int) -> bool:
+        """False when the next iteration is predicted to overrun, or the best move has settled."""
+        elapsed = self.elapsed()
+        limit = self.hard_limit if self._unstable else self.soft_limit
+        if self._stable >= self.stable_iterations and elapsed >= 0.5 * self.soft_limit:
+            return False
+        return elapsed + predict_next_iteration(iteration_times, branching) <= limit
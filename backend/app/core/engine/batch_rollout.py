@@ -0,0 +1,122 @@
+from __future__ import annotations
+from typing import Optional, Tuple
+import numpy as np
+from .board import Board, BLACK, WHITE, EMPTY
+from .bitboard import MASK_LEFT, MASK_RIGHT, MASK_ALL
+
+_U = np.uint64
+_LEFT = _U(MASK_LEFT)
+_RIGHT = _U(MASK_RIGHT)
+_ALL = _U(MASK_ALL)
+_BITS = np.arange(64, dtype=np.uint64)
+
+# (shift amount, shift left?, mask applied after the shift) for the 8 directions,
+# matching BitBoard._shift
+_DIRECTIONS = [
+    (_U(1), True, _LEFT), (_U(1), False, _RIGHT),
+    (_U(8), True, _ALL), (_U(8), False, _ALL),
+    (_U(9), True, _LEFT), (_U(9), False, _RIGHT),
+    (_U(7), True, _RIGHT), (_U(7), False, _LEFT),
+]
+
+
+def board_to_bits(board: Board) -> Tuple[int, int]:
+    """(black, white) bitboards of a Board, bit r*8+c set for an occupied square."""
+    black = white = 0
+    for sq, v in enumerate(board.cells):
+        if v == BLACK:
+            black |= 1 << sq
+        elif v == WHITE:
+            white |= 1 << sq
+    return black, white
+
+
+def bits_to_board(black: int, white: int, to_move: int = BLACK) -> Board:
+    """Inverse of board_to_bits (the new Board has no move history)."""
+    b = Board()
+    for sq in range(64):
+        b._put(sq, BLACK if black >> sq & 1 else WHITE if white >> sq & 1 else EMPTY)
+    b.to_move = to_move
+    return b
+
+
+def _shift(x: np.ndarray, n, left: bool, mask) -> np.ndarray:
+    return ((x << n) if left else (x >> n)) & mask
+
+
+def legal_moves(own: np.ndarray, opp: np.ndarray) -> np.ndarray:
+    """Legal-move bitmask for every row of own/opp (uint64 arrays)."""
+    empty = ~(own | opp)
+    moves = np.zeros_like(own)
+    for n, left, mask in _DIRECTIONS:
+        t = _shift(own, n, left, mask) & opp
+        for _ in range(5):
+            t |= _shift(t, n, left, mask) & opp
+        moves |= _shift(t, n, left, mask) & empty
+    return moves
+
+
+def flips(own: np.ndarray, opp: np.ndarray, move: np.ndarray) -> np.ndarray:
+    """Discs flipped by playing the single-bit `move` in every row (0 where move is 0)."""
+    result = np.zeros_like(own)
+    for n, left, mask in _DIRECTIONS:
+        t = _shift(move, n, left, mask) & opp
+        for _ in range(5):
+            t |= _shift(t, n, left, mask) & opp
+        closed = (_shift(t, n, left, mask) & own) != 0
+        result |= np.where(closed, t, _U(0))
+    return result
+
+
+def popcount(x: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(x).astype(np.int64)
+    return np.unpackbits(x.view(np.uint8)).reshape(-1, 64).sum(axis=1)
+
+
+def random_bit(moves: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Pick one set bit uniformly at random per row (0 for rows without bits)."""
+    bits = ((moves[:, None] >> _BITS) & _U(1)).astype(bool)
+    counts = bits.sum(axis=1)
+    pick = (rng.random(len(moves)) * counts).astype(np.int64)
+    idx = np.argmax(bits.cumsum(axis=1) > pick[:, None], axis=1).astype(np.uint64)
+    return np.where(counts > 0, _U(1) << idx, _U(0))
+
+
+def batch_random_playouts(board: Board, k: int, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, int]:
+    """
+    Play `k` uniformly random games from `board` in lockstep.
+    Returns (winners, total plies): winners holds BLACK, WHITE or 0 (draw) per game.
+    """
+    rng = rng or np.random.default_rng()
+    black, white = board_to_bits(board)
+    side = board.to_move
+    own = np.full(k, black if side == BLACK else white, dtype=np.uint64)
+    opp = np.full(k, white if side == BLACK else black, dtype=np.uint64)
+    to_move = np.full(k, side, dtype=np.int8)
+    active = np.ones(k, dtype=bool)
+    plies = 0
+
+    while active.any():
+        moves = legal_moves(own, opp)
+        stuck = active & (moves == 0)
+        if stuck.any():
+            # side to move must pass; if the opponent can't move either, that game is over
+            reply = legal_moves(opp, own)
+            active &= ~(stuck & (reply == 0))
+        move = random_bit(np.where(active, moves, _U(0)), rng)
+        f = flips(own, opp, move)
+        played = move != 0
+        own = np.where(played, own | move | f, own)
+        opp = np.where(played, opp & ~f, opp)
+        plies += int(active.sum())
+        # both moves and passes hand the turn over
+        own, opp = np.where(active, opp, own), np.where(active, own, opp)
+        to_move = np.where(active, -to_move, to_move)
+
+    own_count = popcount(own)
+    opp_count = popcount(opp)
+    black_count = np.where(to_move == BLACK, own_count, opp_count)
+    white_count = np.where(to_move == BLACK, opp_count, own_count)
+    winners = np.sign(black_count - white_count).astype(np.int8)
+    return winners, plies
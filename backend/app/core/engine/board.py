@@ -1,5 +1,8 @@
 from __future__ import annotations
 from typing import List, Tuple, Optional
+from .zobrist import ZOBRIST_SQUARES, ZOBRIST_SIDE
+from .tables import NEIGHBOURS, DEGREE, COORDS, BIT, squares_of
+from .history import MoveHistory, PASS
 
 EMPTY = 0
 BLACK = 1
@@ -7,84 +10,210 @@ WHITE = -1
 
 Move = Tuple[int, int]  # (row, col), 0-indexed
 
+# hash change when the disc on a square changes colour
+_FLIP_KEYS = [keys[0] ^ keys[1] for keys in ZOBRIST_SQUARES]
+
 class Board:
+    """
+    8x8 Othello board stored as 64 flat cells (index r * 8 + c).
+    `grid` exposes the familiar list-of-rows view; move generation walks the
+    precomputed ray tables in `tables` instead of stepping coordinates.
+    Disc counts, the set of empty squares and frontier counts are kept up to
+    date by every set(), so score and terminal checks never scan the board.
+    """
+
     def __init__(self) -> None:
         self.size = 8
-        self.grid: List[List[int]] = [[EMPTY for _ in range(self.size)] for _ in range(self.size)]
-        mid = self.size // 2
-        self.grid[mid-1][mid-1] = WHITE
-        self.grid[mid][mid] = WHITE
-        self.grid[mid-1][mid] = BLACK
-        self.grid[mid][mid-1] = BLACK
         self.to_move = BLACK
-        self.history: List[Tuple[Optional[Move], List[Move]]] = []
+        self.history = MoveHistory()
+        self._clear()
+        mid = self.size // 2
+        self.set(mid-1, mid-1, WHITE)
+        self.set(mid, mid, WHITE)
+        self.set(mid-1, mid, BLACK)
+        self.set(mid, mid-1, BLACK)
+
+    def _clear(self) -> None:
+        self.cells: List[int] = [EMPTY] * 64
+        # Zobrist hash of the discs only, kept up to date by set(); see zobrist()
+        self.disc_hash = 0
+        # The per-colour tables below are indexed by the colour itself: [1] is BLACK,
+        # [-1] is WHITE and [0] (EMPTY) is an unused sink, which keeps the hot loops
+        # free of colour branches.
+        # _near[c][sq]: c-discs adjacent to sq. A square can only be a legal move for
+        # a player if it touches an opponent disc.
+        self._near: List[List[int]] = [[0] * 64, [0] * 64, [0] * 64]
+        self._counts = [0, 0, 0]    # discs per colour
+        self._frontier = [0, 0, 0]  # discs per colour with at least one empty neighbour
+        self._open = DEGREE[:]      # empty neighbours of every square
+        self.empty_mask = (1 << 64) - 1  # bit sq set while square sq is empty
+        self.black_mask = 0  # bit sq set while square sq holds a BLACK disc
 
     def copy(self) -> "Board":
         b = Board.__new__(Board)
         b.size = self.size
-        b.grid = [row[:] for row in self.grid]
+        b.cells = self.cells[:]
         b.to_move = self.to_move
-        b.history = [ (m, flips[:]) for (m, flips) in self.history ]
+        b.history = self.history.copy()
+        b.disc_hash = self.disc_hash
+        b._near = [near[:] for near in self._near]
+        b._counts = self._counts[:]
+        b._frontier = self._frontier[:]
+        b._open = self._open[:]
+        b.empty_mask = self.empty_mask
+        b.black_mask = self.black_mask
         return b
 
+    @property
+    def grid(self) -> List[List[int]]:
+        """Row-major snapshot of the cells; assigning a grid replaces the position."""
+        cells = self.cells
+        return [cells[r * 8:r * 8 + 8] for r in range(self.size)]
+
+    @grid.setter
+    def grid(self, grid: List[List[int]]) -> None:
+        self._clear()
+        for r in range(self.size):
+            for c in range(self.size):
+                self.set(r, c, grid[r][c])
+
     def inside(self, r: int, c: int) -> bool:
         return 0 <= r < self.size and 0 <= c < self.size
 
     def get(self, r: int, c: int) -> int:
-        return self.grid[r][c]
+        return self.cells[r * 8 + c]
 
     def set(self, r: int, c: int, v: int) -> None:
-        self.grid[r][c] = v
+        self._put(r * 8 + c, v)
+
+    def _put(self, sq: int, v: int) -> None:
+        cells = self.cells
+        old = cells[sq]
+        if old == v:
+            return
+        if old != EMPTY and v != EMPTY:
+            self._flip([sq], v)
+            return
+        opn, frontier = self._open, self._frontier
+        if v != EMPTY:
+            self.disc_hash ^= ZOBRIST_SQUARES[sq][0 if v == BLACK else 1]
+            self._counts[v] += 1
+            if opn[sq]:
+                frontier[v] += 1
+            near = self._near[v]
+            for n in NEIGHBOURS[sq]:
+                near[n] += 1
+                opn[n] -= 1
+                if not opn[n]:
+                    frontier[cells[n]] -= 1  # sq was n's last empty neighbour
+        else:
+            self.disc_hash ^= ZOBRIST_SQUARES[sq][0 if old == BLACK else 1]
+            self._counts[old] -= 1
+            if opn[sq]:
+                frontier[old] -= 1
+            near = self._near[old]
+            for n in NEIGHBOURS[sq]:
+                near[n] -= 1
+                if not opn[n]:
+                    frontier[cells[n]] += 1  # sq becomes n's only empty neighbour
+                opn[n] += 1
+        self.empty_mask ^= 1 << sq
+        if v == BLACK or old == BLACK:
+            self.black_mask ^= 1 << sq
+        cells[sq] = v
+
+    def _flip(self, squares: List[int], v: int) -> int:
+        """Turn the opponent discs on `squares` into `v` discs and return their mask.
+        Emptiness doesn't change, so neither does anyone's frontier status; only the
+        colour it is counted for."""
+        src, dst = self._near[-v], self._near[v]
+        opn = self._open
+        cells = self.cells
+        h = self.disc_hash
+        on_frontier = 0
+        mask = 0
+        for sq in squares:
+            mask |= BIT[sq]
+            cells[sq] = v
+            h ^= _FLIP_KEYS[sq]
+            if opn[sq]:
+                on_frontier += 1
+            for n in NEIGHBOURS[sq]:
+                src[n] -= 1
+                dst[n] += 1
+        self.disc_hash = h
+        self.black_mask ^= mask
+        k = len(squares)
+        self._counts[-v] -= k
+        self._counts[v] += k
+        self._frontier[-v] -= on_frontier
+        self._frontier[v] += on_frontier
+        return mask
+
+    def zobrist(self) -> int:
+        """Zobrist hash of the position including side to move; equals compute_hash(grid, to_move)."""
+        return self.disc_hash ^ ZOBRIST_SIDE if self.to_move == WHITE else self.disc_hash
 
     def legal_moves(self, player: int) -> List[Move]:
-        from .rules import get_flips
-        moves: List[Move] = []
-        for r in range(self.size):
-            for c in range(self.size):
-                if self.grid[r][c] != EMPTY:
-                    continue
-                flips = get_flips(self.grid, r, c, player)
-                if flips:
-                    moves.append((r, c))
-        return moves
+        from .rules import can_flip
+        cells = self.cells
+        near_opp = self._near[-player]
+        return [COORDS[sq] for sq in range(64)
+                if near_opp[sq] and cells[sq] == EMPTY and can_flip(cells, sq, player)]
+
+    def has_legal_move(self, player: int) -> bool:
+        """legal_moves(player) != [], stopping at the first legal square."""
+        from .rules import can_flip
+        cells = self.cells
+        near_opp = self._near[-player]
+        for sq in range(64):
+            if near_opp[sq] and cells[sq] == EMPTY and can_flip(cells, sq, player):
+                return True
+        return False
 
     def apply_move(self, move: Optional[Move], player: int) -> None:
         if move is None:
-            self.history.append((None, []))
+            self.history.push(PASS, 0)
             self.to_move = -player
             return
         r, c = move
-        from .rules import get_flips
-        flips = get_flips(self.grid, r, c, player)
+        from .rules import flips_at
+        sq = r * 8 + c
+        flips = flips_at(self.cells, sq, player)
         if not flips:
             raise ValueError("Illegal move")
-        self.set(r, c, player)
-        for (fr, fc) in flips:
-            self.set(fr, fc, player)
-        self.history.append((move, flips))
+        self._put(sq, player)
+        self.history.push(sq, self._flip(flips, player))
         self.to_move = -player
 
     def undo(self) -> None:
         if not self.history:
             raise RuntimeError("No moves to undo")
-        move, flips = self.history.pop()
-        self.to_move = -self.to_move
-        if move is None:
+        sq, mask = self.history.pop()
+        if sq == PASS:
+            self.to_move = -self.to_move
             return
-        r, c = move
-        self.set(r, c, EMPTY)
-        for fr, fc in flips:
-            self.set(fr, fc, -self.to_move)
+        # the placed disc tells who moved; to_move may be stale when a caller
+        # searched on past a pass without playing it on the board
+        mover = self.cells[sq]
+        self.to_move = mover
+        self._put(sq, EMPTY)
+        self._flip(squares_of(mask), -mover)
 
     def is_terminal(self) -> bool:
-        if self.legal_moves(BLACK) or self.legal_moves(WHITE):
-            return False
-        return True
+        if not self.empty_mask or not self._counts[BLACK] or not self._counts[WHITE]:
+            return True
+        return not (self.has_legal_move(BLACK) or self.has_legal_move(WHITE))
 
     def score(self) -> Tuple[int, int]:
-        black = sum(1 for r in range(self.size) for c in range(self.size) if self.grid[r][c] == BLACK)
-        white = sum(1 for r in range(self.size) for c in range(self.size) if self.grid[r][c] == WHITE)
-        return black, white
+        return self._counts[BLACK], self._counts[WHITE]
+
+    def empty_count(self) -> int:
+        return 64 - self._counts[BLACK] - self._counts[WHITE]
+
+    def frontier(self) -> Tuple[int, int]:
+        """(BLACK, WHITE) discs that touch at least one empty square."""
+        return self._frontier[BLACK], self._frontier[WHITE]
 
     def winner(self) -> int:
         b, w = self.score()
@@ -97,5 +226,5 @@ class Board:
     def __str__(self) -> str:
         rows = []
         for r in range(self.size):
-            rows.append(''.join({EMPTY:'.', BLACK:'B', WHITE:'W'}[self.grid[r][c]] for c in range(self.size)))
+            rows.append(''.join({EMPTY:'.', BLACK:'B', WHITE:'W'}[v] for v in self.cells[r * 8:r * 8 + 8]))
         return "\n".join(rows)
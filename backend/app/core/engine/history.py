@@ -0,0 +1,72 @@
+from __future__ import annotations
+from array import array
+from typing import Iterator, List, Optional, Tuple
+from .tables import COORDS, squares_of
+
+Move = Tuple[int, int]
+
+PASS = -1
+
+
+class MoveHistory:
+    """
+    Plies played on a Board, stored as parallel preallocated arrays of
+    (square index or PASS, bitmask of flipped squares): 9 bytes per ply.
+
+    copy() is O(1): the copy shares the arrays with the original, and whichever
+    side next writes an entry clones them first (copy-on-write). pop() only
+    shortens the logical length, so undo/redo in search never allocates.
+    """
+
+    __slots__ = ("_squares", "_masks", "_len", "_shared")
+
+    def __init__(self, capacity: int = 128) -> None:
+        self._squares = array("b", bytes(capacity))
+        self._masks = array("Q", bytes(8 * capacity))
+        self._len = 0
+        self._shared = False
+
+    def copy(self) -> "MoveHistory":
+        h = MoveHistory.__new__(MoveHistory)
+        h._squares = self._squares
+        h._masks = self._masks
+        h._len = self._len
+        h._shared = self._shared = True
+        return h
+
+    def push(self, square: int, mask: int) -> None:
+        n = self._len
+        if self._shared or n == len(self._squares):
+            grow = n == len(self._squares)
+            self._squares = array("b", self._squares)
+            self._masks = array("Q", self._masks)
+            if grow:
+                self._squares.extend(bytes(n))
+                self._masks.extend(array("Q", bytes(8 * n)))
+            self._shared = False
+        self._squares[n] = square
+        self._masks[n] = mask
+        self._len = n + 1
+
+    def pop(self) -> Tuple[int, int]:
+        """Remove the last ply and return its (square, flip mask)."""
+        if not self._len:
+            raise IndexError("pop from empty history")
+        self._len -= 1
+        return self._squares[self._len], self._masks[self._len]
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, i: int) -> Tuple[Optional[Move], List[Move]]:
+        """Decoded ply: (move or None for a pass, flipped squares as (row, col))."""
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("history index out of range")
+        sq = self._squares[i]
+        return (None if sq == PASS else COORDS[sq]), [COORDS[f] for f in squares_of(self._masks[i])]
+
+    def __iter__(self) -> Iterator[Tuple[Optional[Move], List[Move]]]:
+        for i in range(self._len):
+            yield self[i]
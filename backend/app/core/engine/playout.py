@@ -0,0 +1,33 @@
+from __future__ import annotations
+import random
+from typing import Tuple
+from .board import Board
+
+
+def random_playout(board: Board, rng: random.Random | None = None) -> Tuple[int, int]:
+    """
+    Play uniformly random moves on `board` until the game ends, then undo them all.
+    Returns (winner, plies played). The board is left exactly as it was given.
+
+    Terminal detection reuses the move lists already generated: when the side to
+    move has no moves, the opponent's list decides between a pass and game over,
+    and is played from directly on the next ply.
+    """
+    choice = (rng or random).choice
+    plies = 0
+    moves = board.legal_moves(board.to_move)
+    try:
+        while True:
+            if not moves:
+                moves = board.legal_moves(-board.to_move)
+                if not moves:
+                    break
+                board.apply_move(None, board.to_move)
+                plies += 1
+            board.apply_move(choice(moves), board.to_move)
+            plies += 1
+            moves = board.legal_moves(board.to_move)
+        return board.winner(), plies
+    finally:
+        for _ in range(plies):
+            board.undo()
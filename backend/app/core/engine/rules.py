@@ -1,27 +1,60 @@
 from typing import List, Tuple
+from .tables import DIRECTIONS, RAYS, COORDS
 EMPTY = 0
 BLACK = 1
 WHITE = -1
 Move = Tuple[int, int]
 
-DIRECTIONS: List[Tuple[int, int]] = [
-    (-1, -1), (-1, 0), (-1, 1),
-    (0, -1),           (0, 1),
-    (1, -1),  (1, 0),  (1, 1),
-]
+
+def flips_at(cells: List[int], sq: int, player: int) -> List[int]:
+    """Squares flipped by `player` playing on `sq` of a flat 64-cell board (empty if illegal)."""
+    if cells[sq] != EMPTY:
+        return []
+    opp = -player
+    flips: List[int] = []
+    for ray in RAYS[sq]:
+        if cells[ray[0]] != opp:
+            continue
+        for i in range(1, len(ray)):
+            v = cells[ray[i]]
+            if v == player:
+                flips.extend(ray[:i])
+                break
+            if v != opp:
+                break
+    return flips
+
+
+def can_flip(cells: List[int], sq: int, player: int) -> bool:
+    """True when `player` may play on the (empty) square `sq`; flips_at without building the list."""
+    opp = -player
+    for ray in RAYS[sq]:
+        if cells[ray[0]] != opp:
+            continue
+        for i in range(1, len(ray)):
+            v = cells[ray[i]]
+            if v == player:
+                return True
+            if v != opp:
+                break
+    return False
+
 
 def get_flips(grid: List[List[int]], r: int, c: int, player: int) -> List[Move]:
     if grid[r][c] != EMPTY:
         return []
-    size = len(grid)
-    flips = []
-    for dr, dc in DIRECTIONS:
-        rr, cc = r + dr, c + dc
-        line = []
-        while 0 <= rr < size and 0 <= cc < size and grid[rr][cc] == -player:
-            line.append((rr, cc))
-            rr += dr
-            cc += dc
-        if 0 <= rr < size and 0 <= cc < size and grid[rr][cc] == player and line:
-            flips.extend(line)
+    opp = -player
+    flips: List[Move] = []
+    for ray in RAYS[r * 8 + c]:
+        rr, cc = COORDS[ray[0]]
+        if grid[rr][cc] != opp:
+            continue
+        for i in range(1, len(ray)):
+            rr, cc = COORDS[ray[i]]
+            v = grid[rr][cc]
+            if v == player:
+                flips.extend(COORDS[sq] for sq in ray[:i])
+                break
+            if v != opp:
+                break
     return flips
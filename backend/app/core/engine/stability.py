@@ -0,0 +1,180 @@
+from __future__ import annotations
+from array import array
+from typing import Dict, List, Tuple
+from .table_file import read_tables
+from .bitboard import MASK_LEFT, MASK_RIGHT, MASK_ALL
+
+# Stable discs can never be flipped again for the rest of the game.
+#
+# Edges are looked up in EDGE_STABLE, indexed by an edge's 3^8 configuration
+# (position i contributes 3^i times 0 empty / 1 BLACK / 2 WHITE) and holding the
+# mask of its discs that no sequence of moves on that edge can flip. Interior
+# discs are then found by propagation: a disc is stable when, along each of the
+# four lines through it, the line is full or a neighbour on it is the board's
+# edge or a stable disc of the same colour.
+
+EDGE_CONFIGS = 3 ** 8
+_POW3 = [3 ** i for i in range(8)]
+
+
+def _place(cells: List[int], pos: int, v: int) -> List[int]:
+    """An edge after `v` plays on empty position `pos`, flipping what it brackets on the edge.
+    The move needn't be legal on the edge alone: it may flip along another line instead."""
+    out = cells[:]
+    out[pos] = v
+    for step in (-1, 1):
+        i = pos + step
+        while 0 <= i < 8 and out[i] == -v:
+            i += step
+        if 0 <= i < 8 and out[i] == v:
+            j = pos + step
+            while j != i:
+                out[j] = v
+                j += step
+    return out
+
+
+def _config(cells: List[int]) -> int:
+    return sum(_POW3[i] * (1 if v == 1 else 2) for i, v in enumerate(cells) if v)
+
+
+def build_edge_table() -> List[int]:
+    """EDGE_STABLE for every configuration, from full edges down to empty ones."""
+    table = [0] * EDGE_CONFIGS
+    configs = []
+    for n in range(EDGE_CONFIGS):
+        cells, x = [], n
+        for _ in range(8):
+            x, d = divmod(x, 3)
+            cells.append((0, 1, -1)[d])
+        configs.append(cells)
+    # every successor has one empty fewer, so it is always computed first
+    for n in sorted(range(EDGE_CONFIGS), key=lambda n: configs[n].count(0)):
+        cells = configs[n]
+        stable = sum(1 << i for i, v in enumerate(cells) if v)
+        for pos in (i for i, v in enumerate(cells) if not v):
+            for v in (1, -1):
+                after = _place(cells, pos, v)
+                unchanged = sum(1 << i for i in range(8) if cells[i] and after[i] == cells[i])
+                stable &= table[_config(after)] & unchanged
+                if not stable:
+                    break
+            if not stable:
+                break
+        table[n] = stable
+    return table
+
+
+def table_sections() -> Dict[str, array]:
+    return {"edge_stable": array("B", build_edge_table())}
+
+
+_loaded = read_tables().get("edge_stable")
+EDGE_STABLE: List[int] = (_loaded.tolist() if _loaded is not None and len(_loaded) == EDGE_CONFIGS
+                          else build_edge_table())
+
+# _B3[byte]: sum of 3^i over the set bits; an edge's index is _B3[black] + 2 * _B3[white]
+_B3 = [sum(_POW3[i] for i in range(8) if byte >> i & 1) for byte in range(256)]
+# _SPREAD[byte]: bit i moved to bit 8 * i, i.e. a byte laid out down column 0
+_SPREAD = [sum(1 << (8 * i) for i in range(8) if byte >> i & 1) for byte in range(256)]
+_COL0 = 0x0101010101010101
+_GATHER = 0x0102040810204080  # (bits & _COL0) * _GATHER >> 56 packs column 0 into a byte
+
+_WALL_H = 0x8181818181818181  # columns 0 and 7
+_WALL_V = 0xFF000000000000FF  # rows 0 and 7
+_WALL_D = _WALL_H | _WALL_V
+_INNER_ROWS = 0x0001010101010100  # column 0 of rows 1-6
+
+
+def _diagonals(step_r: int, step_c: int) -> List[int]:
+    lines = []
+    starts = [(0, c) for c in range(8)] + [(r, 0 if step_c > 0 else 7) for r in range(1, 8)]
+    for r, c in starts:
+        mask = 0
+        while 0 <= r < 8 and 0 <= c < 8:
+            mask |= 1 << (r * 8 + c)
+            r, c = r + step_r, c + step_c
+        if mask & (mask - 1):  # single corner squares are never on a full-line test
+            lines.append(mask)
+    return lines
+
+
+_DIAG = _diagonals(1, 1)
+_ANTI = _diagonals(1, -1)
+
+
+def _column(bits: int) -> int:
+    return ((bits & _COL0) * _GATHER & MASK_ALL) >> 56
+
+
+def _edge_stable(black: int, white: int) -> int:
+    t = EDGE_STABLE
+    top = t[_B3[black & 0xFF] + 2 * _B3[white & 0xFF]]
+    bottom = t[_B3[black >> 56] + 2 * _B3[white >> 56]]
+    left = t[_B3[_column(black)] + 2 * _B3[_column(white)]]
+    right = t[_B3[_column(black >> 7)] + 2 * _B3[_column(white >> 7)]]
+    return top | bottom << 56 | _SPREAD[left] | _SPREAD[right] << 7
+
+
+def _full_lines(occupied: int) -> Tuple[int, int, int, int]:
+    """Masks of the squares whose row / column / diagonal / anti-diagonal is full."""
+    full_h = 0
+    for r in range(0, 64, 8):
+        if (occupied >> r) & 0xFF == 0xFF:
+            full_h |= 0xFF << r
+    x = occupied & occupied >> 32
+    x &= x >> 16
+    x &= x >> 8
+    full_v = (x & 0xFF) * _COL0
+    full_d = 0
+    for line in _DIAG:
+        if occupied & line == line:
+            full_d |= line
+    full_a = 0
+    for line in _ANTI:
+        if occupied & line == line:
+            full_a |= line
+    return full_h, full_v, full_d, full_a
+
+
+def stable_discs(black: int, white: int) -> Tuple[int, int]:
+    """(BLACK, WHITE) masks of stable discs for the given bitboards (bit r * 8 + c)."""
+    occupied = black | white
+    seeds = _edge_stable(black, white)
+    if not seeds:
+        # without a stable edge disc to grow from, an interior disc needs its whole row full
+        rows = occupied & occupied >> 4
+        rows &= rows >> 2
+        if not rows & rows >> 1 & _INNER_ROWS:
+            return 0, 0
+    full_h, full_v, full_d, full_a = _full_lines(occupied)
+    ok_h, ok_v = full_h | _WALL_H, full_v | _WALL_V
+    ok_d, ok_a = full_d | _WALL_D, full_a | _WALL_D
+    result = []
+    for own in (black, white):
+        stable = own & (seeds | (full_h & full_v & full_d & full_a))
+        while True:
+            h = ok_h | (stable << 1 & MASK_LEFT) | (stable >> 1 & MASK_RIGHT)
+            v = ok_v | (stable << 8 & MASK_ALL) | stable >> 8
+            d = ok_d | (stable << 9 & MASK_LEFT) | (stable >> 9 & MASK_RIGHT)
+            a = ok_a | (stable << 7 & MASK_RIGHT) | (stable >> 7 & MASK_LEFT)
+            grown = stable | (own & h & v & d & a)
+            if grown == stable:
+                break
+            stable = grown
+        result.append(stable)
+    return result[0], result[1]
+
+
+def stability(board) -> Tuple[int, int]:
+    """(BLACK, WHITE) stable disc counts of a Board."""
+    black = board.black_mask
+    b, w = stable_discs(black, ~board.empty_mask & MASK_ALL ^ black)
+    return (bin(b).count("1") if b else 0), (bin(w).count("1") if w else 0)
+
+
+def disc_bounds(board) -> Tuple[int, int]:
+    """Lower and upper bound on the final BLACK-minus-WHITE disc difference: stable discs
+    keep their colour, every other square may still end up either colour."""
+    b, w = stability(board)
+    return 2 * b - 64, 64 - 2 * w
@@ -0,0 +1,81 @@
+from __future__ import annotations
+import os
+import sys
+from array import array
+from functools import lru_cache
+from typing import Dict, List
+
+# Precomputed engine tables (Zobrist keys, rays, neighbours) live in tables.bin next to
+# this module, so importing the engine is a file read instead of regenerating them.
+# app/scripts/build_tables.py rewrites the file; when it is missing or stale the
+# modules that use it fall back to generating their tables in code.
+TABLE_PATH = os.path.join(os.path.dirname(__file__), "tables.bin")
+MAGIC = b"OTHTBL01"
+
+# section layout: 16-byte NUL-padded name, 1-byte array typecode, 4-byte item count, items
+# (all little-endian)
+_NAME_LEN = 16
+
+
+@lru_cache(maxsize=None)
+def read_tables(path: str = TABLE_PATH) -> Dict[str, array]:
+    """All sections of a table file, or {} when it is missing, foreign or truncated.
+    Cached per path: the engine modules share one read. Treat the arrays as read-only."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return {}
+    if not data.startswith(MAGIC):
+        return {}
+    sections: Dict[str, array] = {}
+    pos = len(MAGIC)
+    while pos < len(data):
+        name = data[pos:pos + _NAME_LEN].rstrip(b"\0").decode()
+        typecode = chr(data[pos + _NAME_LEN])
+        count = int.from_bytes(data[pos + _NAME_LEN + 1:pos + _NAME_LEN + 5], "little")
+        pos += _NAME_LEN + 5
+        values = array(typecode)
+        end = pos + count * values.itemsize
+        if end > len(data):
+            return {}
+        values.frombytes(data[pos:end])
+        if sys.byteorder != "little":
+            values.byteswap()
+        sections[name] = values
+        pos = end
+    return sections
+
+
+def write_tables(sections: Dict[str, array], path: str = TABLE_PATH) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        for name, values in sections.items():
+            f.write(name.encode().ljust(_NAME_LEN, b"\0"))
+            f.write(values.typecode.encode())
+            f.write(len(values).to_bytes(4, "little"))
+            if sys.byteorder != "little":
+                values = array(values.typecode, values)
+                values.byteswap()
+            f.write(values.tobytes())
+    os.replace(tmp, path)
+
+
+def pack_lists(lists: List[List[int]]) -> List[int]:
+    """[[a, b], [c]] -> [2, a, b, 1, c]: length-prefixed concatenation."""
+    flat: List[int] = []
+    for items in lists:
+        flat.append(len(items))
+        flat.extend(items)
+    return flat
+
+
+def unpack_lists(flat: List[int], count: int, pos: int = 0) -> List[List[int]]:
+    """Inverse of pack_lists for `count` lists starting at `pos`."""
+    lists = []
+    for _ in range(count):
+        n = flat[pos]
+        lists.append(flat[pos + 1:pos + 1 + n])
+        pos += 1 + n
+    return lists
@@ -0,0 +1,98 @@
+from __future__ import annotations
+from array import array
+from typing import Dict, List, Tuple
+from .table_file import read_tables, pack_lists, unpack_lists
+
+SIZE = 8
+SQUARES = SIZE * SIZE
+
+DIRECTIONS: List[Tuple[int, int]] = [
+    (-1, -1), (-1, 0), (-1, 1),
+    (0, -1),           (0, 1),
+    (1, -1),  (1, 0),  (1, 1),
+]
+
+
+def index(r: int, c: int) -> int:
+    return r * SIZE + c
+
+
+def coords(sq: int) -> Tuple[int, int]:
+    return divmod(sq, SIZE)
+
+
+def _ray(sq: int, dr: int, dc: int) -> List[int]:
+    r, c = coords(sq)
+    ray = []
+    r, c = r + dr, c + dc
+    while 0 <= r < SIZE and 0 <= c < SIZE:
+        ray.append(index(r, c))
+        r, c = r + dr, c + dc
+    return ray
+
+
+def build_rays() -> List[List[List[int]]]:
+    return [
+        [ray for ray in (_ray(sq, dr, dc) for dr, dc in DIRECTIONS) if len(ray) >= 2]
+        for sq in range(SQUARES)
+    ]
+
+
+def build_neighbours() -> List[List[int]]:
+    return [
+        [ray[0] for ray in (_ray(sq, dr, dc) for dr, dc in DIRECTIONS) if ray]
+        for sq in range(SQUARES)
+    ]
+
+
+def _load_rays_and_neighbours():
+    """Decode the tables from tables.bin; None when it doesn't have them."""
+    sections = read_tables()
+    try:
+        counts = sections["ray_counts"].tolist()
+        flat = unpack_lists(sections["rays"].tolist(), sum(counts))
+        neighbours = unpack_lists(sections["neighbours"].tolist(), SQUARES)
+    except (KeyError, IndexError):
+        return None
+    rays, pos = [], 0
+    for n in counts:
+        rays.append(flat[pos:pos + n])
+        pos += n
+    return rays, neighbours
+
+
+def table_sections() -> Dict[str, array]:
+    """This module's tables in the tables.bin section format (see build_tables.py)."""
+    rays = build_rays()
+    return {
+        "ray_counts": array("b", [len(r) for r in rays]),
+        "rays": array("b", pack_lists([ray for square in rays for ray in square])),
+        "neighbours": array("b", pack_lists(build_neighbours())),
+    }
+
+
+# RAYS[sq]: squares walked outwards from sq in each direction, nearest first.
+# Rays shorter than 2 squares can never flip anything and are left out.
+# NEIGHBOURS[sq]: the up-to-8 squares adjacent to sq.
+_loaded = _load_rays_and_neighbours()
+RAYS: List[List[List[int]]] = _loaded[0] if _loaded else build_rays()
+NEIGHBOURS: List[List[int]] = _loaded[1] if _loaded else build_neighbours()
+
+# (row, col) of every square, so hot loops can skip divmod.
+COORDS: List[Tuple[int, int]] = [coords(sq) for sq in range(SQUARES)]
+
+# DEGREE[sq]: number of neighbours (3 on corners, 5 on edges, 8 inside).
+DEGREE: List[int] = [len(n) for n in NEIGHBOURS]
+
+# BIT[sq]: the single-bit mask of a square.
+BIT: List[int] = [1 << sq for sq in range(SQUARES)]
+
+
+def squares_of(mask: int) -> List[int]:
+    """Set bits of a 64-bit square mask, lowest square first."""
+    squares = []
+    while mask:
+        low = mask & -mask
+        squares.append(low.bit_length() - 1)
+        mask ^= low
+    return squares
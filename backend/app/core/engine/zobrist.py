@@ -1,15 +1,27 @@
 from __future__ import annotations
-import random
 from typing import List
+from .table_file import read_tables
 
 SEED = 0xC0FFEE
-random.seed(SEED)
+_KEY_COUNT = 8 * 8 * 2 + 1  # (square, colour) keys then the side-to-move key
 
+
+def generate_keys() -> List[int]:
+    """The Zobrist keys from a private RNG seeded with SEED; the global `random` is untouched."""
+    import random
+    rng = random.Random(SEED)
+    return [rng.getrandbits(64) for _ in range(_KEY_COUNT)]
+
+
+_keys = read_tables().get("zobrist")
+_keys = _keys.tolist() if _keys is not None and len(_keys) == _KEY_COUNT else generate_keys()
+
+# ZOBRIST_TABLE[r][c][0 for BLACK, 1 for WHITE]
 ZOBRIST_TABLE: List[List[List[int]]] = [
-    [ [random.getrandbits(64) for _ in range(2)] for _ in range(8) ]
-    for _ in range(8)
+    [_keys[(r * 8 + c) * 2:(r * 8 + c) * 2 + 2] for c in range(8)]
+    for r in range(8)
 ]
-ZOBRIST_SIDE = random.getrandbits(64)
+ZOBRIST_SIDE = _keys[-1]
 
 
 def compute_hash(grid: list[list[int]], to_move: int) -> int:
@@ -28,3 +40,7 @@ def compute_hash(grid: list[list[int]], to_move: int) -> int:
     if to_move == -1:
         h ^= ZOBRIST_SIDE
     return h
+
+
+# ZOBRIST_SQUARES[r * 8 + c] is ZOBRIST_TABLE[r][c], for boards stored as 64 flat cells
+ZOBRIST_SQUARES: List[List[int]] = [ZOBRIST_TABLE[sq // 8][sq % 8] for sq in range(64)]
@@ -1,20 +1,103 @@
 from __future__ import annotations
-from typing import Dict
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 from app.core.engine.board import Board, BLACK
 from app.core.eval.features import extract_features
 
-class Evaluator:
-    def __init__(self, weights: Dict[str, float] | None = None) -> None:
-        self.weights = weights or {
-            "disc_diff": 1.0,
-            "mobility": 5.0,
-            "corner_occupancy": 25.0,
-            "corner_adj": 10.0,
-            "frontier": 2.0,
+MASK64 = (1 << 64) - 1
+
+
+class EvalCache:
+    """
+    Bounded LRU map from (position hash ^ weights fingerprint) to the BLACK-perspective score.
+    One instance is shared by every Evaluator by default, so agents (and API requests)
+    that score the same position with the same weights share results.
+    """
+
+    def __init__(self, max_entries: int = 1 << 16) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: int) -> Optional[float]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: int, value: float) -> None:
+        with self._lock:
+            self._entries[key] = value
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
         }
 
+
+SHARED_EVAL_CACHE = EvalCache()
+
+DEFAULT_WEIGHTS: Mapping[str, float] = MappingProxyType({
+    "disc_diff": 1.0,
+    "mobility": 5.0,
+    "corner_occupancy": 25.0,
+    "corner_adj": 10.0,
+    "frontier": 2.0,
+    "stability": 10.0,
+})
+
+
+class Evaluator:
+    def __init__(self, weights: Dict[str, float] | None = None,
+                 cache: Optional[EvalCache] = SHARED_EVAL_CACHE) -> None:
+        self.cache = cache  # None disables caching
+        self.weights = weights or DEFAULT_WEIGHTS
+
+    @property
+    def weights(self) -> Mapping[str, float]:
+        return self._weights
+
+    @weights.setter
+    def weights(self, weights: Mapping[str, float]) -> None:
+        # read-only copy: weights change only by assignment, which re-keys the cache
+        self._weights = MappingProxyType(dict(weights))
+        self.fingerprint = hash(tuple(sorted(self._weights.items()))) & MASK64
+
     def evaluate(self, board: Board, player: int) -> float:
         """Compute board evaluation based on weighted feature sum."""
-        feats = extract_features(board)
-        score = sum(self.weights.get(k, 0.0) * v for k, v in feats.items())
+        cache = self.cache
+        if cache is not None:
+            key = board.zobrist() ^ self.fingerprint
+            score = cache.get(key)
+            if score is None:
+                score = self._score(board)
+                cache.put(key, score)
+        else:
+            score = self._score(board)
         return float(score if player == BLACK else -score)
+
+    def _score(self, board: Board) -> float:
+        feats = extract_features(board)
+        return float(sum(self._weights.get(k, 0.0) * v for k, v in feats.items()))
@@ -1,6 +1,10 @@
 from __future__ import annotations
 from typing import Dict
 from app.core.engine.board import Board, BLACK, WHITE, EMPTY
+from app.core.engine.stability import stability
+
+# Every key extract_features returns, i.e. the weights an Evaluator can use.
+FEATURE_NAMES = ["disc_diff", "mobility", "corner_occupancy", "corner_adj", "frontier", "stability"]
 
 def extract_features(board: Board) -> Dict[str, float]:
     """Return a dictionary of board features used for evaluation."""
@@ -36,21 +40,10 @@ def extract_features(board: Board) -> Dict[str, float]:
             adj_penalty += 1
     feats["corner_adj"] = adj_penalty
 
-    frontier_black = frontier_white = 0
-    dirs = [(-1,-1),(-1,0),(-1,1),(0,-1),(0,1),(1,-1),(1,0),(1,1)]
-    for r in range(board.size):
-        for c in range(board.size):
-            v = board.get(r,c)
-            if v == EMPTY:
-                continue
-            for dr,dc in dirs:
-                rr,cc = r+dr,c+dc
-                if board.inside(rr,cc) and board.get(rr,cc) == EMPTY:
-                    if v == BLACK:
-                        frontier_black += 1
-                    elif v == WHITE:
-                        frontier_white += 1
-                    break
+    frontier_black, frontier_white = board.frontier()
     feats["frontier"] = frontier_white - frontier_black
 
+    stable_black, stable_white = stability(board)
+    feats["stability"] = stable_black - stable_white
+
     return feats
@@ -1,8 +1,27 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.api.v1 import routes_game, routes_training
+from app.api.services.metrics import SEARCH_METRICS
+from app.api.services.training_jobs import TRAINING_JOBS
+from app.api.services.weight_registry import WEIGHT_REGISTRY
 
-app = FastAPI(title="AI Othello API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # load the active trained weights before serving, then follow promotions made elsewhere;
+    # training jobs a previous shutdown interrupted are queued again
+    WEIGHT_REGISTRY.watch()
+    if getattr(app.state, "recover_training_jobs", True):
+        TRAINING_JOBS.recover()
+    yield
+    # stops the running job after its current game instead of blocking exit until it ends
+    TRAINING_JOBS.shutdown()
+    WEIGHT_REGISTRY.stop()
+
+
+app = FastAPI(title="AI Othello API", lifespan=lifespan)
 
 origins = [
     "http://localhost:3000",  
@@ -23,3 +42,8 @@ app.include_router(routes_training.router, prefix="/api/v1/training", tags=["Tra
 @app.get("/", tags=["Health"])
 def root():
     return {"message": "Backend running", "status": "ok"}
+
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+def metrics():
+    """Search counters per agent in Prometheus text exposition format."""
+    return PlainTextResponse(SEARCH_METRICS.render(), media_type="text/plain; version=0.0.4")
@@ -17,7 +17,6 @@ except Exception:
 
 VALIDATION_LOG = "app/logs/validation/validation_summary.json"
 OUTPUT_DIR = "app/logs/validation/plots"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 def load_results():
     if not os.path.exists(VALIDATION_LOG):
@@ -42,6 +41,8 @@ def analyze():
         win_rates.append(wr)
         avg_diffs.append(result["avg_score_diff"])
 
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
     # Plot 1: Win rates
     plt.figure(figsize=(6, 4))
     plt.bar(opponents, win_rates)
@@ -0,0 +1,75 @@
+import argparse
+import random
+from app.api.services.selfplay import play_game
+from app.bench.positions import POSITIONS, load_position
+from app.core.ai.minimax_agent import MinimaxAgent, PROBCUT_T
+from app.core.eval.evaluator import Evaluator, EvalCache
+
+CONFIGS = {
+    "plain": {},
+    "lmr": {"lmr": True},
+    "probcut": {"probcut": True},
+    "both": {"lmr": True, "probcut": True},
+}
+
+
+def depth_reached(options, time_limit: float):
+    """Completed depth per benchmark position (endgames excluded: they finish early
+    either way) and the average nodes per search."""
+    depths, nodes = [], []
+    for name in POSITIONS:
+        if name.startswith("endgame"):
+            continue
+        b = load_position(name)
+        agent = MinimaxAgent(Evaluator(cache=EvalCache()), max_depth=30, time_limit=time_limit, **options)
+        agent.best_move(b, b.to_move)
+        depths.append(agent.last_stats.depth_reached)
+        nodes.append(agent.nodes_searched)
+    return depths, sum(nodes) / len(nodes)
+
+
+def match(options, pairs: int, time_limit: float, random_plies: int):
+    """`options` against plain search at the same time limit, each opening played with both colours.
+    Returns (wins, losses, draws, average disc differential) for the selective side."""
+    wins = losses = draws = 0
+    total = 0
+    for seed in range(pairs):
+        for selective_black in (True, False):
+            ev = Evaluator()
+            selective = MinimaxAgent(ev, max_depth=30, time_limit=time_limit, **options)
+            plain = MinimaxAgent(ev, max_depth=30, time_limit=time_limit)
+            black, white = (selective, plain) if selective_black else (plain, selective)
+            diff = int(play_game(black, white, seed, random_plies, random.Random(seed))["result"][-1])
+            diff = diff if selective_black else -diff
+            total += diff
+            wins += diff > 0
+            losses += diff < 0
+            draws += diff == 0
+    return wins, losses, draws, total / (2 * pairs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Depth gained and strength of ProbCut / LMR versus plain alpha-beta.")
+    parser.add_argument("--time", type=float, default=1.5, help="Time limit per move")
+    parser.add_argument("--configs", nargs="+", default=list(CONFIGS), choices=list(CONFIGS))
+    parser.add_argument("--probcut-t", type=float, nargs="+", default=[PROBCUT_T],
+                        help="ProbCut confidence thresholds to compare (sigmas)")
+    parser.add_argument("--pairs", type=int, default=0, help="Openings to play against plain search (x2 games)")
+    parser.add_argument("--random-plies", type=int, default=6, help="Random opening plies per game")
+    args = parser.parse_args()
+
+    for name in args.configs:
+        for t in (args.probcut_t if "probcut" in CONFIGS[name] else [None]):
+            options = dict(CONFIGS[name], **({"probcut_t": t} if t is not None else {}))
+            label = name if t is None else f"{name} t={t}"
+            depths, nodes = depth_reached(options, args.time)
+            line = (f"{label:16s} depth {sum(depths) / len(depths):5.2f} {depths}  "
+                    f"nodes {nodes:8.0f}")
+            if args.pairs and name != "plain":
+                w, l, d, diff = match(options, args.pairs, args.time, args.random_plies)
+                line += f"  vs plain +{w} -{l} ={d}  avg diff {diff:+.1f}"
+            print(line, flush=True)
+
+
+if __name__ == "__main__":
+    main()
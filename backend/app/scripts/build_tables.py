@@ -0,0 +1,21 @@
+import argparse
+from array import array
+from app.core.engine.table_file import TABLE_PATH, write_tables, read_tables
+from app.core.engine.tables import table_sections
+from app.core.engine import stability
+from app.core.engine.zobrist import generate_keys
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate the precomputed engine tables file.")
+    parser.add_argument("--out", default=TABLE_PATH, help="Output path")
+    args = parser.parse_args()
+
+    sections = {"zobrist": array("Q", generate_keys())}
+    sections.update(table_sections())
+    sections.update(stability.table_sections())
+    write_tables(sections, args.out)
+    read_tables.cache_clear()
+    print(f"Wrote {args.out}: " + ", ".join(f"{name} ({len(v)})" for name, v in read_tables(args.out).items()))
+
+if __name__ == "__main__":
+    main()
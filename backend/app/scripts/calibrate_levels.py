@@ -0,0 +1,25 @@
+import argparse
+from app.api.services.calibration import BUDGET_UNITS, CALIBRATION_PATH, calibrate, save_calibration, level_table
+from app.core.ai.registry import LEVELS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure what each strength level costs per move on this host.")
+    parser.add_argument("--agents", nargs="+", default=list(BUDGET_UNITS), choices=list(BUDGET_UNITS))
+    parser.add_argument("--levels", nargs="+", default=list(LEVELS), choices=list(LEVELS))
+    parser.add_argument("--out", default=CALIBRATION_PATH, help="Where to write the calibration")
+    args = parser.parse_args()
+
+    result = calibrate(args.agents, args.levels)
+    save_calibration(result, args.out)
+    for name, entry in result["agents"].items():
+        print(f"{name}: {entry['rate']:.0f} {entry['unit']}/s")
+        for level, row in entry["levels"].items():
+            print(f"  {level:8s} {row['budget']:6d} {entry['unit']:11s} "
+                  f"mean {row['mean_seconds']:.3f}s  max {row['max_seconds']:.3f}s")
+    print("expected seconds per move:", {level: row["expected_seconds"] for level, row in level_table(result).items()})
+    print(f"Written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import argparse
+from app.api.services.match_runner import MatchRunner
+from app.core.ai.mcts_agent import MCTSAgent
+from app.core.eval.evaluator import Evaluator
+
+def main():
+    parser = argparse.ArgumentParser(description="Play an MCTS variant against the default MCTSAgent")
+    parser.add_argument("--games", type=int, default=4, help="Games per colour")
+    parser.add_argument("--time", type=float, default=0.5, help="Time limit per move")
+    parser.add_argument("--rollout-depth", type=int, default=None, help="Truncate rollouts after N plies")
+    parser.add_argument("--eval-scale", type=float, default=20.0, help="Evaluator units per sigmoid logit")
+    parser.add_argument("--rave", action="store_true", help="Use RAVE/AMAF statistics")
+    parser.add_argument("--rave-k", type=float, default=500.0, help="RAVE equivalence parameter")
+    parser.add_argument("--batch", type=int, default=0, help="Batched NumPy rollouts per expansion")
+    args = parser.parse_args()
+
+    ev = Evaluator()
+
+    def variant():
+        return MCTSAgent(ev, simulations=None, time_limit=args.time, rollout_depth=args.rollout_depth,
+                         eval_scale=args.eval_scale, rave=args.rave, rave_k=args.rave_k,
+                         batch_rollouts=args.batch)
+
+    def baseline():
+        return MCTSAgent(ev, simulations=None, time_limit=args.time)
+
+    wins = draws = 0
+    for black, white, variant_is_black in ((variant(), baseline(), True), (baseline(), variant(), False)):
+        a1, a2 = ("variant", "baseline") if variant_is_black else ("baseline", "variant")
+        res = MatchRunner(a1, a2, games=args.games, log=False, agent1=black, agent2=white).run()
+        wins += res["wins"]["variant"]
+        draws += res["wins"]["draws"]
+        print(f"{a1} (Black) vs {a2} (White): {res['wins']} | avg diff {res['avg_score_diff']:.2f}")
+        print(f"  sims: variant {res['search_stats']['variant']['simulations']:.0f}, "
+              f"baseline {res['search_stats']['baseline']['simulations']:.0f}")
+
+    total = 2 * args.games
+    print(f"\nVariant score: {wins + 0.5 * draws}/{total} ({100 * (wins + 0.5 * draws) / total:.0f}%)")
+
+if __name__ == "__main__":
+    main()
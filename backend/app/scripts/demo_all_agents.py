@@ -10,13 +10,12 @@ from app.core.ai.mcts_agent import MCTSAgent
 from app.core.ai.hybrid_agent import HybridAgent
 
 LOG_DIR = "app/logs"
-os.makedirs(LOG_DIR, exist_ok=True)
 
 def print_board(b: Board) -> str:
     """Return board as printable string."""
     s = "\n   " + " ".join(str(c) for c in range(b.size)) + "\n"
     for r in range(b.size):
-        row = " ".join({0: ".", 1: "B", -1: "W"}[b.grid[r][c]] for c in range(b.size))
+        row = " ".join({0: ".", 1: "B", -1: "W"}[b.get(r, c)] for c in range(b.size))
         s += f"{r}  {row}\n"
     return s
 
@@ -56,6 +55,7 @@ def main():
 
     for name, agent in agents.items():
         lines = run_match(name, agent)
+        os.makedirs(LOG_DIR, exist_ok=True)
         fname = f"{LOG_DIR}/{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
         with open(fname, "w") as f:
             f.writelines(lines)
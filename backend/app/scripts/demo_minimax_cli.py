@@ -6,7 +6,7 @@ import time
 def print_board(b: Board):
     print("\n   " + " ".join(str(c) for c in range(b.size)))
     for r in range(b.size):
-        row = " ".join({0: ".", 1: "B", -1: "W"}[b.grid[r][c]] for c in range(b.size))
+        row = " ".join({0: ".", 1: "B", -1: "W"}[b.get(r, c)] for c in range(b.size))
         print(f"{r}  {row}")
     print()
 
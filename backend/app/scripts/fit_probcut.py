@@ -0,0 +1,72 @@
+import argparse
+import json
+import random
+import time
+from app.api.services.selfplay import DATA_DIR, open_shards
+from app.core.ai.minimax_agent import MinimaxAgent
+from app.core.ai.probcut import PROBCUT_PATH, CUT_PAIRS, fit_params, stage_of, weights_fingerprint
+from app.core.engine.batch_rollout import bits_to_board
+from app.core.engine.board import Board, BLACK
+from app.core.eval.evaluator import Evaluator, EvalCache
+
+
+def sample_positions(count: int, data_dir: str, seed: int):
+    """Positions from the self-play shards if there are any, otherwise from random games."""
+    rng = random.Random(seed)
+    shards = open_shards(data_dir)
+    if shards:
+        records = [(shard, i) for shard in shards for i in range(len(shard))]
+        for shard, i in rng.sample(records, min(count, len(records))):
+            r = shard[i]
+            yield bits_to_board(int(r["black"]), int(r["white"]), int(r["to_move"]))
+        return
+    for _ in range(count):
+        b = Board()
+        for _ in range(rng.randrange(0, 58)):
+            moves = b.legal_moves(b.to_move)
+            if not moves and b.is_terminal():
+                break
+            b.apply_move(rng.choice(moves) if moves else None, b.to_move)
+        if not b.is_terminal():
+            yield b
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit Multi-ProbCut models (deep vs shallow search values).")
+    parser.add_argument("--positions", type=int, default=300, help="Positions to search")
+    parser.add_argument("--data", default=DATA_DIR, help="Self-play shard directory to sample from")
+    parser.add_argument("--out", default=PROBCUT_PATH, help="Where to write the fitted models")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    max_depth = max(CUT_PAIRS)
+    evaluator = Evaluator(cache=EvalCache())
+    samples = {}
+    start = time.time()
+    for n, board in enumerate(sample_positions(args.positions, args.data, args.seed), 1):
+        player = board.to_move
+        if not board.legal_moves(player):
+            continue
+        values = {}
+        # plain iterative deepening: one search yields the exact value at every depth
+        agent = MinimaxAgent(evaluator, max_depth=max_depth,
+                             on_iteration=lambda info: values.__setitem__(info["depth"], info["score"] * player))
+        agent.best_move(board, player)
+        samples.setdefault(stage_of(board), []).append(values)
+        if n % 25 == 0:
+            print(f"{n} positions, {time.time() - start:.0f}s")
+
+    params = fit_params(samples)
+    params["positions"] = sum(map(len, samples.values()))
+    # the models only hold for these weights; MinimaxAgent ignores them under others
+    params["weights"] = weights_fingerprint(evaluator.weights)
+    with open(args.out, "w") as f:
+        json.dump(params, f, indent=2)
+    for d, entry in params["depths"].items():
+        print(f"depth {d} <- {entry['shallow']}: " +
+              ", ".join(f"a={a:.2f} b={b:.2f} sigma={s:.2f}" for a, b, s in entry["stages"]))
+    print(f"Written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
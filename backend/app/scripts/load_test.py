@@ -0,0 +1,43 @@
+import argparse
+import json
+import os
+import time
+from app.bench.loadtest import parse_setting, run_load_test
+
+LOG_DIR = "app/logs/loadtest"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent full games against the game API, with latency percentiles.")
+    parser.add_argument("--clients", type=int, default=4, help="Concurrent clients")
+    parser.add_argument("--games", type=int, default=2, help="Games per client")
+    parser.add_argument("--agents", nargs="+", default=["minimax:easy", "minimax:medium", "mcts:easy", "greedy"],
+                        help="AI settings to draw from per game, as agent[:level[:time cap]]")
+    parser.add_argument("--time", type=float, default=1.5, help="Time cap per AI move where a setting has none")
+    parser.add_argument("--url", default=None, help="Running server to test (default: serve the app in-process)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="Results JSON (default: app/logs/loadtest/loadtest_<time>.json)")
+    args = parser.parse_args()
+
+    settings = [parse_setting(s, args.time) for s in args.agents]
+    result = run_load_test(args.clients, args.games, settings, url=args.url, seed=args.seed)
+
+    out = args.out or os.path.join(LOG_DIR, f"loadtest_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(result, f, indent=2)
+
+    print(f"{result['games']} games, {result['requests']} requests in {result['seconds']:.1f}s: "
+          f"{result['requests_per_sec']:.1f} req/s, {result['games_per_sec']:.2f} games/s")
+    for name, e in result["endpoints"].items():
+        print(f"  {name:8s} n={e['requests']:5d} err={e['errors']:3d}  p50 {e['p50'] * 1000:7.1f}ms  "
+              f"p95 {e['p95'] * 1000:7.1f}ms  p99 {e['p99'] * 1000:7.1f}ms")
+    if "process" in result:
+        p = result["process"]
+        print(f"  cpu {p['cpu_utilisation']:.2f} cores, rss +{p['rss_growth_bytes'] / 1e6:.1f} MB, "
+              f"{p['games_stored']} games held in GAMES")
+    print(f"Written to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import argparse
+from app.api.services.profiling import MODES, PROFILE_DIR, run_profiled
+from app.bench.positions import POSITIONS, load_position
+from app.core.ai.registry import DEFAULT_LEVEL, LEVELS, make_agent
+from app.core.eval.evaluator import Evaluator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile one search of a benchmark position.")
+    parser.add_argument("--agent", default="minimax")
+    parser.add_argument("--level", default=DEFAULT_LEVEL, choices=list(LEVELS))
+    parser.add_argument("--position", default="midgame_1", choices=list(POSITIONS))
+    parser.add_argument("--mode", default="cprofile", choices=list(MODES))
+    parser.add_argument("--out", default=PROFILE_DIR, help="Directory for the artifacts")
+    args = parser.parse_args()
+
+    board = load_position(args.position)
+    agent = make_agent(args.agent, Evaluator(), args.level)
+    (move, score), report = run_profiled(lambda: agent.best_move(board, board.to_move), args.mode,
+                                         {"agent": args.agent, "level": args.level, "position": args.position},
+                                         out_dir=args.out)
+    print(f"move {move} score {score:.2f} in {report['seconds']:.3f}s")
+    for row in report["top"]:
+        print("  ", "  ".join(f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}" for k, v in row.items()))
+    print(f"Written to {report['artifact']}")
+
+
+if __name__ == "__main__":
+    main()
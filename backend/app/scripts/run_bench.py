@@ -0,0 +1,49 @@
+import argparse
+import json
+import os
+import sys
+from app.bench import run_all, compare
+from app.bench.runner import DEFAULT_TOLERANCE
+
+BASELINE = "app/bench/baseline.json"
+
+def main():
+    parser = argparse.ArgumentParser(description="Engine benchmarks: perft, fixed-depth search, MCTS, evaluator")
+    parser.add_argument("--quick", action="store_true", help="Smaller workloads for a smoke run")
+    parser.add_argument("--out", help="Write results JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed rate slowdown (fraction)")
+    parser.add_argument("--update-baseline", action="store_true", help="Overwrite the baseline with these results")
+    args = parser.parse_args()
+
+    results = run_all(quick=args.quick)
+    print(json.dumps({k: v for k, v in results.items() if k != "search"}, indent=2))
+    print(f"search: depth {results['search']['depth']}, {results['search']['nodes']} nodes, "
+          f"{results['search']['nps']:.0f} nps")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline first.")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    problems = compare(results, baseline, args.tolerance)
+    if problems:
+        print("\n=== PERFORMANCE REGRESSIONS ===")
+        for p in problems:
+            print(f" - {p}")
+        return 1
+    print("\nNo regressions against baseline.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,26 @@
 import argparse
 from app.api.services.match_runner import MatchRunner
+from app.core.ai.registry import DEFAULT_LEVEL, LEVELS
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--a1", required=True, help="Agent 1 name (black)")
     parser.add_argument("--a2", required=True, help="Agent 2 name (white)")
     parser.add_argument("--games", type=int, default=5, help="Number of games")
-    parser.add_argument("--time", type=float, default=1.5, help="Time limit per move")
+    parser.add_argument("--level", default=DEFAULT_LEVEL, choices=list(LEVELS), help="Search budget per move")
+    parser.add_argument("--time", type=float, default=1.5, help="Time cap per move")
+    parser.add_argument("--game-time", type=float, default=None, help="Clock per agent per game (overrides --time)")
+    parser.add_argument("--increment", type=float, default=0.0, help="Seconds added to the clock after each move")
+    parser.add_argument("--log-verbosity", choices=["summary", "games", "moves"], default="games",
+                        help="Events written to the run's JSONL log")
     args = parser.parse_args()
 
-    runner = MatchRunner(args.a1, args.a2, games=args.games, time_limit=args.time)
+    runner = MatchRunner(args.a1, args.a2, games=args.games, time_limit=args.time, level=args.level,
+                         game_time=args.game_time, increment=args.increment, log_verbosity=args.log_verbosity)
     results = runner.run()
     print("\n=== Match Summary ===")
     print(results)
+    print(f"Log: {runner.log_path}")
 
 if __name__ == "__main__":
     main()
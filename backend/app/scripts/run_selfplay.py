@@ -0,0 +1,29 @@
+import argparse
+from app.core.ai.registry import DEFAULT_LEVEL, LEVELS
+from app.api.services.selfplay import SelfPlayGenerator, DATA_DIR
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate self-play games as sharded binary records.")
+    parser.add_argument("--a1", default="minimax", help="Agent name (BLACK in even games)")
+    parser.add_argument("--a2", default=None, help="Opponent agent name (defaults to --a1)")
+    parser.add_argument("--games", type=int, default=100, help="Number of games")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--level", default=DEFAULT_LEVEL, choices=list(LEVELS), help="Search budget per move")
+    parser.add_argument("--time", type=float, default=None, help="Optional time cap per move")
+    parser.add_argument("--random-plies", type=int, default=4, help="Random opening plies per game")
+    parser.add_argument("--out", default=DATA_DIR, help="Output directory for the shards")
+    parser.add_argument("--shard-records", type=int, default=1 << 20, help="Records per shard file")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    gen = SelfPlayGenerator(args.a1, args.a2, games=args.games, workers=args.workers, level=args.level,
+                            time_limit=args.time,
+                            random_plies=args.random_plies, out_dir=args.out,
+                            shard_records=args.shard_records, seed=args.seed)
+    summary = gen.run()
+    print(f"{summary['games']} games, {summary['records']} positions in {summary['seconds']:.1f}s")
+    for path in summary["shards"]:
+        print(" ", path)
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,21 @@
-from app.api.services.trainer import GATrainer
+import argparse
+from app.api.services.trainer import make_trainer
 
 def main():
-    trainer = GATrainer(
-        base_agent="minimax",
-        opponent_agent="greedy",
-        population_size=6,
-        generations=4,
-    )
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--method", choices=["ga", "cmaes"], default="ga", help="Weight search algorithm")
+    parser.add_argument("--generations", type=int, default=4)
+    parser.add_argument("--features", nargs="+", default=None, help="cmaes: features to tune (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="cmaes: parallel evaluation processes")
+    parser.add_argument("--fresh", action="store_true", help="cmaes: ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    if args.method == "ga":
+        trainer = make_trainer("ga", base_agent="minimax", opponent_agent="greedy",
+                               population_size=6, generations=args.generations)
+    else:
+        trainer = make_trainer("cmaes", base_agent="minimax", opponent_agent="greedy", features=args.features,
+                               generations=args.generations, workers=args.workers, resume=not args.fresh)
     best = trainer.train()
     print("\nFinal optimized weights:", best)
 
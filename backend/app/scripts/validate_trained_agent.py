@@ -2,22 +2,10 @@ from __future__ import annotations
 import json
 import os
 from app.api.services.match_runner import MatchRunner
-from app.core.eval.evaluator import Evaluator
+from app.api.services.validate_agent import load_trained_evaluator
 from app.core.ai.minimax_agent import MinimaxAgent
 
 LOG_DIR = "app/logs/validation"
-TRAINED_WEIGHTS = "app/logs/training/trained_weights.json"
-os.makedirs(LOG_DIR, exist_ok=True)
-
-def load_trained_evaluator() -> Evaluator:
-    if not os.path.exists(TRAINED_WEIGHTS):
-        raise FileNotFoundError(f"Missing {TRAINED_WEIGHTS}")
-    with open(TRAINED_WEIGHTS, "r") as f:
-        weights = json.load(f)
-
-    # Evaluator now expects dict-based weights
-    ev = Evaluator(weights=weights)
-    return ev
 
 def validate_agent():
     print("\n=== VALIDATING TRAINED AGENT ===")
@@ -36,6 +24,7 @@ def validate_agent():
         results_summary[opp] = res
         print(f"Result: {res['wins']} | Avg diff: {res['avg_score_diff']:.2f}")
 
+    os.makedirs(LOG_DIR, exist_ok=True)
     summary_path = f"{LOG_DIR}/validation_summary.json"
     with open(summary_path, "w") as f:
         json.dump(results_summary, f, indent=4)
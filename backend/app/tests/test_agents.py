@@ -1,4 +1,5 @@
-from app.core.engine.board import Board, BLACK
+import pytest
+from app.core.engine.board import Board, BLACK, WHITE
 from app.core.ai.random_agent import RandomAgent
 from app.core.ai.greedy_agent import GreedyAgent
 from app.core.ai.mcts_agent import MCTSAgent
@@ -11,3 +12,142 @@ def test_agents_basic():
     assert GreedyAgent(ev).best_move(b,BLACK)[0] in b.legal_moves(BLACK) or GreedyAgent(ev).best_move(b,BLACK)[0] is None
     mv, _ = MCTSAgent(evaluator=ev, simulations=50, time_limit=0.2).best_move(b,BLACK)
     assert mv in b.legal_moves(BLACK) or mv is None
+
+def test_random_playout_restores_board():
+    import random
+    from app.core.engine.playout import random_playout
+    b = Board()
+    b.apply_move(b.legal_moves(BLACK)[0], BLACK)
+    before, history = str(b), len(b.history)
+    winner, plies = random_playout(b, random.Random(7))
+    assert winner in (-1, 0, 1)
+    assert plies >= 55
+    assert str(b) == before and len(b.history) == history
+
+def test_mcts_leaves_board_untouched():
+    b = Board()
+    agent = MCTSAgent(simulations=60)
+    mv, _ = agent.best_move(b, BLACK)
+    assert mv in b.legal_moves(BLACK)
+    assert str(b) == str(Board()) and not b.history
+    assert agent.last_stats.simulations == 60
+    assert agent.last_stats.nodes <= 60
+
+def test_batched_rollouts_match_scalar_engine():
+    import numpy as np
+    from app.core.engine import batch_rollout as br
+    b = Board()
+    b.apply_move((2, 3), BLACK)
+    black, white = br.board_to_bits(b)
+    moves = br.legal_moves(np.array([white], dtype=np.uint64), np.array([black], dtype=np.uint64))
+    assert int(moves[0]) == sum(1 << (r * 8 + c) for r, c in b.legal_moves(b.to_move))
+    winners, plies = br.batch_random_playouts(b, 32, np.random.default_rng(0))
+    assert winners.shape == (32,) and set(winners.tolist()) <= {-1, 0, 1}
+    assert plies >= 32 * 55
+
+def test_mcts_with_batched_rollouts():
+    b = Board()
+    agent = MCTSAgent(simulations=10, batch_rollouts=16, seed=0)
+    mv, _ = agent.best_move(b, BLACK)
+    assert mv in b.legal_moves(BLACK)
+    assert agent.last_stats.simulations == 160
+
+def test_mcts_truncated_rollouts_and_rave():
+    b = Board()
+    agent = MCTSAgent(evaluator=Evaluator(), simulations=80, rollout_depth=6, rave=True)
+    mv, score = agent.best_move(b, BLACK)
+    assert mv in b.legal_moves(BLACK)
+    assert 0.0 <= score <= 1.0
+    assert agent.last_stats.rollout_plies <= 80 * 6
+    assert agent.last_stats.leaf_evals > 0
+    assert str(b) == str(Board())
+
+def test_amaf_credits_later_moves():
+    from app.core.ai.mcts_agent import MCTSNode
+    root = MCTSNode(None, None, -BLACK)
+    a = root.children[(2, 3)] = MCTSNode(root, (2, 3), BLACK)
+    c = root.children[(3, 2)] = MCTSNode(root, (3, 2), BLACK)
+    agent = MCTSAgent(rave=True)
+    # black played (3,2) later in a playout that started with (2,3)
+    agent._update_amaf([root, a], [(BLACK, (2, 3)), (-BLACK, (2, 2)), (BLACK, (3, 2))], 1.0)
+    assert a.amaf_visits == 1 and c.amaf_visits == 1 and c.amaf_wins == 1.0
+
+
+def test_registry_imports_agents_lazily():
+    from app.core.ai.registry import agent_class
+    from app.core.ai.mcts_agent import MCTSAgent
+    assert agent_class("MCTS") is MCTSAgent
+    assert agent_class("nope") is None
+
+    # a fresh interpreter: starting the API must not import the agents or the bench runner
+    import subprocess
+    import sys
+    code = ("import sys, app.main; print(sorted(m for m in sys.modules if m.endswith('mcts_agent') "
+            "or m in ('numpy', 'app.bench.runner')))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_mcts_skips_rollouts_once_stable_discs_decide_the_game():
+    b = Board()
+    # 33 stable BLACK discs (the top four rows and a5) win whatever happens on the other 20 squares
+    for sq in range(33):
+        b._put(sq, BLACK)
+    for sq in [40] + list(range(56, 64)):
+        b._put(sq, WHITE)
+    agent = MCTSAgent(simulations=50, seed=1)
+    agent.best_move(b, BLACK)
+    assert agent.last_stats.bound_results > 0
+
+
+def test_strength_levels_are_node_budgets():
+    from app.core.ai.registry import LEVELS, make_agent
+    from app.core.ai.minimax_agent import MinimaxAgent
+    from app.api.services.calibration import level_table
+    b = Board()
+    b.apply_move((2, 3), BLACK)
+    runs = []
+    for _ in range(2):
+        agent = make_agent("minimax_ga", Evaluator(), "easy")
+        assert isinstance(agent, MinimaxAgent)
+        runs.append((agent.best_move(b, WHITE), agent.nodes_searched))
+    assert runs[0] == runs[1] and runs[0][1] <= LEVELS["easy"]["nodes"]
+
+    mcts = make_agent("mcts", Evaluator(), "easy")
+    mcts.best_move(b, WHITE)
+    assert mcts.last_stats.simulations == LEVELS["easy"]["simulations"]
+    with pytest.raises(ValueError):
+        make_agent("minimax", Evaluator(), "grandmaster")
+
+    calibration = {"agents": {"minimax": {"unit": "nodes", "rate": 1000.0,
+                                          "levels": {"easy": {"mean_seconds": 0.5}}}}}
+    table = level_table(calibration)
+    assert table["easy"]["expected_seconds"] == {"minimax": 0.5}
+    assert table["hard"]["expected_seconds"] == {"minimax": LEVELS["hard"]["nodes"] / 1000.0}
+    assert level_table(None)["medium"]["expected_seconds"] == {}
+
+
+def test_unbounded_mcts_budgets_are_rejected():
+    from app.core.ai.hybrid_agent import HybridAgent
+    b = Board()
+    # no time limit: the default playout budget still ends the search
+    agent = HybridAgent(Evaluator(), use_mcts=True, time_limit=None)
+    assert agent.best_move(b, BLACK)[0] in b.legal_moves(BLACK)
+    assert agent.mcts.last_stats.simulations == 500
+    with pytest.raises(ValueError):
+        HybridAgent(Evaluator(), use_mcts=True, time_limit=None, simulations=None)
+    with pytest.raises(ValueError):
+        MCTSAgent(simulations=None).best_move(b, BLACK)
+
+
+def test_hybrid_spends_both_level_budgets_and_plays_a_minimax_line():
+    from app.core.ai.registry import LEVELS, make_agent
+    b = Board()
+    agent = make_agent("hybrid", Evaluator(), "easy")
+    mv, _ = agent.best_move(b, BLACK)
+    assert agent.mcts.last_stats.simulations == LEVELS["easy"]["simulations"]
+    assert 0 < agent.minimax.last_stats.nodes <= LEVELS["easy"]["nodes"]
+    assert mv in [line["move"] for line in agent.minimax.lines]
+    timed = make_agent("hybrid", Evaluator(), "expert", time_limit=0.4)
+    timed.best_move(b, BLACK)
+    assert timed.mcts.last_stats.time_total < 0.4 * 0.5
@@ -29,3 +29,133 @@ def test_full_game_playthrough():
         assert moves, "Player should have at least one legal move"
         b.apply_move(moves[0], b.to_move)
     assert not b.is_terminal()
+
+
+def test_flat_cells_match_reference_rules():
+    import random
+    from app.core.engine.rules import get_flips
+    rng = random.Random(3)
+    b = Board()
+    for _ in range(40):
+        grid = b.grid
+        expected = [(r, c) for r in range(8) for c in range(8) if get_flips(grid, r, c, b.to_move)]
+        assert b.legal_moves(b.to_move) == expected
+        if not expected:
+            b.apply_move(None, b.to_move)
+            continue
+        b.apply_move(rng.choice(expected), b.to_move)
+    assert b.grid == [b.cells[r * 8:r * 8 + 8] for r in range(8)]
+    snapshot = b.copy()
+    b.grid = snapshot.grid
+    assert b.legal_moves(BLACK) == snapshot.legal_moves(BLACK)
+    assert b.zobrist() == snapshot.zobrist()
+
+
+def _assert_counts_consistent(b):
+    from app.core.engine.tables import NEIGHBOURS
+    cells = b.cells
+    assert b.score() == (cells.count(BLACK), cells.count(WHITE))
+    assert b.empty_count() == cells.count(EMPTY)
+    assert b.empty_mask == sum(1 << sq for sq, v in enumerate(cells) if v == EMPTY)
+    front = [sq for sq, v in enumerate(cells) if v != EMPTY and any(cells[n] == EMPTY for n in NEIGHBOURS[sq])]
+    assert b.frontier() == (sum(cells[sq] == BLACK for sq in front), sum(cells[sq] == WHITE for sq in front))
+
+
+def test_incremental_counts_match_a_full_scan():
+    import random
+    rng = random.Random(11)
+    b = Board()
+    while not b.is_terminal():
+        moves = b.legal_moves(b.to_move)
+        move = rng.choice(moves) if moves else None
+        b.apply_move(move, b.to_move)
+        _assert_counts_consistent(b)
+        b.undo()
+        _assert_counts_consistent(b)
+        b.apply_move(move, b.to_move)
+        _assert_counts_consistent(b.copy())
+    assert b.empty_count() == 0 or not (b.legal_moves(BLACK) or b.legal_moves(WHITE))
+
+
+def test_history_copy_on_write():
+    b = Board()
+    b.apply_move((2, 3), BLACK)
+    assert b.history[0] == ((2, 3), [(3, 3)])
+    c = b.copy()
+    b.undo()
+    b.apply_move((4, 5), BLACK)
+    c.apply_move(c.legal_moves(WHITE)[0], WHITE)
+    assert len(b.history) == 1 and len(c.history) == 2
+    assert b.history[0][0] == (4, 5) and c.history[0][0] == (2, 3)
+    c.undo()
+    c.undo()
+    assert str(c) == str(Board())
+    b.apply_move(None, WHITE)
+    assert b.history[-1] == (None, [])
+
+
+def test_precomputed_tables_match_generators_and_leave_random_alone(tmp_path):
+    import importlib
+    import random
+    from app.core.engine import tables, zobrist
+    from app.core.engine.table_file import read_tables, write_tables
+    assert tables.RAYS == tables.build_rays()
+    assert tables.NEIGHBOURS == tables.build_neighbours()
+    assert [k for row in zobrist.ZOBRIST_TABLE for sq in row for k in sq] + [zobrist.ZOBRIST_SIDE] == zobrist.generate_keys()
+
+    random.seed(5)
+    expected = random.random()
+    random.seed(5)
+    importlib.reload(zobrist)
+    assert random.random() == expected
+
+    path = str(tmp_path / "t.bin")
+    write_tables(tables.table_sections(), path)
+    assert read_tables(path)["rays"] == tables.table_sections()["rays"]
+    assert read_tables(str(tmp_path / "missing.bin")) == {}
+
+
+def test_undo_restores_position_after_unplayed_pass():
+    # search recurses past a pass without playing it, so to_move is stale when the
+    # opponent's move is applied and undone
+    b = Board()
+    before = list(b.cells)
+    b.apply_move((2, 3), BLACK)
+    after_black = list(b.cells)
+    b.apply_move((2, 2), WHITE)
+    b.apply_move(b.legal_moves(WHITE)[0], WHITE)  # WHITE again, as after a BLACK pass the search didn't play
+    b.undo()
+    b.undo()
+    assert b.cells == after_black and b.to_move == WHITE
+    b.undo()
+    assert b.cells == before and b.to_move == BLACK
+
+
+def test_stable_discs_never_flip_and_black_mask_tracks_cells():
+    import random
+    from app.core.engine import stability
+    from app.core.engine.stability import EDGE_STABLE, build_edge_table, stable_discs, disc_bounds
+    assert EDGE_STABLE == build_edge_table()
+    assert EDGE_STABLE[1] == 0b1            # a lone corner disc
+    assert EDGE_STABLE[3 ** 1] == 0         # a lone disc next to the corner
+    assert EDGE_STABLE[3 ** 8 - 1] == 0xFF  # a full edge
+    assert stability.stability(Board()) == (0, 0)
+
+    rng = random.Random(7)
+    for _ in range(20):
+        b = Board()
+        positions = []
+        while not b.is_terminal():
+            moves = b.legal_moves(b.to_move)
+            b.apply_move(rng.choice(moves) if moves else None, b.to_move)
+            black = sum(1 << sq for sq, v in enumerate(b.cells) if v == BLACK)
+            white = sum(1 << sq for sq, v in enumerate(b.cells) if v == WHITE)
+            assert b.black_mask == black
+            positions.append((black, white, disc_bounds(b)))
+        final_black, final_white = b.score()
+        for black, white, (lo, hi) in positions:
+            stable_b, stable_w = stable_discs(black, white)
+            assert stable_b & ~black == 0 and stable_w & ~white == 0
+            assert b.black_mask & stable_b == stable_b
+            assert b.black_mask & stable_w == 0
+            assert lo <= final_black - final_white <= hi
@@ -0,0 +1,26 @@
+import time
+from app.core.ai.deadline import Deadline
+from app.core.ai.mcts_agent import MCTSAgent
+from app.core.engine.board import Board, BLACK
+
+def test_deadline_fires_close_to_budget():
+    d = Deadline(0.05)
+    calls = 0
+    while not d.expired():
+        calls += 1
+    overrun = d.elapsed() - 0.05
+    assert 0 <= overrun < 0.01
+    assert calls > 100
+
+def test_deadline_without_budget_only_stops_on_request():
+    d = Deadline(None)
+    assert not any(d.expired() for _ in range(10000))
+    d.stop()
+    assert d.expired()
+
+def test_mcts_respects_time_limit():
+    agent = MCTSAgent(simulations=10**9, time_limit=0.1)
+    start = time.perf_counter()
+    mv, _ = agent.best_move(Board(), BLACK)
+    assert time.perf_counter() - start < 0.25
+    assert mv in Board().legal_moves(BLACK)
@@ -0,0 +1,38 @@
+from app.core.engine.board import Board, BLACK, WHITE
+from app.core.engine.zobrist import compute_hash
+from app.core.eval.evaluator import Evaluator, EvalCache
+import pytest
+
+def test_incremental_hash_matches_full_hash():
+    b = Board()
+    for _ in range(10):
+        moves = b.legal_moves(b.to_move)
+        b.apply_move(moves[-1] if moves else None, b.to_move)
+        assert b.zobrist() == compute_hash(b.grid, b.to_move)
+    while b.history:
+        b.undo()
+    assert b.zobrist() == compute_hash(Board().grid, BLACK)
+
+def test_cache_hits_and_weight_changes():
+    cache = EvalCache(max_entries=4)
+    ev = Evaluator(cache=cache)
+    b = Board()
+    b.apply_move((2, 3), BLACK)
+    first = ev.evaluate(b, BLACK)
+    assert ev.evaluate(b, WHITE) == -first
+    assert cache.hits == 1 and cache.misses == 1
+    ev.weights = {"disc_diff": 2.0}
+    assert ev.evaluate(b, BLACK) == 2.0 * 3
+    assert cache.misses == 2
+
+def test_cache_is_bounded_and_weights_read_only():
+    cache = EvalCache(max_entries=2)
+    ev = Evaluator(cache=cache)
+    b = Board()
+    for mv in b.legal_moves(BLACK):
+        b.apply_move(mv, BLACK)
+        ev.evaluate(b, BLACK)
+        b.undo()
+    assert len(cache) == 2
+    with pytest.raises(TypeError):
+        ev.weights["mobility"] = 0.0
@@ -19,3 +19,40 @@ def test_time_limit_respected():
     elapsed = time.time() - start
     assert elapsed < 1.0  
     assert (mv is None) or (mv in b.legal_moves(BLACK))
+
+def test_iteration_info_reported_per_depth():
+    b = Board()
+    infos = []
+    agent = MinimaxAgent(evaluator=Evaluator(), max_depth=3, on_iteration=infos.append)
+    mv, score = agent.best_move(b, BLACK)
+    assert [i["depth"] for i in infos] == [1, 2, 3]
+    assert infos[-1]["move"] == mv
+    assert infos[-1]["score"] == score
+    assert len(infos[-1]["pv"]) == 3
+    assert infos[-1]["nodes"] == agent.nodes_searched
+
+def test_stop_returns_current_best():
+    b = Board()
+    agent = MinimaxAgent(evaluator=Evaluator(), max_depth=20)
+    agent.on_iteration = lambda info: agent.stop() if info["depth"] == 2 else None
+    mv, _ = agent.best_move(b, BLACK)
+    assert mv in b.legal_moves(BLACK)
+    assert str(b) == str(Board())
+
+
+def test_multi_pv_scores_match_separate_searches():
+    from app.bench.positions import load_position
+    b = load_position("midgame_1")
+    player = b.to_move
+    ev = Evaluator(cache=None)
+    lines = MinimaxAgent(ev, max_depth=3).analyze(b, player)
+    assert sorted(l["move"] for l in lines) == sorted(b.legal_moves(player))
+    assert lines[0]["move"] == MinimaxAgent(ev, max_depth=3).best_move(b, player)[0]
+    for line in lines:
+        b.apply_move(line["move"], player)
+        _, score = MinimaxAgent(ev, max_depth=2).best_move(b, -player)
+        b.undo()
+        assert line["score"] == score
+        assert line["pv"][0] == line["move"] and len(line["pv"]) <= 3
+    top2 = MinimaxAgent(ev, max_depth=3).analyze(b, player, k=2)
+    assert [l["score"] for l in top2] == [l["score"] for l in lines[:2]]
@@ -0,0 +1,33 @@
+from app.bench.loadtest import parse_setting, percentile, run_load_test
+
+
+def test_settings_and_percentiles():
+    assert parse_setting("mcts", 1.5) == ("mcts", "medium", 1.5)
+    assert parse_setting("minimax:hard:2", 1.5) == ("minimax", "hard", 2.0)
+    values = [i / 100 for i in range(1, 101)]
+    assert percentile(values, 50) == 0.5 and percentile(values, 99) == 0.99
+    assert percentile([3.0], 95) == 3.0 and percentile([], 50) == 0.0
+
+
+def test_in_process_load_test_plays_whole_games(tmp_path, monkeypatch):
+    from app.api.services.weight_registry import WEIGHT_REGISTRY
+    # the app's startup loads (and may import) trained weights; keep that out of the repo
+    monkeypatch.setattr(WEIGHT_REGISTRY, "weights_dir", str(tmp_path))
+    monkeypatch.setattr(WEIGHT_REGISTRY, "active_path", str(tmp_path / "ACTIVE"))
+    monkeypatch.setattr(WEIGHT_REGISTRY, "legacy_path", None)
+    from app.api.services.training_jobs import TRAINING_JOBS
+    from app.api.v1.routes_game import GAMES
+    recovered = []
+    monkeypatch.setattr(TRAINING_JOBS, "recover", lambda: recovered.append(True))
+    before = set(GAMES)
+    result = run_load_test(clients=2, games=1, settings=[("random", "easy", 1.0), ("greedy", "easy", 1.0)])
+    assert result["games"] == 2
+    assert all(e["errors"] == 0 for e in result["endpoints"].values())
+    assert result["endpoints"]["new"]["requests"] == 2
+    assert result["moves"] == result["endpoints"]["move"]["requests"] + result["endpoints"]["ai_move"]["requests"]
+    assert result["process"]["games_stored"] >= 2
+    # one request per ply: no extra pass is sent once the game is over
+    played = [GAMES[k] for k in GAMES if k not in before]
+    assert all(b.is_terminal() for b in played) and result["moves"] == sum(len(b.history) for b in played)
+    assert all(b.history[len(b.history) - 1][0] is not None for b in played)  # a game never ends on a pass
+    assert recovered == []
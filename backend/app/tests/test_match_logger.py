@@ -0,0 +1,34 @@
+import json
+from app.api.services.match_logger import MatchLogger
+from app.api.services.match_runner import MatchRunner
+
+
+def _events(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_match_runner_writes_one_jsonl_per_run(tmp_path):
+    runner = MatchRunner("random", "random", games=2, log_verbosity="moves", log_dir=str(tmp_path / "runs"))
+    results = runner.run()
+    events = _events(runner.log_path)
+    kinds = [e["event"] for e in events]
+    assert kinds.count("game") == 2 and kinds[-1] == "summary"
+    assert events[-1]["wins"] == results["wins"]
+    moves = [e for e in events if e["event"] == "move" and e["game"] == 1]
+    assert len(moves) == next(e for e in events if e["event"] == "game")["plies"]
+    assert [p.name for p in (tmp_path / "runs").iterdir()] == [runner.log_path.split("/")[-1]]
+
+
+def test_verbosity_filters_and_files_rotate(tmp_path):
+    runner = MatchRunner("random", "random", games=1, log_verbosity="summary", log_dir=str(tmp_path))
+    runner.run()
+    assert [e["event"] for e in _events(runner.log_path)] == ["summary"]
+
+    path = str(tmp_path / "big.jsonl")
+    with MatchLogger(path, "moves", max_bytes=200, batch_size=1) as logger:
+        for i in range(20):
+            logger.log({"event": "move", "ply": i, "pad": "x" * 20})
+    parts = [path] + [str(tmp_path / f"big.{n}.jsonl") for n in range(1, len(list(tmp_path.glob("big*"))))]
+    assert len(parts) > 1
+    assert [e["ply"] for p in parts for e in _events(p)] == list(range(20))
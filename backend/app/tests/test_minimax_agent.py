@@ -22,3 +22,46 @@ def test_minimax_play_sequence():
             assert mv in b.legal_moves(b.to_move)
             b.apply_move(mv, b.to_move)
     assert not b.is_terminal()
+
+def test_minimax_reports_search_stats():
+    b = Board()
+    agent = MinimaxAgent(evaluator=Evaluator(), max_depth=3)
+    agent.best_move(b, BLACK)
+    stats = agent.last_stats.to_dict()
+    assert stats["nodes"] == agent.nodes_searched > 0
+    assert stats["depth_reached"] == 3
+    assert stats["leaf_evals"] > 0
+    assert stats["tt_hits"] <= stats["tt_probes"]
+    assert stats["time_total"] >= stats["time_eval"] > 0
+
+def test_selective_search_prunes_and_stays_legal():
+    from app.bench.positions import load_position
+    from app.core.eval.evaluator import EvalCache
+    b = load_position("midgame_1")
+    nodes = {}
+    for name, options in {"plain": {}, "lmr": {"lmr": True}, "probcut": {"probcut": True}}.items():
+        agent = MinimaxAgent(Evaluator(cache=EvalCache()), max_depth=5, **options)
+        if name == "probcut":
+            # loose synthetic model (deep = shallow +- 1) so cuts certainly happen
+            agent.probcut_params = {d: (d - 2, [(1.0, 0.0, 1.0)] * 4) for d in (3, 4, 5)}
+        mv, _ = agent.best_move(b, b.to_move)
+        assert mv in b.legal_moves(b.to_move)
+        nodes[name] = agent.nodes_searched
+    assert nodes["lmr"] < nodes["plain"] and nodes["probcut"] < nodes["plain"]
+
+
+def test_probcut_fit_recovers_linear_model():
+    from app.core.ai.probcut import fit_line, fit_params, CUT_PAIRS
+    a, b, sigma = fit_line([0, 1, 2, 3], [1, 3, 5, 7])
+    assert (round(a, 9), round(b, 9), round(sigma, 9)) == (2, 1, 0)
+    samples = {0: [{d: 2.0 * i + 1 for d in range(1, 7)} for i in range(40)]}
+    params = fit_params(samples)
+    assert set(params["depths"]) == {str(d) for d in CUT_PAIRS}
+    assert params["depths"]["4"]["stages"][3] == params["depths"]["4"]["stages"][0]  # too few: pooled model
+
+
+def test_probcut_models_are_only_used_with_the_weights_they_were_fitted_with():
+    from app.core.eval.evaluator import DEFAULT_WEIGHTS
+    assert MinimaxAgent(Evaluator(), probcut=True).probcut_params  # shipped models match the defaults
+    other = dict(DEFAULT_WEIGHTS, stability=DEFAULT_WEIGHTS["stability"] + 1)
+    assert MinimaxAgent(Evaluator(weights=other), probcut=True).probcut_params == {}
@@ -0,0 +1,28 @@
+from app.bench.perft import perft, PERFT_REFERENCE
+from app.bench.positions import POSITIONS, load_position
+from app.bench.runner import compare
+from app.core.engine.board import Board
+
+def test_perft_matches_reference():
+    b = Board()
+    for depth in range(1, 6):
+        assert perft(b, depth) == PERFT_REFERENCE[depth]
+    assert str(b) == str(Board())
+
+def test_benchmark_positions_are_playable():
+    for name in POSITIONS:
+        b = load_position(name)
+        assert b.legal_moves(b.to_move), name
+
+def test_compare_flags_node_changes_and_slowdowns():
+    base = {
+        "meta": {"quick": True},
+        "perft": {"depth": 5, "nodes": 1396, "correct": True, "nps": 1000.0},
+        "search": {"nodes": 200, "nps": 1000.0},
+        "mcts": {"sims_per_sec": 100.0},
+        "eval": {"evals_per_sec": 1000.0},
+    }
+    assert compare(base, base) == []
+    slower = {**base, "search": {"nodes": 201, "nps": 500.0}}
+    problems = compare(slower, base)
+    assert len(problems) == 2
@@ -0,0 +1,74 @@
+import json
+import os
+import pytest
+import threading
+import time
+import tracemalloc
+from app.api.services import profiling
+from app.api.services.profiling import profile_mode, run_profiled
+from app.api.v1 import routes_game
+from app.core.ai.minimax_agent import MinimaxAgent
+from app.core.engine.board import Board
+from app.core.eval.evaluator import Evaluator
+
+
+def test_profile_mode_is_off_unless_asked(monkeypatch):
+    monkeypatch.delenv(profiling.PROFILE_ENV, raising=False)
+    assert profile_mode(None) is None
+    assert profile_mode("sample") == "sample"
+    monkeypatch.setenv(profiling.PROFILE_ENV, "memory")
+    assert profile_mode(None) == "memory"
+    with pytest.raises(ValueError):
+        profile_mode("perf")
+
+
+@pytest.mark.parametrize("mode", profiling.MODES)
+def test_run_profiled_writes_artifact_and_tags(tmp_path, mode):
+    b = Board()
+    agent = MinimaxAgent(Evaluator(), max_depth=4)
+    (move, _), report = run_profiled(lambda: agent.best_move(b, b.to_move), mode, {"agent": "minimax"},
+                                     out_dir=str(tmp_path))
+    assert move in b.legal_moves(b.to_move)
+    assert os.path.exists(report["artifact"]) and report["mode"] == mode
+    with open(report["artifact"].rsplit(".", 1)[0] + ".json") as f:
+        assert json.load(f)["tags"] == {"agent": "minimax"}
+    if mode == "cprofile":
+        assert any("alphabeta" in row["function"] for row in report["top"])
+    if mode == "memory":
+        assert report["peak_bytes"] >= report["current_bytes"] > 0
+
+
+def test_concurrent_memory_profiles_take_turns(tmp_path):
+    def search():
+        data = [bytes(1000) for _ in range(1000)]
+        time.sleep(0.05)
+        return len(data)
+
+    reports, errors = [], []
+
+    def run(i):
+        try:
+            reports.append(run_profiled(search, "memory", {"agent": "test"}, out_dir=str(tmp_path / str(i)))[1])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == [] and len(reports) == 4
+    assert all(r["peak_bytes"] >= 1000 * 1000 for r in reports)
+    assert not tracemalloc.is_tracing()
+
+
+def test_ai_move_returns_profile_only_when_asked(tmp_path, monkeypatch):
+    monkeypatch.delenv(profiling.PROFILE_ENV, raising=False)
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    game_id = routes_game.create_game()["game_id"]
+    plain = routes_game.ai_move(game_id, agent="greedy", level="easy", profile=None)
+    assert "profile" not in plain and not os.listdir(tmp_path)
+    profiled = routes_game.ai_move(game_id, agent="minimax", level="easy", profile="cprofile")
+    assert profiled["profile"]["tags"]["agent"] == "minimax"
+    assert len(profiled["profile"]["tags"]["position"]) == 64
+    routes_game.GAMES.pop(game_id)
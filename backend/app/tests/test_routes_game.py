@@ -0,0 +1,51 @@
+import time
+import pytest
+from fastapi import HTTPException
+from app.api.v1 import routes_game
+from app.core.ai.minimax_agent import MinimaxAgent
+from app.core.eval.evaluator import Evaluator
+
+
+def test_streamed_search_uses_a_copy_and_blocks_moves_until_done(monkeypatch):
+    # no node budget: the search runs until it is stopped
+    monkeypatch.setattr(routes_game, "make_agent", lambda name, evaluator, level, time_limit:
+                        MinimaxAgent(evaluator, max_depth=64, time_limit=time_limit))
+    game_id = routes_game.create_game()["game_id"]
+    before = routes_game.get_state(game_id)
+    routes_game.ai_move_stream(game_id, agent="minimax", time=60.0, profile=None)
+    try:
+        for call in (lambda: routes_game.make_move(game_id, {"row": 2, "col": 3}),
+                     lambda: routes_game.ai_move(game_id, agent="greedy", level="easy", profile=None),
+                     lambda: routes_game.ai_move_stream(game_id, agent="greedy", level="easy", profile=None)):
+            with pytest.raises(HTTPException) as e:
+                call()
+            assert e.value.status_code == 409
+        # the search doesn't touch the stored board
+        assert routes_game.get_state(game_id) == before
+        assert len(routes_game.analyze_position(game_id, depth=2, k=None, time=1.0)["lines"]) == 4
+    finally:
+        routes_game.stop_ai_move(game_id)
+        deadline = time.time() + 30
+        while game_id in routes_game.SEARCHES and time.time() < deadline:
+            time.sleep(0.01)
+    after = routes_game.get_state(game_id)
+    assert after["to_move"] != before["to_move"] and sum(after["pieces"].values()) == 5
+    routes_game.make_move(game_id, {})  # moves are accepted again
+    routes_game.GAMES.pop(game_id)
+
+
+def test_analysis_searches_a_copy_of_the_stored_board(monkeypatch):
+    searched = []
+
+    class Recording(MinimaxAgent):
+        def analyze(self, board, player, k=None):
+            searched.append(board)
+            return super().analyze(board, player, k)
+
+    monkeypatch.setattr(routes_game, "MinimaxAgent", Recording)
+    game_id = routes_game.create_game()["game_id"]
+    result = routes_game.analyze_position(game_id, depth=2, k=2, time=1.0)
+    assert len(result["lines"]) == 2
+    assert searched[0] is not routes_game.GAMES[game_id]
+    assert searched[0].cells == routes_game.GAMES[game_id].cells
+    routes_game.GAMES.pop(game_id)
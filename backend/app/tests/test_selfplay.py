@@ -0,0 +1,79 @@
+import numpy as np
+from app.api.services.selfplay import (
+    RECORD_DTYPE, ShardWriter, SelfPlayGenerator, open_shards, play_game,
+)
+from app.core.ai.mcts_agent import MCTSAgent
+from app.core.ai.random_agent import RandomAgent
+from app.core.engine.board import Board, BLACK
+from app.core.engine.batch_rollout import board_to_bits
+
+
+def test_records_replay_to_the_same_positions():
+    recs = play_game(RandomAgent(), RandomAgent(), game=3, random_plies=2)
+    assert RECORD_DTYPE.itemsize == 28
+    assert np.isnan(recs["score"][:2]).all() and not np.isnan(recs["score"][2:]).any()
+    b = Board()
+    for rec in recs:
+        assert (int(rec["black"]), int(rec["white"])) == board_to_bits(b)
+        assert rec["to_move"] == b.to_move
+        mv = None if rec["move"] < 0 else divmod(int(rec["move"]), 8)
+        b.apply_move(mv, b.to_move)
+    assert b.is_terminal()
+    black, white = b.score()
+    assert (recs["result"] == black - white).all() and (recs["game"] == 3).all()
+
+
+def test_shards_roll_over_append_and_memory_map(tmp_path):
+    recs = play_game(RandomAgent(), RandomAgent(), random_plies=60)
+    with ShardWriter(str(tmp_path), shard_records=50) as w:
+        w.write(recs)
+    with ShardWriter(str(tmp_path), shard_records=50) as w:
+        w.write(recs)
+    shards = open_shards(str(tmp_path))
+    assert [len(s) for s in shards[:-1]] == [50] * (len(shards) - 1)
+    assert np.concatenate(shards).tobytes() == np.concatenate([recs, recs]).tobytes()
+
+
+def test_generator_plays_every_game(tmp_path):
+    out = SelfPlayGenerator("random", "greedy", games=3, workers=1, games_per_task=2,
+                            out_dir=str(tmp_path)).run()
+    games = np.concatenate(open_shards(str(tmp_path)))["game"]
+    assert sorted(set(games.tolist())) == [0, 1, 2] and out["records"] == len(games)
+
+
+def test_appended_runs_continue_game_numbers_and_leave_global_rng_alone(tmp_path):
+    import random
+    random.seed(11)
+    expected = random.random()
+    random.seed(11)
+    first = SelfPlayGenerator("random", "greedy", games=2, workers=1, out_dir=str(tmp_path)).run()
+    MCTSAgent(simulations=20, seed=1).best_move(Board(), BLACK)
+    assert random.random() == expected
+    second = SelfPlayGenerator("random", "greedy", games=2, workers=1, out_dir=str(tmp_path)).run()
+    assert (first["first_game"], second["first_game"]) == (0, 2)
+    recs = np.concatenate(open_shards(str(tmp_path)))
+    assert sorted(set(recs["game"].tolist())) == [0, 1, 2, 3]
+    games = [recs[recs["game"] == g] for g in range(4)]
+    assert games[0]["move"].tobytes() != games[2]["move"].tobytes()
+
+
+def test_games_do_not_depend_on_how_they_are_batched(tmp_path):
+    runs = []
+    for per_task in (1, 3):
+        out = str(tmp_path / str(per_task))
+        SelfPlayGenerator("random", games=4, workers=1, random_plies=0, games_per_task=per_task, out_dir=out).run()
+        recs = np.concatenate(open_shards(out))
+        runs.append(recs[np.argsort(recs["game"], kind="stable")].tobytes())
+    assert runs[0] == runs[1]
+
+
+def test_partial_trailing_record_is_dropped(tmp_path):
+    recs = play_game(RandomAgent(), RandomAgent(), random_plies=60)
+    with ShardWriter(str(tmp_path)) as w:
+        w.write(recs)
+    with open(w.path(0), "ab") as f:
+        f.write(b"\0" * 5)  # a crash mid-write
+    assert np.concatenate(open_shards(str(tmp_path))).tobytes() == recs.tobytes()
+    with ShardWriter(str(tmp_path)) as w:
+        w.write(recs)
+    assert np.concatenate(open_shards(str(tmp_path))).tobytes() == np.concatenate([recs, recs]).tobytes()
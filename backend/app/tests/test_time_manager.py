@@ -0,0 +1,27 @@
+from app.core.ai.time_manager import TimeManager, predict_next_iteration
+from app.core.ai.minimax_agent import MinimaxAgent
+from app.core.eval.evaluator import Evaluator
+from app.core.engine.board import Board, BLACK
+
+def test_budget_shrinks_with_clock_and_grows_with_fewer_empties():
+    b = Board()
+    soft, hard = TimeManager(30.0).allocate(b)
+    assert 0 < soft <= hard <= 30.0 * 0.25
+    assert TimeManager(3.0).allocate(b)[0] < soft
+    late = Board()
+    late.grid = [[1] * 8 for _ in range(7)] + [[0] * 8]
+    assert TimeManager(30.0).allocate(late)[0] > soft
+
+def test_predict_uses_effective_branching_factor():
+    assert predict_next_iteration([], 10) == 0.0
+    assert predict_next_iteration([0.1], 4) == 0.4
+    assert abs(predict_next_iteration([0.1, 0.3], 10) - 0.9) < 1e-9
+
+def test_clock_is_charged_per_move():
+    tm = TimeManager(2.0, increment=0.1)
+    agent = MinimaxAgent(Evaluator(), max_depth=20, time_manager=tm)
+    b = Board()
+    mv, _ = agent.best_move(b, BLACK)
+    assert mv in b.legal_moves(BLACK)
+    assert tm.hard_limit <= 0.5
+    assert 1.5 < tm.remaining < 2.1
@@ -0,0 +1,70 @@
+import pytest
+from app.api.services.trainer import GATrainer
+
+
+def _trainer(**kw):
+    return GATrainer(base_agent="greedy", opponent_agent="random", population_size=6, **kw)
+
+
+def test_racing_spends_fewer_games_than_uniform_evaluation():
+    # the default budget is 2 games per candidate, which uniform evaluation spends on everyone
+    trainer = _trainer()
+    population = [trainer._random_weights() for _ in range(6)]
+    ranked = trainer._rank(population)
+    assert sorted(map(id, (w for w, _ in ranked))) == sorted(map(id, population))
+    assert 6 <= trainer.games_played < 6 * 2
+    survivors = [w for w, _ in ranked[:3]]
+    assert all(len(trainer._diffs[trainer._key(w)]) >= len(trainer._diffs[trainer._key(l)])
+               for w in survivors for l, _ in ranked[3:])
+    racing, uniform = _trainer(generations=3), _trainer(generations=3, racing=False)
+    racing.train(save=False)
+    uniform.train(save=False)
+    assert racing.games_played <= uniform.games_played <= 6 * 2 * 3
+
+
+def test_carried_over_candidates_keep_their_games():
+    trainer = _trainer(racing=False, max_games=2)
+    w = trainer._random_weights()
+    first = trainer._fitness(w)
+    played = trainer.games_played
+    assert trainer._fitness(dict(w)) == first and trainer.games_played == played == 2
+
+
+def test_cmaes_checkpoints_and_resumes(tmp_path):
+    from app.api.services.cmaes import CMAESTrainer
+    ckpt = str(tmp_path / "ckpt.json")
+    kw = dict(base_agent="greedy", opponent_agent="random", features=["mobility", "corner_occupancy"],
+              games=1, workers=1, checkpoint_path=ckpt)
+    first = CMAESTrainer(generations=1, **kw)
+    first.step()
+    first._save_checkpoint()
+    resumed = CMAESTrainer(generations=2, **kw)
+    assert resumed.generation == 1 and resumed.sigma == first.sigma
+    assert (resumed.C == first.C).all() and resumed.best_weights == first.best_weights
+    resumed.step()
+    assert resumed.generation == 2 and set(resumed.best_weights) == {"mobility", "corner_occupancy"}
+    assert CMAESTrainer(resume=False, **kw).generation == 0
+
+
+def test_cmaes_finished_or_mismatched_checkpoints_are_not_resumed(tmp_path):
+    from app.api.services.cmaes import CMAESTrainer
+    ckpt = str(tmp_path / "ckpt.json")
+    kw = dict(base_agent="greedy", opponent_agent="random", features=["mobility", "corner_occupancy"],
+              games=1, workers=1, checkpoint_path=ckpt)
+    done = CMAESTrainer(generations=1, **kw)
+    done.train(save=False)
+    again = CMAESTrainer(generations=1, **kw)
+    assert again.generation == 0 and again.games_played == 0
+    assert CMAESTrainer(generations=2, **kw).generation == 1  # extending a finished run still resumes
+    with pytest.raises(ValueError):
+        CMAESTrainer(generations=2, **dict(kw, games=3))
+    assert CMAESTrainer(generations=2, resume=False, **dict(kw, games=3)).generation == 0
+
+
+def test_fitness_games_of_one_candidate_differ():
+    # both agents deterministic: only the random opening plies tell the games apart
+    trainer = GATrainer(base_agent="greedy", opponent_agent="greedy", population_size=2)
+    w = trainer._random_weights()
+    diffs = trainer._play(w, 4)
+    assert len(set(diffs)) > 1
+    assert GATrainer(base_agent="greedy", opponent_agent="greedy")._play(w, 4) == diffs  # reproducible
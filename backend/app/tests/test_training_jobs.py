@@ -0,0 +1,85 @@
+import pytest
+from app.api.services.training_jobs import TrainingJobManager, QueueFull, DONE, CANCELLED, QUEUED
+from app.api.services.weight_registry import WeightRegistry
+
+
+@pytest.fixture
+def manager(tmp_path):
+    registry = WeightRegistry(str(tmp_path / "weights"), legacy_path=None)
+    m = TrainingJobManager(max_queued=2, cpu_cap=1, nice=0, jobs_dir=str(tmp_path / "jobs"), registry=registry)
+    yield m
+    m.shutdown()
+
+
+def test_job_runs_and_publishes_versioned_weights(manager, tmp_path):
+    params = dict(base_agent="greedy", opponent_agent="random", population_size=4, generations=1,
+                  racing=False, max_games=1)
+    job = manager.submit("ga", **params)
+    assert manager.submit("ga", **params)["id"] == job["id"]  # single flight
+    done = manager.wait(job["id"], timeout=120)
+    assert done["status"] == DONE and done["version"] == 1
+    assert done["progress"]["generation"] == 1 and done["progress"]["games_played"] == 4
+    published = manager.registry.load(1)
+    assert manager.registry.active_version == 1
+    assert manager.registry.active_weights() == published["weights"]
+    assert published["job"] == job["id"] and published["method"] == "ga"
+
+
+def test_queue_bound_and_cancel(manager):
+    slow = dict(base_agent="greedy", opponent_agent="random", population_size=4, generations=50)
+    first = manager.submit("ga", **slow)
+    second = manager.submit("ga", generations=51, **{k: v for k, v in slow.items() if k != "generations"})
+    with pytest.raises(QueueFull):
+        manager.submit("ga", generations=52)
+    assert manager.get(second["id"])["status"] == QUEUED
+    manager.cancel(second["id"])
+    manager.cancel(first["id"])
+    assert manager.wait(first["id"], timeout=120)["status"] == CANCELLED
+    assert manager.wait(second["id"], timeout=120)["status"] == CANCELLED
+    assert manager.registry.version_numbers() == []
+    with pytest.raises(ValueError):
+        manager.submit("annealing")
+
+
+def test_shutdown_interrupts_jobs_and_recover_requeues_them(tmp_path):
+    registry = WeightRegistry(str(tmp_path / "weights"), legacy_path=None)
+    kwargs = dict(max_queued=2, cpu_cap=1, nice=0, jobs_dir=str(tmp_path / "jobs"), registry=registry)
+    first = TrainingJobManager(**kwargs)
+    job = first.submit("ga", base_agent="greedy", opponent_agent="random", population_size=4, generations=50)
+    cmaes = first.submit("cmaes", base_agent="greedy", opponent_agent="random", popsize=4, generations=3, games=1)
+    checkpoint = cmaes["params"]["checkpoint_path"]
+    assert checkpoint.startswith(str(tmp_path / "jobs" / "checkpoints"))
+    first.shutdown()
+    assert first.get(job["id"])["status"] == QUEUED
+
+    second = TrainingJobManager(**kwargs)
+    try:
+        requeued = second.recover()
+        assert [j["id"] for j in requeued] == [job["id"], cmaes["id"]]
+        assert second.get(cmaes["id"])["params"]["checkpoint_path"] == checkpoint
+        # an identical submission still joins the recovered job
+        assert second.submit("ga", base_agent="greedy", opponent_agent="random", population_size=4,
+                             generations=50)["id"] == job["id"]
+        second.cancel(job["id"])
+        second.cancel(cmaes["id"])
+        assert second.wait(job["id"], timeout=120)["status"] == CANCELLED
+    finally:
+        second.shutdown()
+    assert TrainingJobManager(**kwargs).recover() == []
+
+
+def test_finish_updates_jobs_under_the_lock(manager, tmp_path):
+    import threading
+    from concurrent.futures import Future
+    job = {"id": "x", "method": "ga", "params": {}, "key": "x", "dir": str(tmp_path / "x"), "status": QUEUED,
+           "created": 0.0, "finished": None, "progress": None, "version": None, "error": None}
+    manager._jobs["x"] = job
+    future = Future()
+    future.set_result({"status": CANCELLED, "games_played": 0})
+    with manager._lock:
+        finisher = threading.Thread(target=manager._finish, args=("x", future))
+        finisher.start()
+        finisher.join(0.2)
+        assert finisher.is_alive() and job["status"] == QUEUED
+    finisher.join()
+    assert manager.get("x")["status"] == CANCELLED
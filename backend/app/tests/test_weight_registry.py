@@ -0,0 +1,38 @@
+import json
+import pytest
+from app.api.services.weight_registry import WeightRegistry
+
+
+def test_publish_promote_and_verify(tmp_path):
+    registry = WeightRegistry(str(tmp_path / "weights"), legacy_path=None)
+    assert registry.active() is None and not registry.refresh()
+    v1 = registry.publish({"mobility": 3, "frontier": -1}, method="ga", best_fitness=4.5, generation=5)
+    v2 = registry.publish({"mobility": 7}, promote=True)
+    assert (v1, v2) == (1, 2) and registry.active_version == 2
+    held = registry.active()
+    registry.promote(1)
+    assert registry.active() is not held and held.weights == {"mobility": 7.0}  # old evaluator untouched
+    assert registry.active().weights == {"mobility": 3.0, "frontier": -1.0}
+    meta = registry.versions()
+    assert [m["version"] for m in meta] == [1, 2] and meta[0]["active"] and "weights" not in meta[0]
+    assert meta[0]["best_fitness"] == 4.5 and len(meta[0]["sha256"]) == 64
+
+    record = json.loads((tmp_path / "weights" / "v0002.json").read_text())
+    record["weights"]["mobility"] = 8.0
+    (tmp_path / "weights" / "v0002.json").write_text(json.dumps(record))
+    with pytest.raises(ValueError):
+        registry.promote(2)
+    assert registry.active_version == 1
+
+
+def test_refresh_follows_other_processes_and_imports_legacy(tmp_path):
+    legacy = tmp_path / "trained_weights.json"
+    legacy.write_text(json.dumps({"corner_occupancy": 30.0}))
+    server = WeightRegistry(str(tmp_path / "weights"), legacy_path=str(legacy))
+    assert server.refresh() and server.active_version == 1
+    assert server.load(1)["method"] == "legacy"
+    assert not server.refresh()  # unchanged ACTIVE: nothing reloaded
+
+    trainer = WeightRegistry(str(tmp_path / "weights"), legacy_path=str(legacy))
+    trainer.publish({"corner_occupancy": 40.0}, promote=True)
+    assert server.refresh() and server.active().weights == {"corner_occupancy": 40.0}
@@ -169,8 +169,13 @@ export default function PlayPage() {
           <button
             onClick={async () => {
               try {
-                await fetch(`${BASE}/api/v1/training/train`, { method: "POST" });
-                alert("Training started (runs in background)");
+                const res = await fetch(`${BASE}/api/v1/training/train`, { method: "POST" });
+                if (res.status === 429) {
+                  alert("Training queue is full, try again later");
+                  return;
+                }
+                const { job_id } = await res.json();
+                alert(`Training job ${job_id} queued (runs in background)`);
               } catch (err) {
                 console.error("Training request failed", err);
                 alert("Failed to start training");
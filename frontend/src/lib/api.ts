@@ -54,3 +54,64 @@ export async function getState(gameId: string) {
   if (!res.ok) throw new Error("Failed to get state");
   return res.json();
 }
+
+export type SearchInfo = {
+  depth: number;
+  score: number;
+  move: [number, number] | null;
+  pv: ([number, number] | null)[];
+  nodes: number;
+  nps: number;
+  elapsed: number;
+};
+
+export function streamAiMove(
+  gameId: string,
+  onInfo: (info: SearchInfo) => void,
+  onDone: (result: any) => void,
+  onError: (error: Error) => void,
+  agent = "minimax",
+  time = 1.5,
+) {
+  const source = new EventSource(`${BASE}/api/v1/game/${gameId}/ai_move/stream?agent=${agent}&time=${time}`);
+  source.addEventListener("info", (e) => onInfo(JSON.parse((e as MessageEvent).data)));
+  source.addEventListener("done", (e) => {
+    source.close();
+    onDone(JSON.parse((e as MessageEvent).data));
+  });
+  // the server's `event: error` carries {"detail": ...}; a failed or dropped connection has no data
+  source.addEventListener("error", (e) => {
+    source.close();
+    const data = (e as MessageEvent).data;
+    let detail = "AI move stream failed";
+    if (data) {
+      try {
+        detail = JSON.parse(data).detail ?? detail;
+      } catch {
+        detail = String(data);
+      }
+    }
+    onError(new Error(detail));
+  });
+  return source;
+}
+
+export async function stopAiMove(gameId: string) {
+  const res = await fetch(`${BASE}/api/v1/game/${gameId}/ai_move/stop`, { method: "POST" });
+  if (!res.ok) throw new Error("Stop failed");
+  return res.json();
+}
+
+export type AnalysisLine = {
+  move: [number, number] | null;
+  score: number;
+  pv: ([number, number] | null)[];
+};
+
+export async function analyzePosition(gameId: string, depth = 4, k?: number, time = 1.5) {
+  const params = new URLSearchParams({ depth: String(depth), time: String(time) });
+  if (k !== undefined) params.set("k", String(k));
+  const res = await fetch(`${BASE}/api/v1/game/${gameId}/analysis?${params}`);
+  if (!res.ok) throw new Error("Analysis failed");
+  return res.json() as Promise<{ to_move: number; depth: number; lines: AnalysisLine[] }>;
+}